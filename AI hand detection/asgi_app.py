@@ -0,0 +1,320 @@
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.templating import Jinja2Templates
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import cv2
+import base64
+from hand_detection import HandDetector
+import time
+import os
+
+# Async (ASGI) variant of app.py. It exposes the same REST routes and adds
+# push streaming over websockets, so viewers no longer need to poll
+# /api/frame and /api/landmarks. Run it with:
+#     uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+templates = Jinja2Templates(directory=os.path.join(BASE_DIR, 'templates'))
+
+# OpenCV capture and detection are blocking, so they run on a single worker
+# thread; the event loop only schedules work and fans results out.
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hand-detector')
+
+# Global state for hand detection
+detector = None
+camera = None
+is_running = False
+capture_task = None
+current_frame = None
+current_jpeg = None
+detection_results = {}
+subscribers = set()
+# Held while the camera is being started or stopped, so overlapping
+# /api/start requests open it once and start a single capture loop
+camera_lock = asyncio.Lock()
+
+def initialize_detector():
+    """Initialize the hand detector"""
+    global detector
+    try:
+        detector = HandDetector()
+        return True
+    except Exception as e:
+        print(f"Error initializing detector: {e}")
+        return False
+
+def open_camera():
+    """Open the capture device (runs in the executor)"""
+    global camera
+    if not initialize_detector():
+        return False
+
+    camera = cv2.VideoCapture(0)
+    if not camera.isOpened():
+        print("Error: Could not open camera")
+        return False
+    return True
+
+def process_next_frame():
+    """Read, detect and encode one frame (runs in the executor)"""
+    success, frame = camera.read()
+    if not success:
+        return None
+
+    # Flip frame for selfie view
+    frame = cv2.flip(frame, 1)
+
+    # Process frame for hand detection
+    processed_frame, hand_count = detector.find_hands(frame.copy())
+
+    # Get landmarks
+    landmarks = detector.get_hand_landmarks(frame)
+
+    # Encode once per frame, shared by every connected viewer
+    _, buffer = cv2.imencode('.jpg', processed_frame)
+    jpeg = base64.b64encode(buffer).decode('utf-8')
+
+    results = {
+        'landmarks': landmarks,
+        'hand_count': hand_count,
+        'timestamp': time.time()
+    }
+    return processed_frame, jpeg, results
+
+def release_camera():
+    """Release the capture device (runs in the executor)"""
+    global camera, detector
+    if camera:
+        camera.release()
+        camera = None
+    if detector and hasattr(detector, 'hands') and detector.hands:
+        detector.hands.close()
+    # open_camera builds a fresh detector, so never close this one twice
+    detector = None
+
+def publish(message):
+    """Hand the latest message to every subscriber, dropping stale ones"""
+    for queue in subscribers:
+        # Slow clients skip frames instead of building up a backlog
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(message)
+
+async def camera_loop():
+    """Drive capture from the event loop and push results to viewers"""
+    global current_frame, current_jpeg, detection_results, is_running
+    loop = asyncio.get_running_loop()
+    try:
+        while is_running:
+            result = await loop.run_in_executor(executor, process_next_frame)
+            if result is None:
+                await asyncio.sleep(0.1)
+                continue
+
+            current_frame, current_jpeg, detection_results = result
+            publish({
+                'frame': current_jpeg,
+                'landmarks': detection_results['landmarks'],
+                'hand_count': detection_results['hand_count'],
+                'timestamp': detection_results['timestamp']
+            })
+    except Exception as e:
+        print(f"Error in capture loop: {e}")
+        await loop.run_in_executor(executor, release_camera)
+    finally:
+        # Let /api/start open the camera again after a failure
+        is_running = False
+
+async def start_camera():
+    """Start camera capture as a background task"""
+    global is_running, capture_task
+    async with camera_lock:
+        if is_running:
+            return True
+
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(executor, open_camera):
+            return False
+
+        is_running = True
+        capture_task = asyncio.create_task(camera_loop())
+        return True
+
+async def stop_camera():
+    """Stop camera capture"""
+    global is_running, capture_task
+    async with camera_lock:
+        is_running = False
+        if capture_task:
+            await capture_task
+            capture_task = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, release_camera)
+
+async def index(request):
+    """Main page"""
+    return templates.TemplateResponse(request, 'index.html')
+
+async def start_detection(request):
+    """Start hand detection"""
+    try:
+        if await start_camera():
+            return JSONResponse({'success': True, 'message': 'Hand detection started'})
+        else:
+            return JSONResponse({'success': False, 'message': 'Failed to start camera'})
+    except Exception as e:
+        return JSONResponse({'success': False, 'message': f'Error: {str(e)}'})
+
+async def stop_detection(request):
+    """Stop hand detection"""
+    try:
+        await stop_camera()
+        return JSONResponse({'success': True, 'message': 'Hand detection stopped'})
+    except Exception as e:
+        return JSONResponse({'success': False, 'message': f'Error: {str(e)}'})
+
+async def get_status(request):
+    """Get current detection status"""
+    return JSONResponse({
+        'success': True,
+        'is_running': is_running,
+        'hand_count': detection_results.get('hand_count', 0),
+        'timestamp': detection_results.get('timestamp', 0),
+        'viewers': len(subscribers)
+    })
+
+async def get_frame(request):
+    """Get current camera frame"""
+    if current_jpeg is not None:
+        return JSONResponse({
+            'success': True,
+            'frame': current_jpeg,
+            'timestamp': time.time()
+        })
+    return JSONResponse({'success': False, 'message': 'No frame available'})
+
+async def get_landmarks(request):
+    """Get current hand landmarks"""
+    return JSONResponse({
+        'success': True,
+        'landmarks': detection_results.get('landmarks', []),
+        'hand_count': detection_results.get('hand_count', 0)
+    })
+
+async def save_screenshot(request):
+    """Save current frame as screenshot"""
+    try:
+        if current_frame is not None:
+            # Create screenshots directory if it doesn't exist
+            os.makedirs('screenshots', exist_ok=True)
+
+            # Generate filename with timestamp
+            timestamp = time.strftime('%Y%m%d_%H%M%S')
+            filename = f'screenshots/hand_detection_{timestamp}.jpg'
+
+            # Save image without blocking the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, cv2.imwrite, filename, current_frame)
+
+            return JSONResponse({
+                'success': True,
+                'message': f'Screenshot saved as {filename}',
+                'filename': filename
+            })
+        else:
+            return JSONResponse({'success': False, 'message': 'No frame available'})
+    except Exception as e:
+        return JSONResponse({'success': False, 'message': f'Error: {str(e)}'})
+
+async def health_check(request):
+    """Health check endpoint"""
+    return JSONResponse({
+        'status': 'healthy',
+        'timestamp': time.time(),
+        'camera_running': is_running
+    })
+
+async def forward(websocket, queue):
+    """Send queued messages to one viewer until sending fails"""
+    while True:
+        message = await queue.get()
+        await websocket.send_json(message)
+
+async def wait_for_disconnect(websocket):
+    """Return once the viewer goes away; viewers never send anything useful"""
+    while (await websocket.receive())['type'] != 'websocket.disconnect':
+        pass
+
+async def stream(websocket):
+    """Push every processed frame and its landmarks to a websocket viewer"""
+    await websocket.accept()
+    queue = asyncio.Queue(maxsize=1)
+    subscribers.add(queue)
+    # Watch the socket as well as the queue, so a viewer that leaves while
+    # no frames are flowing is dropped instead of waiting on queue.get()
+    tasks = {asyncio.create_task(forward(websocket, queue)),
+             asyncio.create_task(wait_for_disconnect(websocket))}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        subscribers.discard(queue)
+        for task in tasks:
+            task.cancel()
+        # Collect the failed send and the cancellations
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def not_found(request, exc):
+    return JSONResponse({'error': 'Not found'}, status_code=404)
+
+async def internal_error(request, exc):
+    return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await stop_camera()
+    executor.shutdown(wait=False)
+
+routes = [
+    Route('/', index),
+    Route('/api/start', start_detection, methods=['POST']),
+    Route('/api/stop', stop_detection, methods=['POST']),
+    Route('/api/status', get_status),
+    Route('/api/frame', get_frame),
+    Route('/api/landmarks', get_landmarks),
+    Route('/api/screenshot', save_screenshot, methods=['POST']),
+    Route('/health', health_check),
+    WebSocketRoute('/ws/stream', stream),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    exception_handlers={404: not_found, 500: internal_error},
+    lifespan=lifespan,
+)
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("Starting AI Hand Detection System (ASGI)...")
+    print("Available endpoints:")
+    print("- GET  / : Main page")
+    print("- POST /api/start : Start hand detection")
+    print("- POST /api/stop : Stop hand detection")
+    print("- GET  /api/status : Get detection status")
+    print("- GET  /api/frame : Get current frame")
+    print("- GET  /api/landmarks : Get hand landmarks")
+    print("- POST /api/screenshot : Save screenshot")
+    print("- GET  /health : Health check")
+    print("- WS   /ws/stream : Push stream of frames and landmarks")
+
+    uvicorn.run(app, host='0.0.0.0', port=5000)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the ASGI app
+The camera and detector are replaced, so no capture device is needed
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("cv2")
+asgi_app = pytest.importorskip("asgi_app")
+
+
+class FakeWebSocket:
+    """A viewer that records what it is sent and disconnects on request"""
+
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        return await self.inbox.get()
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+@pytest.fixture
+def fake_camera(monkeypatch):
+    """Count camera opens and let the capture loop idle"""
+    opened = []
+
+    def open_camera():
+        # Slow enough for a second request to arrive while the first opens
+        time.sleep(0.05)
+        opened.append(True)
+        return True
+
+    monkeypatch.setattr(asgi_app, "open_camera", open_camera)
+    monkeypatch.setattr(asgi_app, "process_next_frame", lambda: None)
+    monkeypatch.setattr(asgi_app, "release_camera", lambda: None)
+    monkeypatch.setattr(asgi_app, "is_running", False)
+    monkeypatch.setattr(asgi_app, "capture_task", None)
+    return opened
+
+
+def test_concurrent_starts_open_the_camera_once(fake_camera):
+    async def run():
+        results = await asyncio.gather(asgi_app.start_camera(), asgi_app.start_camera())
+        loops = [task for task in asyncio.all_tasks()
+                 if task.get_coro().__name__ == 'camera_loop']
+        await asgi_app.stop_camera()
+        return results, loops
+
+    results, loops = asyncio.run(run())
+    assert results == [True, True]
+    assert len(fake_camera) == 1
+    assert len(loops) == 1
+    assert not asgi_app.is_running
+
+
+def test_viewer_is_dropped_when_it_disconnects():
+    async def run():
+        websocket = FakeWebSocket()
+        task = asyncio.create_task(asgi_app.stream(websocket))
+        await asyncio.sleep(0.01)
+        viewers = len(asgi_app.subscribers)
+        asgi_app.publish({'hand_count': 1})
+        await asyncio.sleep(0.01)
+        # No frames are flowing; the disconnect alone must end the stream
+        await websocket.inbox.put({'type': 'websocket.disconnect'})
+        await asyncio.wait_for(task, 1)
+        return viewers, websocket.sent
+
+    viewers, sent = asyncio.run(run())
+    assert viewers == 1
+    assert sent == [{'hand_count': 1}]
+    assert not asgi_app.subscribers
@@ -0,0 +1,318 @@
+"""
+Availability benchmark for the Hotel Booking System.
+
+Builds an in-memory hotel with synthetic bookings and times
+find_available_rooms with the occupancy calendar (if NumPy is installed),
+with the per-room stay index, and with the old strptime-per-booking scan,
+plus lookups of a booking by ID and of a guest's bookings.
+With --compaction it also builds a hotel with a mostly past, partly cancelled
+history and times saving, loading and searching it before and after
+Hotel.compact() moves the old bookings to the archive. With --properties N it
+spreads the same rooms and bookings over an N-property chain and compares
+opening one property and booking in it with doing so in one hotel_data.json
+holding every room (bookings append to the journal either way).
+
+Usage:
+    python benchmark.py                               # 5k rooms x 1M bookings
+    python benchmark.py --rooms 500 --bookings 100000 --output results.json
+    python benchmark.py --compaction --past-share 0.75 --cancel-rate 0.1
+    python benchmark.py --properties 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from hotel_booking import Hotel, HotelChain, Room
+from hotel_index import HORIZON_DAYS, OccupancyCalendar
+
+ROOM_TYPES = [("Single", 99.99, 1), ("Double", 149.99, 2), ("Deluxe", 199.99, 2), ("Suite", 299.99, 4)]
+# Bookings start today so that searches fall inside the calendar's horizon
+FIRST_DAY = date.today()
+
+
+def build_hotel(rooms, bookings, seed, first_day=FIRST_DAY, cancel_rate=0.0):
+    # Hotel() reads hotel_data.json from the working directory, so start empty
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            hotel = Hotel("Benchmark Hotel")
+        finally:
+            os.chdir(cwd)
+    fill_hotel(hotel, rooms, bookings, seed, first_day, cancel_rate)
+    return hotel
+
+
+def fill_hotel(hotel, rooms, bookings, seed, first_day=FIRST_DAY, cancel_rate=0.0):
+    rng = random.Random(seed)
+    per_room = bookings // rooms
+    for number in range(rooms):
+        room_type, price, capacity = ROOM_TYPES[number % len(ROOM_TYPES)]
+        room = Room(str(1000 + number), room_type, price, capacity)
+        day = first_day + timedelta(days=rng.randint(0, 3))
+        for i in range(per_room + (1 if number < bookings % rooms else 0)):
+            check_in = day
+            check_out = check_in + timedelta(days=rng.randint(1, 5))
+            booking = room.book_room(f"Guest {number}-{i}", check_in.isoformat(), check_out.isoformat(), 1)
+            if cancel_rate and rng.random() < cancel_rate:
+                room.cancel(booking)
+            day = check_out + timedelta(days=rng.randint(0, 3))
+        hotel.rooms[room.room_number] = room
+        for booking in room.bookings:
+            hotel.index_booking(room, booking)
+
+
+def legacy_is_room_available(room, check_in, check_out):
+    # The original check: parse every booking of the room on every query
+    if not room.is_available:
+        return False
+    check_in_date = datetime.strptime(check_in, "%Y-%m-%d")
+    check_out_date = datetime.strptime(check_out, "%Y-%m-%d")
+    for booking in room.bookings:
+        booking_start = datetime.strptime(booking['check_in'], "%Y-%m-%d")
+        booking_end = datetime.strptime(booking['check_out'], "%Y-%m-%d")
+        if check_in_date < booking_end and check_out_date > booking_start:
+            return False
+    return True
+
+
+def random_ranges(count, days, seed):
+    rng = random.Random(seed)
+    ranges = []
+    for _ in range(count):
+        start = FIRST_DAY + timedelta(days=rng.randint(0, days))
+        ranges.append((start.isoformat(), (start + timedelta(days=rng.randint(1, 7))).isoformat()))
+    return ranges
+
+
+def time_per_query(search, ranges):
+    start = time.perf_counter()
+    results = [search(check_in, check_out) for check_in, check_out in ranges]
+    return (time.perf_counter() - start) * 1000 / max(len(ranges), 1), results
+
+
+def time_lookups(hotel, count, seed):
+    # Microseconds per booking-ID lookup and per guest itinerary lookup
+    rng = random.Random(seed)
+    booking_ids = rng.sample(list(hotel.bookings_by_id), min(count, len(hotel.bookings_by_id)))
+    guests = [hotel.bookings_by_id[booking_id][1]['guest_name'] for booking_id in booking_ids]
+    start = time.perf_counter()
+    for booking_id in booking_ids:
+        hotel.find_booking(booking_id)
+    id_us = (time.perf_counter() - start) * 1e6 / max(len(booking_ids), 1)
+    start = time.perf_counter()
+    for guest_name in guests:
+        hotel.guest_bookings(guest_name)
+    guest_us = (time.perf_counter() - start) * 1e6 / max(len(guests), 1)
+    return round(id_us, 3), round(guest_us, 3)
+
+
+def time_storage(hotel):
+    # Save and reload the hot file in the working directory
+    start = time.perf_counter()
+    hotel.save_data()
+    save_s = time.perf_counter() - start
+    start = time.perf_counter()
+    Hotel(hotel.name, hotel.data_file, hotel.archive.filename)
+    load_s = time.perf_counter() - start
+    return {
+        "hot_bookings": sum(len(room.bookings) for room in hotel.rooms.values()),
+        "file_bytes": os.path.getsize(hotel.data_file),
+        "save_s": round(save_s, 3),
+        "load_s": round(load_s, 3),
+    }
+
+
+def benchmark_compaction(args, span):
+    # Start the history far enough back that past_share of it has ended
+    history = max(1, args.bookings // args.rooms) * 5
+    first_day = FIRST_DAY - timedelta(days=int(history * args.past_share))
+    print(f"Building {args.rooms} rooms with {args.bookings} bookings from {first_day}...",
+          file=sys.stderr)
+    hotel = build_hotel(args.rooms, args.bookings, args.seed, first_day, args.cancel_rate)
+    hotel.use_calendar = False
+    ranges = random_ranges(args.queries, span, args.seed + 2)
+    legacy_ranges = ranges[:args.legacy_queries]
+
+    def search():
+        indexed_ms, indexed = time_per_query(hotel.find_available_rooms, ranges)
+        legacy_ms, legacy = time_per_query(
+            lambda check_in, check_out: [room for room in hotel.rooms.values()
+                                         if legacy_is_room_available(room, check_in, check_out)],
+            legacy_ranges)
+        return {"indexed_search_ms": round(indexed_ms, 3), "legacy_search_ms": round(legacy_ms, 3)}, indexed
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            before = time_storage(hotel)
+            results, indexed_before = search()
+            before.update(results)
+
+            start = time.perf_counter()
+            archived = hotel.compact()
+            compact_s = time.perf_counter() - start
+
+            after = time_storage(hotel)
+            results, indexed_after = search()
+            after.update(results)
+            archive_bytes = os.path.getsize(hotel.archive.filename) if archived else 0
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "past_share": args.past_share,
+        "cancel_rate": args.cancel_rate,
+        "archived": archived,
+        "compact_s": round(compact_s, 3),
+        "archive_bytes": archive_bytes,
+        "before": before,
+        "after": after,
+        "save_speedup": round(before["save_s"] / after["save_s"], 1) if after["save_s"] else None,
+        "load_speedup": round(before["load_s"] / after["load_s"], 1) if after["load_s"] else None,
+        "legacy_search_speedup": (round(before["legacy_search_ms"] / after["legacy_search_ms"], 1)
+                                  if after["legacy_search_ms"] else None),
+        "results_match": indexed_before == indexed_after,
+    }
+
+
+def time_bookings(hotel, count, seed):
+    # Milliseconds per Hotel.book_room, which appends to the hotel's journal.
+    # The stays start long after the generated ones, so none are refused.
+    rng = random.Random(seed)
+    room_numbers = rng.sample(list(hotel.rooms), min(count, len(hotel.rooms)))
+    start = time.perf_counter()
+    for i, room_number in enumerate(room_numbers):
+        check_in = FIRST_DAY + timedelta(days=20000 + 2 * i)
+        hotel.book_room(room_number, f"Writer {i}", check_in.isoformat(),
+                        (check_in + timedelta(days=1)).isoformat(), 1)
+    return round((time.perf_counter() - start) * 1000 / max(len(room_numbers), 1), 3)
+
+
+def benchmark_chain(args, hotel):
+    names = [f"Property {i}" for i in range(args.properties)]
+    rooms = max(1, args.rooms // args.properties)
+    bookings = args.bookings // args.properties
+    print(f"Building {args.properties} properties with {rooms} rooms and {bookings} bookings each...",
+          file=sys.stderr)
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            chain = HotelChain()
+            for i, name in enumerate(names):
+                chain.add_property(name)
+                fill_hotel(chain.get(name), rooms, bookings, args.seed + i)
+                chain.get(name).save_data()
+
+            # The single-file hotel holding every room, as before chains
+            hotel.save_data()
+            single_file_ms = time_bookings(hotel, args.writes, args.seed + 4)
+
+            start = time.perf_counter()
+            chain = HotelChain()
+            open_s = time.perf_counter() - start
+            start = time.perf_counter()
+            shard = chain.get(names[-1])
+            shard_load_s = time.perf_counter() - start
+            sharded_ms = time_bookings(shard, args.writes, args.seed + 4)
+            single_file_bytes = os.path.getsize(hotel.data_file)
+            shard_bytes = os.path.getsize(shard.data_file)
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "properties": args.properties,
+        "rooms_per_property": rooms,
+        "bookings_per_property": bookings,
+        "chain_open_s": round(open_s, 4),
+        "shard_load_s": round(shard_load_s, 3),
+        "single_file_bytes": single_file_bytes,
+        "shard_bytes": shard_bytes,
+        "single_file_booking_ms": single_file_ms,
+        "sharded_booking_ms": sharded_ms,
+        "booking_speedup": round(single_file_ms / sharded_ms, 1) if sharded_ms else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hotel availability search")
+    parser.add_argument("--rooms", type=int, default=5000, help="Number of rooms (default: 5000)")
+    parser.add_argument("--bookings", type=int, default=1000000, help="Number of bookings (default: 1000000)")
+    parser.add_argument("--queries", type=int, default=200, help="Indexed searches to time (default: 200)")
+    parser.add_argument("--legacy-queries", type=int, default=2,
+                        help="Searches to time with the old full scan (default: 2)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated bookings")
+    parser.add_argument("--compaction", action="store_true",
+                        help="Also time save, load and search before and after archiving old bookings")
+    parser.add_argument("--past-share", type=float, default=0.75,
+                        help="Share of the compaction history that has already ended (default: 0.75)")
+    parser.add_argument("--cancel-rate", type=float, default=0.1,
+                        help="Share of bookings cancelled in the compaction history (default: 0.1)")
+    parser.add_argument("--properties", type=int, default=0,
+                        help="Also compare bookings in an N-property chain with one data file")
+    parser.add_argument("--writes", type=int, default=5,
+                        help="Bookings to time per layout with --properties (default: 5)")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    print(f"Building {args.rooms} rooms with {args.bookings} bookings...", file=sys.stderr)
+    start = time.perf_counter()
+    hotel = build_hotel(args.rooms, args.bookings, args.seed)
+    build_s = time.perf_counter() - start
+
+    # Spread the searches over the booked period, within the calendar horizon
+    span = min(max(1, args.bookings // args.rooms) * 5, HORIZON_DAYS - 8)
+    ranges = random_ranges(args.queries, span, args.seed + 1)
+
+    calendar_ms = None
+    if OccupancyCalendar.supported():
+        start = time.perf_counter()
+        hotel.occupancy_calendar()
+        calendar_build_s = time.perf_counter() - start
+        calendar_ms, with_calendar = time_per_query(hotel.find_available_rooms, ranges)
+
+    hotel.use_calendar = False
+    indexed_ms, indexed = time_per_query(hotel.find_available_rooms, ranges)
+
+    legacy_ranges = ranges[:args.legacy_queries]
+    legacy_ms, legacy = time_per_query(
+        lambda check_in, check_out: [room for room in hotel.rooms.values()
+                                     if legacy_is_room_available(room, check_in, check_out)],
+        legacy_ranges)
+
+    id_lookup_us, guest_lookup_us = time_lookups(hotel, args.queries, args.seed + 3)
+
+    results = {
+        "rooms": args.rooms,
+        "bookings": args.bookings,
+        "build_s": round(build_s, 3),
+        "calendar_build_s": round(calendar_build_s, 3) if calendar_ms is not None else None,
+        "calendar_search_ms": round(calendar_ms, 3) if calendar_ms is not None else None,
+        "calendar_matches_index": with_calendar == indexed if calendar_ms is not None else None,
+        "indexed_search_ms": round(indexed_ms, 3),
+        "legacy_search_ms": round(legacy_ms, 3),
+        "speedup": round(legacy_ms / indexed_ms, 1) if indexed_ms else None,
+        "results_match": indexed[:len(legacy)] == legacy,
+        "booking_id_lookup_us": id_lookup_us,
+        "guest_lookup_us": guest_lookup_us,
+    }
+    if args.properties:
+        results["chain"] = benchmark_chain(args, hotel)
+    if args.compaction:
+        results["compaction"] = benchmark_compaction(args, span)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Append-only archive of bookings moved out of hotel_data.json.
+"""
+import json
+import os
+
+
+class BookingArchive:
+    """JSON Lines file of archived bookings, one per line with its room_number."""
+
+    def __init__(self, filename='hotel_archive.jsonl'):
+        self.filename = filename
+
+    def append(self, bookings):
+        with open(self.filename, 'a') as f:
+            for booking in bookings:
+                f.write(json.dumps(booking) + "\n")
+            # The hot file is rewritten without these bookings right after
+            f.flush()
+            os.fsync(f.fileno())
+
+    def bookings(self, room_number=None):
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                booking = json.loads(line)
+                if room_number is None or booking['room_number'] == room_number:
+                    yield booking
@@ -1,6 +1,14 @@
 import json
 import os
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, timedelta
+
+from hotel_archive import BookingArchive
+from hotel_index import OccupancyCalendar, StayIndex, date_ordinal
+from hotel_storage import RoomStore
+
+# The property stored in hotel_data.json before chains had several
+DEFAULT_PROPERTY = "Grand Hotel"
 
 class Room:
     def __init__(self, room_number, room_type, price_per_night, capacity):
@@ -11,26 +19,37 @@ class Room:
         self.amenities = []
         self.is_available = True
         self.bookings = []
+        self.stays = StayIndex()
+        # Sequence number of the next booking ID; IDs are "<room number>-<n>"
+        self.next_booking = 1
+        # Bumped on every saved change, so journal entries a room already
+        # includes are skipped and other processes rebuild only changed rooms
+        self.version = 0
+    
+    def new_booking_id(self):
+        self.next_booking += 1
+        return f"{self.room_number}-{self.next_booking - 1}"
+    
+    def set_bookings(self, bookings):
+        self.bookings = bookings
+        self.stays = StayIndex()
+        for booking in bookings:
+            # Bookings saved before IDs existed get one when loaded
+            if 'booking_id' not in booking:
+                booking['booking_id'] = self.new_booking_id()
+            if booking.get('status') != 'cancelled':
+                self.stays.add(date_ordinal(booking['check_in']), date_ordinal(booking['check_out']))
     
     def add_amenity(self, amenity):
         if amenity not in self.amenities:
             self.amenities.append(amenity)
     
     def is_room_available(self, check_in, check_out):
-        if not self.is_available:
-            return False
-            
-        check_in_date = datetime.strptime(check_in, "%Y-%m-%d")
-        check_out_date = datetime.strptime(check_out, "%Y-%m-%d")
-        
-        for booking in self.bookings:
-            booking_start = datetime.strptime(booking['check_in'], "%Y-%m-%d")
-            booking_end = datetime.strptime(booking['check_out'], "%Y-%m-%d")
-            
-            # Check for date overlap
-            if (check_in_date < booking_end and check_out_date > booking_start):
-                return False
-        return True
+        return self.is_free(date_ordinal(check_in), date_ordinal(check_out))
+    
+    def is_free(self, start, end):
+        # start/end are date ordinals; cancelled bookings are not in the index
+        return self.is_available and self.stays.is_free(start, end)
     
     def book_room(self, guest_name, check_in, check_out, num_guests):
         if not self.is_room_available(check_in, check_out):
@@ -40,6 +59,7 @@ class Room:
             return False
             
         booking = {
+            'booking_id': self.new_booking_id(),
             'guest_name': guest_name,
             'check_in': check_in,
             'check_out': check_out,
@@ -49,14 +69,20 @@ class Room:
         }
         
         self.bookings.append(booking)
-        return True
+        self.stays.add(date_ordinal(check_in), date_ordinal(check_out))
+        return booking
+    
+    def cancel(self, booking):
+        booking['status'] = 'cancelled'
+        self.stays.remove(date_ordinal(booking['check_in']), date_ordinal(booking['check_out']))
     
     def cancel_booking(self, guest_name, check_in):
         for booking in self.bookings:
-            if booking['guest_name'] == guest_name and booking['check_in'] == check_in:
-                booking['status'] = 'cancelled'
-                return True
-        return False
+            if (booking['guest_name'] == guest_name and booking['check_in'] == check_in
+                    and booking['status'] != 'cancelled'):
+                self.cancel(booking)
+                return booking
+        return None
     
     def to_dict(self):
         return {
@@ -66,92 +92,332 @@ class Room:
             'capacity': self.capacity,
             'amenities': self.amenities,
             'is_available': self.is_available,
+            'next_booking': self.next_booking,
+            'version': self.version,
             'bookings': self.bookings
         }
 
 class Hotel:
-    def __init__(self, name):
+    def __init__(self, name, data_file='hotel_data.json', archive_file='hotel_archive.jsonl'):
         self.name = name
+        self.data_file = data_file
+        self.store = RoomStore(data_file)
         self.rooms = {}
+        # Built on the first search when NumPy is installed
+        self.calendar = None
+        self.use_calendar = True
+        self.archive = BookingArchive(archive_file)
+        # booking_id -> (room, booking), and guest key -> {booking_id: booking}
+        self.bookings_by_id = {}
+        self.bookings_by_guest = {}
         self.load_data()
     
     def load_data(self):
-        if os.path.exists('hotel_data.json'):
-            try:
-                with open('hotel_data.json', 'r') as f:
-                    data = json.load(f)
-                    for room_num, room_data in data.items():
-                        room = Room(
-                            room_data['room_number'],
-                            room_data['room_type'],
-                            room_data['price_per_night'],
-                            room_data['capacity']
-                        )
-                        room.amenities = room_data.get('amenities', [])
-                        room.is_available = room_data.get('is_available', True)
-                        room.bookings = room_data.get('bookings', [])
-                        self.rooms[room_num] = room
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.rooms = {}
+        try:
+            with self.store.reading():
+                self.catch_up()
+        except json.JSONDecodeError:
+            self.rooms = {}
+            self.bookings_by_id = {}
+            self.bookings_by_guest = {}
+    
+    def refresh(self):
+        # Pick up what other processes have saved since we last looked
+        with self.store.reading():
+            self.catch_up()
+    
+    def catch_up(self):
+        # Call inside a store transaction: the data file if it was rewritten,
+        # then the journal entries we have not applied yet
+        data, entries = self.store.changes()
+        if data is not None:
+            self.merge(data)
+        self.apply(entries)
+    
+    def merge(self, data):
+        # Rebuild only the rooms whose saved version differs from ours
+        changed = False
+        for room_num, room_data in data.items():
+            old = self.rooms.get(room_num)
+            if old is not None and old.version == room_data.get('version', 0):
+                continue
+            room = Room(
+                room_data['room_number'],
+                room_data['room_type'],
+                room_data['price_per_night'],
+                room_data['capacity']
+            )
+            room.amenities = room_data.get('amenities', [])
+            room.is_available = room_data.get('is_available', True)
+            room.next_booking = room_data.get('next_booking', 1)
+            room.version = room_data.get('version', 0)
+            room.set_bookings(room_data.get('bookings', []))
+            if old is not None:
+                for booking in old.bookings:
+                    self.unindex_booking(booking)
+            self.rooms[room_num] = room
+            for booking in room.bookings:
+                self.index_booking(room, booking)
+            changed = True
+        if changed:
+            self.calendar = None
+    
+    def apply(self, entries):
+        # Replay journaled changes; an entry is skipped when the room's
+        # version shows it is already included
+        for entry in entries:
+            room = self.rooms.get(entry['room_number'])
+            if entry['op'] == 'room':
+                if room is None:
+                    self.merge({entry['room_number']: entry['room']})
+                continue
+            if room is None or entry['version'] <= room.version:
+                continue
+            if entry['op'] == 'book':
+                booking = entry['booking']
+                start, end = date_ordinal(booking['check_in']), date_ordinal(booking['check_out'])
+                room.bookings.append(booking)
+                room.stays.add(start, end)
+                room.next_booking = entry['next_booking']
+                self.index_booking(room, booking)
+                if self.calendar is not None:
+                    self.calendar.mark(room.room_number, start, end, True)
+            elif entry['op'] == 'cancel':
+                booking = self.find_booking(entry['booking_id'])[1]
+                if booking is not None and booking['status'] != 'cancelled':
+                    room.cancel(booking)
+                    if self.calendar is not None:
+                        self.calendar.mark(room.room_number, date_ordinal(booking['check_in']),
+                                           date_ordinal(booking['check_out']), False)
+            room.version = entry['version']
+    
+    def to_data(self):
+        return {room.room_number: room.to_dict() for room in self.rooms.values()}
     
     def save_data(self):
-        data = {room.room_number: room.to_dict() for room in self.rooms.values()}
-        with open('hotel_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        # Writes every room to the data file in one go; bookings, cancellations
+        # and new rooms are saved as they happen, so this is rarely needed
+        with self.store.transaction():
+            self.catch_up()
+            self.store.write(self.to_data())
+    
+    @staticmethod
+    def guest_key(guest_name):
+        return guest_name.strip().casefold()
+    
+    def index_booking(self, room, booking):
+        self.bookings_by_id[booking['booking_id']] = (room, booking)
+        guest = self.bookings_by_guest.setdefault(self.guest_key(booking['guest_name']), {})
+        guest[booking['booking_id']] = booking
+    
+    def unindex_booking(self, booking):
+        self.bookings_by_id.pop(booking['booking_id'], None)
+        key = self.guest_key(booking['guest_name'])
+        guest = self.bookings_by_guest.get(key, {})
+        guest.pop(booking['booking_id'], None)
+        if not guest:
+            self.bookings_by_guest.pop(key, None)
+    
+    def find_booking(self, booking_id):
+        return self.bookings_by_id.get(booking_id, (None, None))
+    
+    def guest_bookings(self, guest_name):
+        # (room, booking) pairs of one guest, in the order they were booked
+        guest = self.bookings_by_guest.get(self.guest_key(guest_name), {})
+        return [self.bookings_by_id[booking_id] for booking_id in guest]
     
     def add_room(self, room_number, room_type, price_per_night, capacity):
-        if room_number in self.rooms:
-            return False
-        self.rooms[room_number] = Room(room_number, room_type, price_per_night, capacity)
-        self.save_data()
+        with self.store.transaction(room_number):
+            self.catch_up()
+            if room_number in self.rooms:
+                return False
+            room = Room(room_number, room_type, price_per_night, capacity)
+            room.version = 1
+            self.rooms[room_number] = room
+            try:
+                self.store.append({'op': 'room', 'room_number': room_number, 'version': room.version,
+                                   'room': room.to_dict()})
+            except OSError:
+                del self.rooms[room_number]
+                raise
+        if self.calendar is not None:
+            self.calendar.add_room(room)
         return True
     
+    def occupancy_calendar(self):
+        if not (self.use_calendar and OccupancyCalendar.supported()):
+            return None
+        today = date.today().toordinal()
+        # Roll the horizon forward (and pick up rooms added directly) by rebuilding
+        if (self.calendar is None or self.calendar.first_day != today
+                or len(self.calendar.room_numbers) != len(self.rooms)):
+            self.calendar = OccupancyCalendar(self.rooms.values(), today)
+        return self.calendar
+    
     def find_available_rooms(self, check_in, check_out, room_type=None, min_capacity=1):
+        # Parse the dates once for the whole search, not once per room
+        start, end = date_ordinal(check_in), date_ordinal(check_out)
+        calendar = self.occupancy_calendar()
+        if calendar is not None and calendar.covers(start, end):
+            return [self.rooms[number] for number in
+                    calendar.free_rooms(start, end, room_type, min_capacity)]
+        
         available_rooms = []
         for room in self.rooms.values():
             if room_type and room.room_type != room_type:
                 continue
             if room.capacity < min_capacity:
                 continue
-            if room.is_room_available(check_in, check_out):
+            if room.is_free(start, end):
                 available_rooms.append(room)
         return available_rooms
     
     def book_room(self, room_number, guest_name, check_in, check_out, num_guests):
-        if room_number not in self.rooms:
-            return False, "Room not found"
-        
-        room = self.rooms[room_number]
-        if room.book_room(guest_name, check_in, check_out, num_guests):
-            self.save_data()
+        # The availability check and the save happen under the room's lock,
+        # against its latest saved state, so two processes cannot both win;
+        # bookings of rooms in other lock slots go ahead at the same time
+        with self.store.transaction(room_number):
+            self.catch_up()
+            if room_number not in self.rooms:
+                return False, "Room not found"
+            
+            room = self.rooms[room_number]
+            booking = room.book_room(guest_name, check_in, check_out, num_guests)
+            if booking:
+                start, end = date_ordinal(check_in), date_ordinal(check_out)
+                self.index_booking(room, booking)
+                if self.calendar is not None:
+                    self.calendar.mark(room_number, start, end, True)
+                room.version += 1
+                try:
+                    # Only the new booking is saved; compact() folds it into the data file
+                    self.store.append({'op': 'book', 'room_number': room_number, 'version': room.version,
+                                       'next_booking': room.next_booking, 'booking': booking})
+                except OSError:
+                    # Not saved, so undo the booking everywhere it was recorded
+                    room.bookings.pop()
+                    room.stays.remove(start, end)
+                    room.next_booking -= 1
+                    room.version -= 1
+                    self.unindex_booking(booking)
+                    if self.calendar is not None:
+                        self.calendar.mark(room_number, start, end, False)
+                    raise
+        if booking:
             total_nights = (datetime.strptime(check_out, "%Y-%m-%d") - datetime.strptime(check_in, "%Y-%m-%d")).days
             total_cost = total_nights * room.price_per_night
-            return True, f"Booking successful! Total cost: ${total_cost:.2f} for {total_nights} nights."
+            return True, (f"Booking successful! Booking ID: {booking['booking_id']}. "
+                          f"Total cost: ${total_cost:.2f} for {total_nights} nights.")
         return False, "Room not available for the selected dates"
     
-    def cancel_booking(self, room_number, guest_name, check_in):
-        if room_number not in self.rooms:
-            return False, "Room not found"
-        
-        room = self.rooms[room_number]
-        if room.cancel_booking(guest_name, check_in):
-            self.save_data()
-            return True, "Booking cancelled successfully"
-        return False, "Booking not found"
+    def cancel_booking(self, booking_id):
+        # IDs are "<room number>-<n>", so only that room needs locking
+        with self.store.transaction(booking_id.rpartition('-')[0]):
+            self.catch_up()
+            room, booking = self.find_booking(booking_id)
+            if booking is None or booking['status'] == 'cancelled':
+                return False, "Booking not found"
+            
+            start, end = date_ordinal(booking['check_in']), date_ordinal(booking['check_out'])
+            room.cancel(booking)
+            if self.calendar is not None:
+                self.calendar.mark(room.room_number, start, end, False)
+            room.version += 1
+            try:
+                # Only the cancellation is saved; compact() folds it into the data file
+                self.store.append({'op': 'cancel', 'room_number': room.room_number,
+                                   'booking_id': booking_id, 'version': room.version})
+            except OSError:
+                booking['status'] = 'confirmed'
+                room.stays.add(start, end)
+                room.version -= 1
+                if self.calendar is not None:
+                    self.calendar.mark(room.room_number, start, end, True)
+                raise
+        return True, "Booking cancelled successfully"
+    
+    def compact(self, today=None):
+        # Move cancelled bookings and stays that have ended to the archive,
+        # so only current bookings are scanned, saved and loaded
+        today = (today or date.today()).isoformat()
+        archived = []
+        with self.store.transaction():
+            self.catch_up()
+            for room in self.rooms.values():
+                keep = []
+                for booking in room.bookings:
+                    if booking['status'] == 'cancelled' or booking['check_out'] <= today:
+                        archived.append({'room_number': room.room_number, **booking})
+                        self.unindex_booking(booking)
+                    else:
+                        keep.append(booking)
+                if len(keep) != len(room.bookings):
+                    room.set_bookings(keep)
+                    room.version += 1
+            if archived:
+                self.archive.append(archived)
+            # Also fold the journal into the data file, so it stays short
+            if archived or self.store.offset:
+                self.store.write(self.to_data())
+        return len(archived)
     
     def get_room_details(self, room_number):
         if room_number not in self.rooms:
             return None
         return self.rooms[room_number]
 
-def display_menu():
-    print("\n=== Hotel Booking System ===")
+class HotelChain:
+    def __init__(self, manifest='hotels.json', directory='hotels'):
+        self.manifest = manifest
+        self.directory = directory
+        # Property name -> its data and archive files. A property is read
+        # from disk on first use and saves only its own files.
+        self.shards = {}
+        self.hotels = {}
+        if os.path.exists(manifest):
+            with open(manifest, 'r') as f:
+                self.shards = json.load(f)
+        else:
+            self.shards = {DEFAULT_PROPERTY: {'data': 'hotel_data.json',
+                                              'archive': 'hotel_archive.jsonl'}}
+    
+    def property_names(self):
+        return list(self.shards)
+    
+    def get(self, name):
+        if name not in self.shards:
+            return None
+        if name not in self.hotels:
+            shard = self.shards[name]
+            self.hotels[name] = Hotel(name, shard['data'], shard['archive'])
+        return self.hotels[name]
+    
+    def add_property(self, name):
+        if name in self.shards:
+            return False
+        base = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'property'
+        taken = {shard['data'] for shard in self.shards.values()}
+        slug, n = base, 2
+        while os.path.join(self.directory, slug + '.json') in taken:
+            slug, n = f"{base}-{n}", n + 1
+        os.makedirs(self.directory, exist_ok=True)
+        self.shards[name] = {'data': os.path.join(self.directory, slug + '.json'),
+                             'archive': os.path.join(self.directory, slug + '_archive.jsonl')}
+        with open(self.manifest, 'w') as f:
+            json.dump(self.shards, f, indent=4)
+        return True
+
+def display_menu(hotel_name):
+    print(f"\n=== Hotel Booking System: {hotel_name} ===")
     print("1. View Available Rooms")
     print("2. Book a Room")
     print("3. Cancel Booking")
     print("4. View Room Details")
-    print("5. Add New Room (Admin)")
-    print("6. Exit")
+    print("5. View Guest Bookings")
+    print("6. Add New Room (Admin)")
+    print("7. Archive Old Bookings (Admin)")
+    print("8. Switch or Add Property")
+    print("9. Exit")
 
 def get_date_input(prompt):
     while True:
@@ -163,7 +429,8 @@ def get_date_input(prompt):
             print("Invalid date format. Please use YYYY-MM-DD.")
 
 def main():
-    hotel = Hotel("Grand Hotel")
+    chain = HotelChain()
+    hotel = chain.get(chain.property_names()[0])
     
     # Add some sample rooms if none exist
     if not hotel.rooms:
@@ -172,9 +439,15 @@ def main():
         hotel.add_room("201", "Deluxe", 199.99, 2)
         hotel.add_room("202", "Suite", 299.99, 4)
     
+    archived = hotel.compact()
+    if archived:
+        print(f"Archived {archived} cancelled or past bookings.")
+    
     while True:
-        display_menu()
-        choice = input("\nEnter your choice (1-6): ").strip()
+        display_menu(hotel.name)
+        choice = input("\nEnter your choice (1-9): ").strip()
+        # Another terminal may have booked or cancelled since the last choice
+        hotel.refresh()
         
         if choice == '1':  # View Available Rooms
             print("\n=== Available Rooms ===")
@@ -222,11 +495,9 @@ def main():
         
         elif choice == '3':  # Cancel Booking
             print("\n=== Cancel Booking ===")
-            room_number = input("Enter room number: ").strip()
-            guest_name = input("Enter guest name: ").strip()
-            check_in = input("Enter check-in date (YYYY-MM-DD): ").strip()
+            booking_id = input("Enter booking ID (e.g. 101-1): ").strip()
             
-            success, message = hotel.cancel_booking(room_number, guest_name, check_in)
+            success, message = hotel.cancel_booking(booking_id)
             print(f"\n{'✅ ' if success else '❌ '}{message}")
         
         elif choice == '4':  # View Room Details
@@ -246,14 +517,39 @@ def main():
             if room.bookings:
                 print("\n=== Booking History ===")
                 for booking in room.bookings:
-                    print(f"\nGuest: {booking['guest_name']}")
+                    print(f"\nBooking ID: {booking['booking_id']}")
+                    print(f"Guest: {booking['guest_name']}")
                     print(f"Check-in: {booking['check_in']}")
                     print(f"Check-out: {booking['check_out']}")
                     print(f"Guests: {booking['num_guests']}")
                     print(f"Status: {booking['status']}")
                     print(f"Booked on: {booking['booking_date']}")
+            
+            archived = list(hotel.archive.bookings(room.room_number))
+            if archived:
+                print(f"\n=== Archived Bookings ({len(archived)}) ===")
+                for booking in archived:
+                    print(f"{booking['check_in']} to {booking['check_out']}: "
+                          f"{booking['guest_name']} ({booking['status']})")
         
-        elif choice == '5':  # Add New Room (Admin)
+        elif choice == '5':  # View Guest Bookings
+            guest_name = input("\nEnter guest name: ").strip()
+            bookings = hotel.guest_bookings(guest_name)
+            
+            if not bookings:
+                print("No current bookings for this guest.")
+                continue
+            
+            print(f"\n=== Bookings for {guest_name} ===")
+            print("{:<12} {:<8} {:<12} {:<12} {:<10}".format(
+                "Booking ID", "Room", "Check-in", "Check-out", "Status"))
+            print("-" * 58)
+            for room, booking in bookings:
+                print("{:<12} {:<8} {:<12} {:<12} {:<10}".format(
+                    booking['booking_id'], room.room_number,
+                    booking['check_in'], booking['check_out'], booking['status']))
+        
+        elif choice == '6':  # Add New Room (Admin)
             print("\n=== Add New Room (Admin Only) ===")
             room_number = input("Enter room number: ").strip()
             
@@ -275,12 +571,32 @@ def main():
             else:
                 print("\n❌ Failed to add room!")
         
-        elif choice == '6':  # Exit
+        elif choice == '7':  # Archive Old Bookings (Admin)
+            archived = hotel.compact()
+            print(f"\n✅ Archived {archived} cancelled or past bookings.")
+        
+        elif choice == '8':  # Switch or Add Property
+            print("\n=== Properties ===")
+            for name in chain.property_names():
+                print(f"{'*' if name == hotel.name else ' '} {name}")
+            name = input("Enter property name (a new name adds a property): ").strip()
+            if not name:
+                continue
+            
+            if chain.add_property(name):
+                print(f"\n✅ Property {name} added! Add its rooms from the admin menu.")
+            hotel = chain.get(name)
+            archived = hotel.compact()
+            if archived:
+                print(f"Archived {archived} cancelled or past bookings.")
+            print(f"Now managing {hotel.name} ({len(hotel.rooms)} rooms).")
+        
+        elif choice == '9':  # Exit
             print("\nThank you for using the Hotel Booking System!")
             break
         
         else:
-            print("\nInvalid choice! Please enter a number from 1 to 6.")
+            print("\nInvalid choice! Please enter a number from 1 to 9.")
 
 if __name__ == "__main__":
     main()
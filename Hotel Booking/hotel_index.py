@@ -0,0 +1,111 @@
+"""
+Availability indexes for the Hotel Booking System.
+"""
+from bisect import bisect_left
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # the calendar is optional; StayIndex works without it
+    np = None
+
+# Days covered by the occupancy calendar, starting today
+HORIZON_DAYS = 730
+
+
+def date_ordinal(date_str):
+    # "YYYY-MM-DD" -> day number; much cheaper than strptime
+    return date.fromisoformat(date_str).toordinal()
+
+
+class StayIndex:
+    """Confirmed stays of one room as sorted [check_in, check_out) day ordinals.
+
+    Stays of a room never overlap (book_room refuses them), so sorting by
+    check-in also sorts by check-out and an overlap test is one bisection.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end):
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+    def remove(self, start, end):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ends[i] == end:
+                del self.starts[i]
+                del self.ends[i]
+                return True
+            i += 1
+        return False
+
+    def is_free(self, start, end):
+        # The last stay starting before `end` is the only one that can overlap
+        i = bisect_left(self.starts, end)
+        return i == 0 or self.ends[i - 1] <= start
+
+
+class OccupancyCalendar:
+    """Rooms x days occupancy bitmap over a rolling horizon (needs NumPy).
+
+    Row i belongs to room_numbers[i]; room type, capacity and the room's
+    is_available flag are kept as columns next to it, so one search is a
+    few vectorised operations over every room at once.
+    """
+
+    def __init__(self, rooms, first_day, days=HORIZON_DAYS):
+        rooms = list(rooms)
+        self.first_day = first_day
+        self.days = days
+        self.room_numbers = [room.room_number for room in rooms]
+        self.rows = {number: row for row, number in enumerate(self.room_numbers)}
+        self.occupied = np.zeros((len(rooms), days), dtype=bool)
+        self.room_types = np.array([room.room_type for room in rooms], dtype=object)
+        self.capacities = np.array([room.capacity for room in rooms], dtype=np.int64)
+        self.open = np.array([room.is_available for room in rooms], dtype=bool)
+        for row, room in enumerate(rooms):
+            for start, end in zip(room.stays.starts, room.stays.ends):
+                self._fill(row, start, end, True)
+
+    @staticmethod
+    def supported():
+        return np is not None
+
+    def _fill(self, row, start, end, value):
+        a = max(start - self.first_day, 0)
+        b = min(end - self.first_day, self.days)
+        if a < b:
+            self.occupied[row, a:b] = value
+
+    def add_room(self, room):
+        self.rows[room.room_number] = len(self.room_numbers)
+        self.room_numbers.append(room.room_number)
+        self.occupied = np.vstack([self.occupied, np.zeros((1, self.days), dtype=bool)])
+        self.room_types = np.append(self.room_types, np.array([room.room_type], dtype=object))
+        self.capacities = np.append(self.capacities, room.capacity)
+        self.open = np.append(self.open, room.is_available)
+        for start, end in zip(room.stays.starts, room.stays.ends):
+            self._fill(len(self.room_numbers) - 1, start, end, True)
+
+    def mark(self, room_number, start, end, occupied):
+        self._fill(self.rows[room_number], start, end, occupied)
+
+    def covers(self, start, end):
+        return self.first_day <= start < end <= self.first_day + self.days
+
+    def free_rooms(self, start, end, room_type=None, min_capacity=1):
+        # Callers check covers() first; dates outside the horizon are not tracked
+        a, b = start - self.first_day, end - self.first_day
+        free = ~self.occupied[:, a:b].any(axis=1) & self.open
+        if room_type:
+            free &= self.room_types == room_type
+        free &= self.capacities >= min_capacity
+        return [self.room_numbers[row] for row in np.flatnonzero(free)]
@@ -0,0 +1,167 @@
+"""
+Shared storage for a hotel's data file.
+
+Several processes may run the booking system against the same file.
+Bookings, cancellations and new rooms are appended to "<data file>.journal"
+under a lock on that room alone, so processes working on different rooms
+never wait for each other and no booking rewrites the data file. Each
+process replays the journal on top of the data file once, then reads only
+the entries appended since. The data file is only written in full (by
+compaction or save_data) with every room locked; that also empties the
+journal and bumps a generation number, so other processes know to read
+the data file again.
+
+The locks are files in "<data file>.locks": one per slot of rooms (a room's
+slot is a hash of its number, so two rooms may share one) and one that
+keeps journal appends from interleaving.
+"""
+import json
+import os
+import zlib
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ROOM_SLOTS = 16
+
+
+def _acquire(lock):
+    if fcntl is not None:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+    else:
+        lock.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after about 10 seconds
+                continue
+
+
+def _release(lock):
+    if fcntl is not None:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+    else:
+        lock.seek(0)
+        msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def room_slot(room_number):
+    return zlib.crc32(str(room_number).encode()) % ROOM_SLOTS
+
+
+class RoomStore:
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.journal_file = data_file + '.journal'
+        self.lock_dir = data_file + '.locks'
+        self.generation_file = os.path.join(self.lock_dir, 'generation')
+        # Generation of the data file this process last read or wrote, and
+        # how many bytes of the journal it has applied on top of it
+        self.generation = None
+        self.offset = 0
+
+    @contextmanager
+    def _locked(self, name):
+        os.makedirs(self.lock_dir, exist_ok=True)
+        with open(os.path.join(self.lock_dir, name), 'a+') as lock:
+            _acquire(lock)
+            try:
+                yield
+            finally:
+                _release(lock)
+
+    @contextmanager
+    def transaction(self, room_number=None):
+        # Locks the room's slot, or every slot when no room is given (for
+        # write()). Holding any slot keeps the data file from being replaced.
+        slots = range(ROOM_SLOTS) if room_number is None else [room_slot(room_number)]
+        with ExitStack() as stack:
+            # Always in slot order, so a full lock cannot deadlock with another
+            for slot in slots:
+                stack.enter_context(self._locked(f'room-{slot}'))
+            yield
+
+    @contextmanager
+    def reading(self):
+        # For catching up without changing anything: one slot is enough
+        with self._locked('room-0'):
+            yield
+
+    def _read_generation(self):
+        try:
+            with open(self.generation_file, 'r') as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def changes(self):
+        # Call inside transaction() or reading(). Returns (data, entries):
+        # the data file if it was rewritten since we last read it (else
+        # None), and the journal entries appended since, to apply on top
+        generation = self._read_generation()
+        data = None
+        journal_size = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+        if generation != self.generation or journal_size < self.offset:
+            data = {}
+            if os.path.exists(self.data_file):
+                with open(self.data_file, 'r') as f:
+                    data = json.load(f)
+            self.generation = generation
+            self.offset = 0
+        return data, self._read_journal()
+
+    def _read_journal(self):
+        entries = []
+        if not os.path.exists(self.journal_file):
+            return entries
+        with open(self.journal_file, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        # A line without its newline is still being appended by another room
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:  # cut short by a crash while appending
+                continue
+        self.offset += end
+        return entries
+
+    def append(self, entry):
+        # Call inside transaction() for the entry's room, after changes()
+        line = json.dumps(entry).encode() + b"\n"
+        with self._locked('journal'), open(self.journal_file, 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            start = f.tell()
+            if start:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # End the torn line so it does not swallow this one
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        if start == self.offset:
+            # Nothing else was appended since we caught up; skip our own entry
+            self.offset = start + len(line)
+
+    def write(self, data):
+        # Call inside transaction() with every room locked, after changes();
+        # readers never see a half-written file
+        temp_file = self.data_file + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_file, self.data_file)
+        # A crash before the journal is emptied only replays entries the
+        # rooms' versions already include, which they skip
+        self.generation = (self.generation or 0) + 1
+        with open(self.generation_file, 'w') as f:
+            f.write(str(self.generation))
+        if os.path.exists(self.journal_file):
+            open(self.journal_file, 'w').close()
+        self.offset = 0
@@ -0,0 +1,121 @@
+"""
+Concurrent booking stress test for the Hotel Booking System.
+
+Starts N worker processes, each with its own Hotel on one shared data file,
+that book and sometimes cancel the same few rooms over the same dates. Then
+checks that no room ended up with overlapping confirmed stays and that every
+booking or cancellation a worker was told succeeded is on disk.
+
+Usage:
+    python stress_bookings.py                          # 8 workers x 200 attempts
+    python stress_bookings.py --workers 16 --attempts 500 --rooms 3 --output results.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from multiprocessing import Pool
+
+from hotel_booking import Hotel
+
+FIRST_DAY = date.today() + timedelta(days=1)
+
+
+def open_hotel(directory):
+    return Hotel("Stress Hotel", os.path.join(directory, 'hotel_data.json'),
+                 os.path.join(directory, 'hotel_archive.jsonl'))
+
+
+def worker(directory, worker_id, attempts, rooms, days, cancel_rate, seed):
+    hotel = open_hotel(directory)
+    rng = random.Random(seed + worker_id)
+    booked, cancelled, refused = [], [], 0
+    for i in range(attempts):
+        if booked and rng.random() < cancel_rate:
+            booking_id = booked.pop(rng.randrange(len(booked)))
+            success, message = hotel.cancel_booking(booking_id)
+            if not success:
+                raise RuntimeError(f"worker {worker_id} could not cancel {booking_id}: {message}")
+            cancelled.append(booking_id)
+            continue
+
+        guest_name = f"Worker {worker_id}-{i}"
+        check_in = FIRST_DAY + timedelta(days=rng.randint(0, days))
+        check_out = check_in + timedelta(days=rng.randint(1, 4))
+        success, _ = hotel.book_room(str(101 + rng.randrange(rooms)), guest_name,
+                                     check_in.isoformat(), check_out.isoformat(), 1)
+        if success:
+            booked.append(hotel.guest_bookings(guest_name)[0][1]['booking_id'])
+        else:
+            refused += 1
+    return booked, cancelled, refused
+
+
+def check(hotel, booked, cancelled):
+    overlaps = 0
+    for room in hotel.rooms.values():
+        stays = sorted((booking['check_in'], booking['check_out'])
+                       for booking in room.bookings if booking['status'] == 'confirmed')
+        overlaps += sum(1 for a, b in zip(stays, stays[1:]) if b[0] < a[1])
+    status = {booking_id: booking['status'] for booking_id, (_, booking) in hotel.bookings_by_id.items()}
+    lost = [booking_id for booking_id in booked if status.get(booking_id) != 'confirmed']
+    lost += [booking_id for booking_id in cancelled if status.get(booking_id) != 'cancelled']
+    return overlaps, lost
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Book the same rooms from many processes at once")
+    parser.add_argument("--workers", type=int, default=8, help="Booking processes (default: 8)")
+    parser.add_argument("--attempts", type=int, default=200, help="Bookings or cancellations per worker (default: 200)")
+    parser.add_argument("--rooms", type=int, default=5, help="Rooms they compete for (default: 5)")
+    parser.add_argument("--days", type=int, default=60, help="Days the check-in dates are spread over (default: 60)")
+    parser.add_argument("--cancel-rate", type=float, default=0.2,
+                        help="Share of attempts that cancel one of the worker's bookings (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated requests")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        hotel = open_hotel(directory)
+        for number in range(args.rooms):
+            hotel.add_room(str(101 + number), "Single", 99.99, 1)
+
+        print(f"Starting {args.workers} workers x {args.attempts} attempts on {args.rooms} rooms...",
+              file=sys.stderr)
+        start = time.perf_counter()
+        with Pool(args.workers) as pool:
+            outcomes = pool.starmap(worker, [
+                (directory, worker_id, args.attempts, args.rooms, args.days, args.cancel_rate, args.seed)
+                for worker_id in range(args.workers)])
+        elapsed = time.perf_counter() - start
+
+        booked = [booking_id for worker_booked, _, _ in outcomes for booking_id in worker_booked]
+        cancelled = [booking_id for _, worker_cancelled, _ in outcomes for booking_id in worker_cancelled]
+        overlaps, lost = check(open_hotel(directory), booked, cancelled)
+
+    operations = args.workers * args.attempts
+    results = {
+        "workers": args.workers,
+        "attempts": operations,
+        "bookings": len(booked) + len(cancelled),
+        "refused": sum(refused for _, _, refused in outcomes),
+        "cancellations": len(cancelled),
+        "elapsed_s": round(elapsed, 3),
+        "operations_per_s": round(operations / elapsed, 1) if elapsed else None,
+        "overlapping_stays": overlaps,
+        "lost_updates": len(lost),
+        "passed": overlaps == 0 and not lost,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0 if results["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
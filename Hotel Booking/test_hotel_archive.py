@@ -0,0 +1,46 @@
+"""
+Tests for archiving cancelled and past bookings.
+"""
+import json
+import os
+from datetime import date, timedelta
+
+from hotel_booking import Hotel
+
+
+def open_hotel(directory):
+    return Hotel("Test Hotel", os.path.join(directory, 'hotel_data.json'),
+                 os.path.join(directory, 'hotel_archive.jsonl'))
+
+
+def day(offset):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def test_compact_moves_old_bookings_to_the_archive(tmp_path):
+    hotel = open_hotel(str(tmp_path))
+    hotel.add_room("101", "Single", 99.99, 1)
+    hotel.add_room("102", "Double", 149.99, 2)
+    hotel.book_room("101", "Alice", day(1), day(3), 1)
+    hotel.book_room("101", "Bob", day(5), day(6), 1)
+    hotel.book_room("102", "Carol", day(2), day(4), 2)
+    hotel.cancel_booking(hotel.guest_bookings("Bob")[0][1]['booking_id'])
+
+    # Three days on, Alice has checked out and Bob's booking was cancelled
+    assert hotel.compact(date.today() + timedelta(days=3)) == 2
+    assert [b['guest_name'] for b in hotel.rooms["101"].bookings] == []
+    assert [b['guest_name'] for b in hotel.rooms["102"].bookings] == ["Carol"]
+    assert hotel.guest_bookings("Alice") == [] and hotel.guest_bookings("Bob") == []
+    assert [(b['room_number'], b['guest_name'], b['status']) for b in hotel.archive.bookings()] == \
+        [("101", "Alice", "confirmed"), ("101", "Bob", "cancelled")]
+    assert [b['guest_name'] for b in hotel.archive.bookings("102")] == []
+
+    # The freed nights can be booked again, and the data file holds the hot set only
+    assert hotel.book_room("101", "Dave", day(5), day(6), 1)[0]
+    reloaded = open_hotel(str(tmp_path))
+    assert {number: [b['guest_name'] for b in room.bookings]
+            for number, room in reloaded.rooms.items()} == {"101": ["Dave"], "102": ["Carol"]}
+    assert hotel.compact(date.today() + timedelta(days=3)) == 0
+    assert len(list(reloaded.archive.bookings())) == 2
+    with open(os.path.join(str(tmp_path), 'hotel_data.json')) as f:
+        assert "Alice" not in json.dumps(json.load(f))
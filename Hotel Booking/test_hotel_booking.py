@@ -0,0 +1,103 @@
+"""
+Tests for booking IDs, the guest index and cancellation.
+"""
+import json
+import os
+from datetime import date, timedelta
+
+from hotel_booking import DEFAULT_PROPERTY, Hotel, HotelChain
+
+
+def open_hotel(directory):
+    return Hotel("Test Hotel", os.path.join(directory, 'hotel_data.json'),
+                 os.path.join(directory, 'hotel_archive.jsonl'))
+
+
+def day(offset):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def test_bookings_are_indexed_by_id_and_guest(tmp_path):
+    hotel = open_hotel(str(tmp_path))
+    hotel.add_room("101", "Single", 99.99, 1)
+    hotel.add_room("102", "Double", 149.99, 2)
+    hotel.book_room("101", "Alice Smith", day(1), day(2), 1)
+    hotel.book_room("102", "Bob", day(1), day(2), 1)
+    hotel.book_room("101", " alice smith ", day(4), day(6), 1)
+
+    assert [(room.room_number, booking['booking_id']) for room, booking in
+            hotel.guest_bookings("ALICE SMITH")] == [("101", "101-1"), ("101", "101-2")]
+    room, booking = hotel.find_booking("102-1")
+    assert room.room_number == "102" and booking['guest_name'] == "Bob"
+    assert hotel.find_booking("102-9") == (None, None)
+
+    assert hotel.cancel_booking("101-1")[0]
+    assert not hotel.cancel_booking("101-1")[0]
+    assert [booking['status'] for _, booking in hotel.guest_bookings("alice smith")] == \
+        ["cancelled", "confirmed"]
+    # IDs are never reused, even after the booking is archived
+    hotel.compact()
+    hotel.book_room("101", "Carol", day(1), day(2), 1)
+    assert hotel.guest_bookings("Carol")[0][1]['booking_id'] == "101-3"
+
+
+def test_cancel_appends_to_the_journal(tmp_path):
+    hotel = open_hotel(str(tmp_path))
+    hotel.add_room("101", "Single", 99.99, 1)
+    hotel.book_room("101", "Alice", day(1), day(2), 1)
+    hotel.book_room("101", "Bob", day(3), day(4), 1)
+    hotel.compact()
+    other = open_hotel(str(tmp_path))
+    data_file = os.path.join(str(tmp_path), 'hotel_data.json')
+    with open(data_file) as f:
+        saved = f.read()
+
+    assert hotel.cancel_booking("101-1")[0]
+    with open(data_file) as f:
+        assert f.read() == saved
+    with open(data_file + '.journal') as f:
+        assert [json.loads(line)['booking_id'] for line in f] == ["101-1"]
+
+    # Other processes and fresh starts replay the journal on top of the data file
+    assert other.book_room("101", "Carol", day(1), day(2), 1)[0]
+    reloaded = open_hotel(str(tmp_path))
+    assert [(b['guest_name'], b['status']) for b in reloaded.rooms["101"].bookings] == \
+        [("Alice", "cancelled"), ("Bob", "confirmed"), ("Carol", "confirmed")]
+    assert not reloaded.rooms["101"].is_room_available(day(1), day(2))
+
+
+def test_bookings_saved_without_ids_get_them_on_load(tmp_path):
+    booking = {'guest_name': "Alice", 'check_in': day(1), 'check_out': day(2), 'num_guests': 1,
+               'booking_date': "2024-01-01 10:00:00", 'status': 'confirmed'}
+    room = {'room_number': "101", 'room_type': "Single", 'price_per_night': 99.99, 'capacity': 1,
+            'amenities': [], 'is_available': True, 'bookings': [booking]}
+    with open(os.path.join(str(tmp_path), 'hotel_data.json'), 'w') as f:
+        json.dump({"101": room}, f)
+
+    hotel = open_hotel(str(tmp_path))
+    assert hotel.guest_bookings("alice")[0][1]['booking_id'] == "101-1"
+    assert hotel.book_room("101", "Bob", day(3), day(4), 1)[1].startswith("Booking successful! Booking ID: 101-2.")
+
+
+def test_chain_keeps_one_shard_per_property(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chain = HotelChain()
+    assert chain.property_names() == [DEFAULT_PROPERTY]
+    assert chain.add_property("Sea View")
+    assert not chain.add_property("Sea View")
+    assert chain.add_property("Sea-View!")
+    assert chain.get("Nowhere") is None
+    assert chain.shards["Sea-View!"]['data'] == os.path.join('hotels', 'sea-view-2.json')
+
+    sea_view = chain.get("Sea View")
+    sea_view.add_room("1", "Single", 80.0, 1)
+    sea_view.book_room("1", "Alice", day(1), day(2), 1)
+    # Only the property in use is loaded, and only its files are written
+    assert list(chain.hotels) == ["Sea View"]
+    assert sorted(os.listdir('hotels')) == ['sea-view.json.journal', 'sea-view.json.locks']
+    assert not os.path.exists('hotel_data.json')
+
+    reopened = HotelChain()
+    assert reopened.property_names() == [DEFAULT_PROPERTY, "Sea View", "Sea-View!"]
+    assert reopened.get("Sea View").guest_bookings("alice")[0][1]['booking_id'] == "1-1"
+    assert reopened.get("Sea-View!").rooms == {}
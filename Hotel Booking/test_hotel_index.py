@@ -0,0 +1,92 @@
+"""
+Tests for the hotel availability indexes.
+"""
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from hotel_booking import Hotel
+from hotel_index import StayIndex
+
+
+def test_stay_index_matches_scan():
+    rng = random.Random(5)
+    index, stays = StayIndex(), []
+    day = 0
+    while day < 500:
+        day += rng.randint(0, 4)
+        length = rng.randint(1, 6)
+        index.add(day, day + length)
+        stays.append((day, day + length))
+        day += length
+    for start, end in rng.sample(stays, len(stays) // 3):
+        assert index.remove(start, end)
+        stays.remove((start, end))
+    assert not index.remove(-5, -1)
+
+    for _ in range(2000):
+        start = rng.randint(-10, 510)
+        end = start + rng.randint(1, 8)
+        assert index.is_free(start, end) == all(e <= start or s >= end for s, e in stays)
+
+
+def make_hotel(directory):
+    hotel = Hotel("Test Hotel", os.path.join(directory, 'hotel_data.json'),
+                  os.path.join(directory, 'hotel_archive.jsonl'))
+    hotel.use_calendar = False
+    for number, room_type, capacity in [("101", "Single", 1), ("102", "Double", 2),
+                                        ("201", "Suite", 4)]:
+        hotel.add_room(number, room_type, 100.0, capacity)
+    return hotel
+
+
+def nights(first, count):
+    return ((date.today() + timedelta(days=first)).isoformat(),
+            (date.today() + timedelta(days=first + count)).isoformat())
+
+
+def test_cancelled_bookings_do_not_block_rooms(tmp_path):
+    hotel = make_hotel(str(tmp_path))
+    check_in, check_out = nights(3, 2)
+    assert hotel.book_room("101", "Alice", check_in, check_out, 1)[0]
+    assert hotel.book_room("102", "Bob", *nights(4, 3), 2)[0]
+    assert [room.room_number for room in hotel.find_available_rooms(check_in, check_out)] == ["201"]
+    assert [room.room_number for room in hotel.find_available_rooms(*nights(5, 1))] == ["101", "201"]
+    assert [room.room_number for room in
+            hotel.find_available_rooms(*nights(0, 10), min_capacity=2)] == ["201"]
+
+    hotel.cancel_booking(hotel.guest_bookings("Alice")[0][1]['booking_id'])
+    assert hotel.rooms["101"].is_room_available(check_in, check_out)
+    assert [room.room_number for room in
+            hotel.find_available_rooms(check_in, check_out, room_type="Single")] == ["101"]
+
+
+def test_calendar_matches_stay_index(tmp_path):
+    pytest.importorskip("numpy")
+    rng = random.Random(9)
+    hotel = make_hotel(str(tmp_path))
+    for i in range(60):
+        number = rng.choice(list(hotel.rooms))
+        hotel.book_room(number, f"Guest {i}", *nights(rng.randint(0, 40), rng.randint(1, 5)), 1)
+    ranges = [nights(rng.randint(0, 45), rng.randint(1, 7)) for _ in range(200)]
+
+    def search_both(check_in, check_out, **filters):
+        hotel.use_calendar = True
+        with_calendar = hotel.find_available_rooms(check_in, check_out, **filters)
+        hotel.use_calendar = False
+        return with_calendar, hotel.find_available_rooms(check_in, check_out, **filters)
+
+    hotel.use_calendar = True
+    hotel.find_available_rooms(*ranges[0])
+    calendar = hotel.calendar
+    for booking_id in list(hotel.bookings_by_id)[::4]:
+        hotel.cancel_booking(booking_id)
+    hotel.add_room("301", "Double", 150.0, 2)
+    for filters in ({}, {'room_type': "Double"}, {'min_capacity': 2}):
+        for check_in, check_out in ranges:
+            with_calendar, with_index = search_both(check_in, check_out, **filters)
+            assert with_calendar == with_index, (check_in, check_out, filters)
+    # Kept in step with bookings, cancellations and new rooms, not rebuilt
+    assert hotel.calendar is calendar
@@ -0,0 +1,119 @@
+"""
+Tests for the shared hotel data file.
+"""
+import os
+import threading
+from datetime import date, timedelta
+
+from hotel_booking import Hotel
+from hotel_storage import RoomStore
+import stress_bookings
+
+
+def test_concurrent_appends_are_all_read_back(tmp_path):
+    data_file = str(tmp_path / 'hotel_data.json')
+    workers, entries = 8, 25
+
+    def work(worker):
+        # A store per thread, like a store per process: each opens its own locks
+        store = RoomStore(data_file)
+        for i in range(entries):
+            room_number = str(worker % 3)
+            with store.transaction(room_number):
+                store.changes()
+                store.append({'room_number': room_number, 'worker': worker, 'i': i})
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = RoomStore(data_file)
+    with store.reading():
+        data, appended = store.changes()
+    assert data == {}
+    assert sorted((entry['worker'], entry['i']) for entry in appended) == \
+        [(worker, i) for worker in range(workers) for i in range(entries)]
+    # Each room's entries stay in the order they were made
+    for worker in range(workers):
+        assert [entry['i'] for entry in appended if entry['worker'] == worker] == list(range(entries))
+
+
+def test_readers_only_read_what_is_new(tmp_path):
+    data_file = str(tmp_path / 'hotel_data.json')
+    writer, reader = RoomStore(data_file), RoomStore(data_file)
+    with writer.transaction():
+        writer.changes()
+        writer.write({'101': {'version': 1}})
+    with reader.reading():
+        assert reader.changes() == ({'101': {'version': 1}}, [])
+
+    with writer.transaction('101'):
+        writer.changes()
+        writer.append({'n': 1})
+    # A crash left half a line behind; the next append ends it
+    with open(data_file + '.journal', 'ab') as f:
+        f.write(b'{"n": ')
+    with reader.reading():
+        assert reader.changes() == (None, [{'n': 1}])
+    with writer.transaction('102'):
+        writer.changes()
+        writer.append({'n': 2})
+    with reader.reading():
+        assert reader.changes() == (None, [{'n': 2}])
+        assert reader.changes() == (None, [])
+
+    with writer.transaction():
+        writer.changes()
+        writer.write({'101': {'version': 2}})
+    assert os.path.getsize(data_file + '.journal') == 0
+    with reader.reading():
+        assert reader.changes() == ({'101': {'version': 2}}, [])
+    assert not os.path.exists(data_file + '.tmp')
+
+
+def test_bookings_do_not_rewrite_the_data_file(tmp_path):
+    hotel = open_hotel(str(tmp_path))
+    hotel.add_room("101", "Single", 99.99, 1)
+    hotel.add_room("102", "Double", 149.99, 2)
+    check_in = (date.today() + timedelta(days=3)).isoformat()
+    check_out = (date.today() + timedelta(days=5)).isoformat()
+    hotel.book_room("101", "Alice", check_in, check_out, 1)
+    hotel.cancel_booking("101-1")
+    hotel.book_room("102", "Bob", check_in, check_out, 2)
+    assert not os.path.exists(hotel.data_file)
+
+    other = open_hotel(str(tmp_path))
+    assert other.to_data() == hotel.to_data()
+    assert hotel.compact() == 1
+    assert os.path.getsize(hotel.data_file + '.journal') == 0
+    other.refresh()
+    assert other.to_data() == hotel.to_data() == open_hotel(str(tmp_path)).to_data()
+
+
+def open_hotel(directory):
+    return Hotel("Test Hotel", os.path.join(directory, 'hotel_data.json'),
+                 os.path.join(directory, 'hotel_archive.jsonl'))
+
+
+def test_second_process_cannot_double_book(tmp_path):
+    first = open_hotel(str(tmp_path))
+    first.add_room("101", "Single", 99.99, 1)
+    second = open_hotel(str(tmp_path))
+    check_in = (date.today() + timedelta(days=3)).isoformat()
+    check_out = (date.today() + timedelta(days=5)).isoformat()
+
+    assert first.book_room("101", "Alice", check_in, check_out, 1)[0]
+    # second has not looked at the file since first booked
+    assert not second.book_room("101", "Bob", check_in, check_out, 1)[0]
+
+    booking_id = first.guest_bookings("Alice")[0][1]['booking_id']
+    assert second.cancel_booking(booking_id)[0]
+    assert first.book_room("101", "Carol", check_in, check_out, 1)[0]
+    assert [booking['guest_name'] for booking in open_hotel(str(tmp_path)).rooms["101"].bookings
+            if booking['status'] == 'confirmed'] == ["Carol"]
+
+
+def test_stress_run_passes():
+    assert stress_bookings.main(["--workers", "4", "--attempts", "30", "--rooms", "2"]) == 0
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Load-test harness for the Library Management System.
+Generates a synthetic catalog and loan history, then measures startup, borrow,
+return, search and report performance for each storage backend.
+
+Usage:
+    python benchmark.py                                  # 100k books, 10k users, 1M loan events
+    python benchmark.py --books 1000000 --users 100000 --loan-events 10000000 --output results.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from library_management import LibraryManagementSystem
+from library_storage import JSONLibraryStorage, SQLiteLibraryStorage, save_json
+
+
+BACKENDS = ["json", "sqlite"]
+DATA_FILES = {
+    "json": ["books.json", "users.json", "borrowed_books.json", "loans.jsonl"],
+    "sqlite": ["library.db", "library.db-wal"],
+}
+
+TITLE_WORDS = ["python", "data", "history", "garden", "river", "machine", "learning", "design",
+               "ocean", "modern", "ancient", "secret", "art", "science", "night", "city"]
+SURNAMES = ["smith", "johnson", "brown", "garcia", "miller", "davis", "wilson", "moore",
+            "taylor", "anderson", "thomas", "martin", "lee", "clark", "lewis", "walker"]
+GENRES = ["Fiction", "Programming", "History", "Science", "Poetry", "Travel", "Biography", "Art"]
+SEARCH_QUERIES = ["python", "history garden", "author:smith", "genre:science", "mach",
+                  "modern art", "title:secret river", "xyzzy"]
+
+
+def generate_catalog(books: int, users: int, seed: int) -> Tuple[Dict, Dict]:
+    """Build books and users dicts in the library's record format."""
+    rng = random.Random(seed)
+    catalog = {}
+    for number in range(1, books + 1):
+        book_id = str(number)
+        catalog[book_id] = {
+            "book_id": book_id,
+            "title": " ".join(rng.sample(TITLE_WORDS, 3)).title() + f" {number}",
+            "author": f"{rng.choice(SURNAMES).title()} {rng.choice(SURNAMES).title()}",
+            "genre": rng.choice(GENRES),
+            "availability": True
+        }
+    members = {}
+    for number in range(1, users + 1):
+        user_id = str(number)
+        members[user_id] = {"user_id": user_id, "name": f"User {number}", "borrowed_books": []}
+    return catalog, members
+
+
+def iter_loans(catalog: Dict, members: Dict, borrowed_books: Dict, loan_events: int,
+               seed: int, now: datetime) -> Iterator[Dict]:
+    """
+    Yield ledger loans adding up to about loan_events borrow/return events.
+    
+    Every tenth book is currently out, some of them overdue; the other
+    loans are returned ones spread over the previous two years. Open loans
+    also mark their book, user and borrowed_books record as borrowed.
+    """
+    rng = random.Random(seed)
+    book_ids = list(catalog)
+    user_ids = list(members)
+    open_books = book_ids[::10][:loan_events // 10]
+    closed = (loan_events - len(open_books)) // 2
+    
+    loan_id = 0
+    for _ in range(closed):
+        loan_id += 1
+        borrowed = now - timedelta(days=30 + rng.random() * 700)
+        yield {
+            "loan_id": loan_id,
+            "book_id": rng.choice(book_ids),
+            "user_id": rng.choice(user_ids),
+            "borrow_date": borrowed.isoformat(),
+            "due_date": (borrowed + timedelta(days=14)).isoformat(),
+            "return_date": (borrowed + timedelta(days=rng.randint(1, 20))).isoformat()
+        }
+    
+    for book_id in open_books:
+        loan_id += 1
+        user_id = rng.choice(user_ids)
+        borrowed = now - timedelta(days=rng.random() * 30)
+        loan = {
+            "loan_id": loan_id,
+            "book_id": book_id,
+            "user_id": user_id,
+            "borrow_date": borrowed.isoformat(),
+            "due_date": (borrowed + timedelta(days=14)).isoformat(),
+            "return_date": None
+        }
+        catalog[book_id]["availability"] = False
+        members[user_id]["borrowed_books"].append(book_id)
+        borrowed_books[book_id] = {"user_id": user_id, "borrow_date": loan["borrow_date"],
+                                   "due_date": loan["due_date"], "returned": False}
+        yield loan
+
+
+def write_library(backend: str, books: int, users: int, loan_events: int, seed: int) -> None:
+    """Write a generated library into the current directory for one backend."""
+    catalog, members = generate_catalog(books, users, seed)
+    borrowed_books = {}
+    loans = iter_loans(catalog, members, borrowed_books, loan_events, seed + 1, datetime.now())
+    
+    # The loan history is streamed first, since open loans mark books and users
+    if backend == "sqlite":
+        storage = SQLiteLibraryStorage("library.db")
+    else:
+        storage = JSONLibraryStorage("books.json", "users.json", "borrowed_books.json", "loans.jsonl")
+    storage.save_loans(loans)
+    
+    if backend == "sqlite":
+        storage.import_data(catalog, members, borrowed_books)
+    else:
+        save_json("books.json", catalog)
+        save_json("users.json", members)
+        save_json("borrowed_books.json", borrowed_books)
+    storage.close()
+
+
+def measure(action: Callable[[object], object], items: List) -> Dict:
+    """Run action once per item and summarise its latency."""
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        action(item)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    count = len(latencies)
+    return {
+        "ops": count,
+        "ops_per_s": count / total if total else 0.0,
+        "p50_ms": latencies[count // 2] * 1000 if count else 0.0,
+        "p99_ms": latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0.0,
+    }
+
+
+def benchmark_backend(workdir: str, backend: str, args: argparse.Namespace) -> Dict:
+    """Generate a library for one backend and time the core operations on it."""
+    directory = os.path.join(workdir, backend)
+    os.makedirs(directory)
+    previous_directory = os.getcwd()
+    os.chdir(directory)
+    try:
+        results = {"backend": backend, "books": args.books, "users": args.users,
+                   "loan_events": args.loan_events}
+        
+        start = time.perf_counter()
+        write_library(backend, args.books, args.users, args.loan_events, args.seed)
+        results["generate_s"] = time.perf_counter() - start
+        
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            library = LibraryManagementSystem(backend)
+            results["startup_s"] = time.perf_counter() - start
+            
+            rng = random.Random(args.seed + 2)
+            user_ids = list(library.users)
+            available = [book_id for book_id, book in library.books.items() if book["availability"]]
+            pairs = [(rng.choice(user_ids), book_id)
+                     for book_id in rng.sample(available, min(args.ops, len(available)))]
+            queries = [SEARCH_QUERIES[i % len(SEARCH_QUERIES)] for i in range(args.ops)]
+            
+            results["borrow"] = measure(lambda pair: library.borrow_books([pair]), pairs)
+            results["return"] = measure(lambda pair: library.return_books([pair]), pairs)
+            results["search"] = measure(lambda query: library.find_books(query, limit=10), queries)
+            results["report"] = measure(lambda _: library.generate_report(), range(args.reports))
+            library.storage.close()
+        
+        results["file_bytes"] = sum(os.path.getsize(name) for name in DATA_FILES[backend]
+                                    if os.path.exists(name))
+        return results
+    finally:
+        os.chdir(previous_directory)
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the load test and print the results as JSON."""
+    parser = argparse.ArgumentParser(description="Load-test the Library Management System")
+    parser.add_argument("--books", type=int, default=100000, help="Books in the catalog (default: 100000)")
+    parser.add_argument("--users", type=int, default=10000, help="Registered users (default: 10000)")
+    parser.add_argument("--loan-events", type=int, default=1000000,
+                        help="Borrow and return events in the history (default: 1000000)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS,
+                        help="Storage backends to test")
+    parser.add_argument("--ops", type=int, default=100,
+                        help="Borrows, returns and searches per backend (default: 100)")
+    parser.add_argument("--reports", type=int, default=5, help="Reports per backend (default: 5)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated data")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    results = []
+    with tempfile.TemporaryDirectory(prefix="library_bench_") as workdir:
+        for backend in args.backends:
+            print(f"⏱  {backend}: {args.books} books, {args.users} users, "
+                  f"{args.loan_events} loan events...", file=sys.stderr)
+            results.append(benchmark_backend(workdir, backend, args))
+    
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Catalog index for the Library Management System.
+An inverted token index over book titles, authors and genres.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+SEARCH_FIELDS = ("title", "author", "genre")
+
+# A match in the title counts for more than one in the author or genre
+FIELD_WEIGHTS = {"title": 3, "author": 2, "genre": 1}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Parse a search query into (field, token) terms.
+    
+    Bare words match any field; 'author:doe' or 'genre:science' restrict a
+    word to one field. Every term must match for a book to be returned.
+    """
+    terms = []
+    for part in query.split():
+        field, separator, text = part.partition(":")
+        field = field.lower()
+        if separator and field in SEARCH_FIELDS:
+            terms.extend((field, token) for token in tokenize(text))
+        else:
+            terms.extend((None, token) for token in tokenize(part))
+    return terms
+
+
+class CatalogIndex:
+    """Inverted index from title, author and genre tokens to book IDs."""
+    
+    def __init__(self, books: Iterable[Dict] = ()):
+        """Build the index from existing book records."""
+        # field -> token -> IDs of the books containing it
+        self._postings = {field: {} for field in SEARCH_FIELDS}
+        # field -> sorted token list for prefix lookups, kept in step with
+        # the postings so no search has to sort the vocabulary again
+        self._vocabulary = {field: [] for field in SEARCH_FIELDS}
+        for book in books:
+            self.add(book)
+    
+    def add(self, book: Dict) -> None:
+        """Index a book's title, author and genre."""
+        book_id = book["book_id"]
+        for field in SEARCH_FIELDS:
+            postings = self._postings[field]
+            for token in set(tokenize(book[field])):
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = {book_id}
+                    insort(self._vocabulary[field], token)
+                else:
+                    ids.add(book_id)
+    
+    def remove(self, book: Dict) -> None:
+        """Remove a book from the index."""
+        book_id = book["book_id"]
+        for field in SEARCH_FIELDS:
+            postings = self._postings[field]
+            for token in set(tokenize(book[field])):
+                ids = postings.get(token)
+                if ids is None:
+                    continue
+                ids.discard(book_id)
+                if not ids:
+                    del postings[token]
+                    vocabulary = self._vocabulary[field]
+                    del vocabulary[bisect_left(vocabulary, token)]
+    
+    def _prefix_tokens(self, field: str, prefix: str) -> List[str]:
+        """Return the indexed tokens of a field that start with prefix."""
+        vocabulary = self._vocabulary[field]
+        start = bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+    
+    def _term_postings(self, field: Optional[str], token: str) -> List[Tuple[str, int, Set[str]]]:
+        """
+        Return (field, weight, book IDs) for every indexed word a term matches.
+        
+        Whole-word matches weigh double; words merely starting with the token
+        (e.g. 'program' -> 'programming') weigh the field weight.
+        """
+        matches = []
+        for search_field in ((field,) if field else SEARCH_FIELDS):
+            weight = FIELD_WEIGHTS[search_field]
+            postings = self._postings[search_field]
+            for word in self._prefix_tokens(search_field, token):
+                matches.append((search_field, 2 * weight if word == token else weight, postings[word]))
+        return matches
+    
+    @staticmethod
+    def _term_scores(matches: List[Tuple[str, int, Set[str]]],
+                     candidates: Optional[Set[str]] = None) -> Dict[str, int]:
+        """
+        Score the books a term matches: the best match in each field, summed.
+        
+        Scores are read off the posting lists, heaviest first, so each book
+        takes the best weight of a field the first time it is seen. With
+        candidates, only those books are scored, by intersecting each
+        posting list with them.
+        """
+        scores = {}
+        for field in SEARCH_FIELDS:
+            seen = set()
+            for _, weight, ids in sorted((match for match in matches if match[0] == field),
+                                         key=lambda match: -match[1]):
+                if candidates is not None:
+                    ids = ids.intersection(candidates)
+                for book_id in ids.difference(seen):
+                    scores[book_id] = scores.get(book_id, 0) + weight
+                seen.update(ids)
+        return scores
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Find books matching every term of a query, best matches first.
+        
+        Args:
+            query: Words to look for, optionally prefixed with 'title:',
+                'author:' or 'genre:'
+            limit: Maximum number of book IDs to return
+        
+        Returns:
+            List of matching book IDs ranked by score
+        """
+        terms = [self._term_postings(field, token) for field, token in parse_query(query)]
+        if not terms:
+            return []
+        
+        # Ties keep numeric ID order: shorter IDs first, then lexicographic
+        id_order = lambda book_id: (len(book_id), book_id)
+        
+        if all(len(matches) == 1 for matches in terms):
+            # One posting list per term, so every match has the same score
+            ids = terms[0][0][2].intersection(*(matches[0][2] for matches in terms[1:]))
+            return sorted(ids, key=id_order) if limit is None else heapq.nsmallest(limit, ids, key=id_order)
+        
+        # The rarest term picks the candidates; each further term only scores
+        # the books still in the running, so common words cost almost nothing
+        terms.sort(key=lambda matches: sum(len(ids) for _, _, ids in matches))
+        totals = self._term_scores(terms[0])
+        for matches in terms[1:]:
+            if not totals:
+                break
+            scores = self._term_scores(matches, set(totals))
+            totals = {book_id: total + scores[book_id]
+                      for book_id, total in totals.items() if book_id in scores}
+        
+        key = lambda book_id: (-totals[book_id],) + id_order(book_id)
+        if limit is None:
+            return sorted(totals, key=key)
+        return heapq.nsmallest(limit, totals, key=key)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Loan ledger for the Library Management System.
+Keeps every loan ever made, with indexes and counters maintained as loans happen.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _id_order(item_id: str) -> Tuple[int, str]:
+    """Sort key that keeps numeric string IDs in numeric order."""
+    return len(item_id), item_id
+
+
+class LoanLedger:
+    """
+    Append-only history of loans.
+    
+    A loan is a dict with loan_id, book_id, user_id, borrow_date, due_date
+    and return_date (None while the book is out). Loans are never removed;
+    a return only fills in return_date. Per-book and per-user indexes, the
+    open-loan map, the borrow counters and a due-date index of open loans
+    are updated on every change, so reports never need to scan the whole
+    history.
+    """
+    
+    def __init__(self, loans: Iterable[Dict] = ()):
+        """Build the ledger from previously recorded loans."""
+        self._loans = {}
+        self._by_book = {}
+        self._by_user = {}
+        # book_id -> loan_id of the loan currently out
+        self._open = {}
+        # book_id -> times borrowed, and the reverse: times borrowed -> book IDs
+        self._borrow_counts = {}
+        self._books_by_count = {}
+        self.next_loan_id = 1
+        for loan in loans:
+            self._index(loan)
+        # (due date, loan_id) of every open loan, earliest due first
+        self._due = sorted(self._due_entry(self._loans[loan_id]) for loan_id in self._open.values())
+    
+    def __len__(self) -> int:
+        return len(self._loans)
+    
+    def new_loan(self, book_id: str, user_id: str, borrow_date: str, due_date: str) -> Dict:
+        """Create a loan record with a fresh loan_id, without adding it yet."""
+        self.next_loan_id += 1
+        return {
+            "loan_id": self.next_loan_id - 1,
+            "book_id": book_id,
+            "user_id": user_id,
+            "borrow_date": borrow_date,
+            "due_date": due_date,
+            "return_date": None
+        }
+    
+    @staticmethod
+    def _due_entry(loan: Dict) -> Tuple[datetime, int]:
+        return datetime.fromisoformat(loan["due_date"]), loan["loan_id"]
+    
+    def add(self, loan: Dict) -> None:
+        """Append a loan to the ledger and update indexes and counters."""
+        self._index(loan)
+        if loan["return_date"] is None:
+            insort(self._due, self._due_entry(loan))
+    
+    def _index(self, loan: Dict) -> None:
+        loan_id = loan["loan_id"]
+        book_id = loan["book_id"]
+        self._loans[loan_id] = loan
+        self.next_loan_id = max(self.next_loan_id, loan_id + 1)
+        self._by_book.setdefault(book_id, []).append(loan_id)
+        self._by_user.setdefault(loan["user_id"], []).append(loan_id)
+        if loan["return_date"] is None:
+            self._open[book_id] = loan_id
+        
+        count = self._borrow_counts.get(book_id, 0)
+        if count:
+            bucket = self._books_by_count[count]
+            bucket.discard(book_id)
+            if not bucket:
+                del self._books_by_count[count]
+        count += 1
+        self._borrow_counts[book_id] = count
+        self._books_by_count.setdefault(count, set()).add(book_id)
+    
+    def merge(self, loan: Dict) -> None:
+        """Apply a loan recorded elsewhere: add it if it is new, or record its return."""
+        known = self._loans.get(loan["loan_id"])
+        if known is None:
+            self.add(loan)
+        elif known["return_date"] is None and loan["return_date"] is not None:
+            self.close(known["book_id"], loan["return_date"])
+    
+    def close(self, book_id: str, return_date: str) -> Optional[Dict]:
+        """Mark the open loan of a book as returned and return it."""
+        loan_id = self._open.pop(book_id, None)
+        if loan_id is None:
+            return None
+        loan = self._loans[loan_id]
+        loan["return_date"] = return_date
+        entry = self._due_entry(loan)
+        position = bisect_left(self._due, entry)
+        if position < len(self._due) and self._due[position] == entry:
+            del self._due[position]
+        return loan
+    
+    def open_loan(self, book_id: str) -> Optional[Dict]:
+        """Return the loan a book is currently out on, or None."""
+        loan_id = self._open.get(book_id)
+        return None if loan_id is None else self._loans[loan_id]
+    
+    def open_loans(self) -> Iterator[Dict]:
+        """Yield every loan that has not been returned yet."""
+        return (self._loans[loan_id] for loan_id in self._open.values())
+    
+    def open_count(self) -> int:
+        """Number of books currently out."""
+        return len(self._open)
+    
+    def open_by_due(self) -> Iterator[Tuple[datetime, Dict]]:
+        """Yield (due date, loan) for every open loan, earliest due first."""
+        return ((due, self._loans[loan_id]) for due, loan_id in self._due)
+    
+    def overdue(self, as_of: datetime) -> Iterator[Tuple[datetime, Dict]]:
+        """Yield (due date, loan) for open loans due before as_of, most overdue first."""
+        end = bisect_left(self._due, (as_of,))
+        return ((due, self._loans[loan_id]) for due, loan_id in islice(self._due, end))
+    
+    def late_fees(self, as_of: datetime, fee_per_day: int) -> Tuple[int, int]:
+        """
+        Return (overdue loans, total late fees) as of a moment.
+        
+        Only the overdue prefix of the due-date index is visited, so the cost
+        grows with the number of overdue loans, not with the open loans.
+        """
+        end = bisect_left(self._due, (as_of,))
+        days_late = sum((as_of - due).days for due, _ in islice(self._due, end))
+        return end, days_late * fee_per_day
+    
+    def loans_for_book(self, book_id: str) -> List[Dict]:
+        """Every loan of a book, oldest first."""
+        return [self._loans[loan_id] for loan_id in self._by_book.get(book_id, ())]
+    
+    def loans_for_user(self, user_id: str) -> List[Dict]:
+        """Every loan made by a user, oldest first."""
+        return [self._loans[loan_id] for loan_id in self._by_user.get(user_id, ())]
+    
+    def borrow_count(self, book_id: str) -> int:
+        """Number of times a book has been borrowed."""
+        return self._borrow_counts.get(book_id, 0)
+    
+    def top_books(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Return the most borrowed books as (book_id, times borrowed).
+        
+        Only counts some book has are kept as buckets (emptied ones are
+        dropped), so this visits the distinct borrow counts, highest first,
+        and never the books or loans behind them.
+        """
+        top = []
+        for count in sorted(self._books_by_count, reverse=True):
+            if len(top) >= limit:
+                break
+            for book_id in heapq.nsmallest(limit - len(top), self._books_by_count[count], key=_id_order):
+                top.append((book_id, count))
+        return top
@@ -4,29 +4,67 @@ Library Management System
 A command-line interface for managing books and users in a library.
 """
 
-import json
+import argparse
 import csv
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
 import sys
 
+from library_index import SEARCH_FIELDS, CatalogIndex
+from library_loans import LoanLedger
+from library_storage import (ConflictError, JSONLibraryStorage, SQLiteLibraryStorage, load_json,
+                             read_records, save_json)
+
 
 class LibraryManagementSystem:
     """Main class for the Library Management System."""
     
-    def __init__(self):
-        """Initialize the library management system."""
+    # Tries for adding books or users when another terminal takes the same IDs
+    MAX_ATTEMPTS = 5
+    
+    def __init__(self, storage: str = "json"):
+        """
+        Initialize the library management system.
+        
+        Args:
+            storage: 'json' for books.json/users.json/borrowed_books.json, or
+                'sqlite' to keep everything in library.db with transactional
+                borrows and returns; several terminals can share library.db
+        """
         self.books_file = "books.json"
         self.users_file = "users.json"
         self.borrowed_books_file = "borrowed_books.json"
+        self.loans_file = "loans.jsonl"
+        self.database_file = "library.db"
         self.late_fee_per_day = 10  # ₹10 per day
         self.borrow_duration_days = 14  # 14 days borrowing period
         
         # Initialize data files
-        self.books = self.load_data(self.books_file, {})
-        self.users = self.load_data(self.users_file, {})
-        self.borrowed_books = self.load_data(self.borrowed_books_file, {})
+        self.storage = self.open_storage(storage)
+        self.load_library()
+
+    def load_library(self) -> None:
+        """Load all data from storage and rebuild the in-memory indexes."""
+        with self.storage.snapshot():
+            self.books, self.users, self.borrowed_books = self.storage.load()
+            loans = list(self.storage.load_loans())
+        
+        # Token index over titles, authors and genres for search
+        self.catalog = CatalogIndex(self.books.values())
+        
+        # Full loan history; libraries saved before the ledger existed start
+        # it from the latest loan of each book
+        if not loans and self.borrowed_books:
+            loans = self.seed_loans()
+            self.reconcile_loans(loans)
+            self.persist(self.storage.save_loans, loans)
+        else:
+            reconciled = self.reconcile_loans(loans)
+            if reconciled:
+                self.persist(self.storage.update_loans, reconciled)
+        self.loans = LoanLedger(loans)
         
         # Generate IDs if files are empty
         if not self.books:
@@ -39,26 +77,364 @@ class LibraryManagementSystem:
         else:
             self.next_user_id = max(int(k) for k in self.users.keys()) + 1 if self.users else 1
 
+    def refresh(self) -> bool:
+        """
+        Pick up what other terminals have written since the last load or refresh.
+        
+        Only the SQLite backend can tell; the check is a single PRAGMA, so
+        it runs before every operation. Only the rows written since are read,
+        and the indexes are updated for just those rows.
+        """
+        if not self.storage.changed():
+            return False
+        self.apply_changes(*self.storage.load_changes())
+        return True
+    
+    def apply_changes(self, books: Dict, users: Dict, borrowed_books: Dict, loans: List[Dict]) -> None:
+        """Fold rows written at another terminal into memory and the indexes."""
+        for book_id, book in books.items():
+            current = self.books.get(book_id)
+            if book is None:
+                if current is not None:
+                    self.catalog.remove(self.books.pop(book_id))
+            elif current is None:
+                self.books[book_id] = book
+                self.catalog.add(book)
+                self.next_book_id = max(self.next_book_id, int(book_id) + 1)
+            elif any(current[field] != book[field] for field in SEARCH_FIELDS):
+                self.catalog.remove(current)
+                current.update(book)
+                self.catalog.add(current)
+            else:
+                current.update(book)
+        
+        for user_id, user in users.items():
+            if user is None:
+                self.users.pop(user_id, None)
+            elif user_id in self.users:
+                self.users[user_id]["name"] = user["name"]
+            else:
+                self.users[user_id] = user
+                self.next_user_id = max(self.next_user_id, int(user_id) + 1)
+        
+        # A user's borrowed_books list follows their open borrowing records
+        for book_id, record in borrowed_books.items():
+            previous = self.borrowed_books.get(book_id)
+            if previous is not None and not previous["returned"] and previous["user_id"] in self.users:
+                borrowed = self.users[previous["user_id"]]["borrowed_books"]
+                if book_id in borrowed:
+                    borrowed.remove(book_id)
+            if record is None:
+                self.borrowed_books.pop(book_id, None)
+                continue
+            self.borrowed_books[book_id] = record
+            if not record["returned"] and record["user_id"] in self.users:
+                self.users[record["user_id"]]["borrowed_books"].append(book_id)
+        
+        for loan in loans:
+            self.loans.merge(loan)
+    
+    def open_storage(self, storage: str):
+        """Open the JSON files or the SQLite database."""
+        json_storage = JSONLibraryStorage(self.books_file, self.users_file, self.borrowed_books_file,
+                                          self.loans_file)
+        if storage != "sqlite":
+            return json_storage
+        
+        database = SQLiteLibraryStorage(self.database_file)
+        json_files = (self.books_file, self.users_file, self.borrowed_books_file)
+        if database.is_empty() and any(os.path.exists(name) for name in json_files):
+            # First start on SQLite: bring the existing JSON data along
+            database.import_data(*json_storage.load())
+            database.save_loans(json_storage.load_loans())
+            print(f"✅ Imported existing JSON data into {self.database_file}")
+        return database
+    
+    def seed_loans(self) -> List[Dict]:
+        """Build initial ledger entries from the per-book loan records."""
+        loans = []
+        for loan_id, (book_id, record) in enumerate(self.borrowed_books.items(), 1):
+            return_date = None
+            if record["returned"]:
+                return_date = record.get("return_date", record["due_date"])
+            loans.append({
+                "loan_id": loan_id,
+                "book_id": book_id,
+                "user_id": record["user_id"],
+                "borrow_date": record["borrow_date"],
+                "due_date": record["due_date"],
+                "return_date": return_date
+            })
+        return loans
+    
+    def reconcile_loans(self, loans: List[Dict]) -> List[Dict]:
+        """
+        Make the open loans in a loan history match borrowed_books.
+        
+        borrowed_books decides which books are out. Open loans it does not
+        know about are closed, and loans it records that the history lacks
+        (written by older versions, or lost to a crash between files) are
+        added, so views and reports built from the ledger agree with it.
+        
+        Returns:
+            The loans that were added or closed
+        """
+        open_loans = {loan["book_id"]: loan for loan in loans if loan["return_date"] is None}
+        next_loan_id = max((loan["loan_id"] for loan in loans), default=0) + 1
+        changed = []
+        for book_id, record in self.borrowed_books.items():
+            loan = open_loans.pop(book_id, None)
+            if (loan is not None and not record["returned"] and loan["user_id"] == record["user_id"]
+                    and loan["borrow_date"] == record["borrow_date"]):
+                continue
+            if loan is not None:
+                # Returned, or it could not have been lent again
+                loan["return_date"] = record.get("return_date") or (
+                    loan["due_date"] if record["returned"] else record["borrow_date"])
+                changed.append(loan)
+            if not record["returned"]:
+                changed.append({
+                    "loan_id": next_loan_id,
+                    "book_id": book_id,
+                    "user_id": record["user_id"],
+                    "borrow_date": record["borrow_date"],
+                    "due_date": record["due_date"],
+                    "return_date": None
+                })
+                loans.append(changed[-1])
+                next_loan_id += 1
+        
+        # Books with no loan record at all are not out either
+        for loan in open_loans.values():
+            loan["return_date"] = loan["due_date"]
+            changed.append(loan)
+        return changed
+    
     def load_data(self, filename: str, default: dict) -> dict:
         """Load data from JSON file."""
-        try:
-            if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as file:
-                    return json.load(file)
-            return default
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Warning: Could not load {filename}: {e}")
-            return default
-
+        return load_json(filename, default)
+    
     def save_data(self, filename: str, data: dict) -> bool:
         """Save data to JSON file."""
         try:
-            with open(filename, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=2, ensure_ascii=False)
+            save_json(filename, data)
             return True
         except Exception as e:
             print(f"Error saving {filename}: {e}")
             return False
+    
+    def persist(self, action, *args) -> bool:
+        """Run a storage write, reporting a failure instead of raising."""
+        try:
+            action(*args)
+            return True
+        except Exception as e:
+            print(f"Error saving data: {e}")
+            return False
+
+    def add_books(self, books: Iterable[Dict]) -> List[str]:
+        """
+        Add books to the catalog and return their new IDs.
+        
+        Every book needs a title, author and genre. The whole batch is
+        checked first and then saved with a single storage write.
+        
+        Raises:
+            ValueError: If a book is missing a field; nothing is added then
+        """
+        entries = []
+        for position, book in enumerate(books, 1):
+            entry = {}
+            for field in ("title", "author", "genre"):
+                value = str(book.get(field) or "").strip()
+                if not value:
+                    raise ValueError(f"Book {position}: {field.capitalize()} cannot be empty!")
+                entry[field] = value
+            entries.append(entry)
+        
+        for attempt in range(self.MAX_ATTEMPTS):
+            self.refresh()
+            records = [{"book_id": str(self.next_book_id + i), **entry, "availability": True}
+                       for i, entry in enumerate(entries)]
+            for record in records:
+                self.books[record["book_id"]] = record
+            try:
+                self.storage.insert_books(records)
+                break
+            except Exception as e:
+                for record in records:
+                    del self.books[record["book_id"]]
+                # Another terminal took these IDs first: reload and renumber
+                if not isinstance(e, ConflictError) or attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+        
+        for record in records:
+            self.catalog.add(record)
+        self.next_book_id += len(records)
+        return [record["book_id"] for record in records]
+
+    def register_users(self, users: Iterable[Dict]) -> List[str]:
+        """
+        Register users and return their new IDs.
+        
+        Every user needs a name. The whole batch is checked first and then
+        saved with a single storage write.
+        
+        Raises:
+            ValueError: If a user has no name; nobody is registered then
+        """
+        names = []
+        for position, user in enumerate(users, 1):
+            name = str(user.get("name") or "").strip()
+            if not name:
+                raise ValueError(f"User {position}: Name cannot be empty!")
+            names.append(name)
+        
+        for attempt in range(self.MAX_ATTEMPTS):
+            self.refresh()
+            records = [{"user_id": str(self.next_user_id + i), "name": name, "borrowed_books": []}
+                       for i, name in enumerate(names)]
+            for record in records:
+                self.users[record["user_id"]] = record
+            try:
+                self.storage.insert_users(records)
+                break
+            except Exception as e:
+                for record in records:
+                    del self.users[record["user_id"]]
+                # Another terminal took these IDs first: reload and renumber
+                if not isinstance(e, ConflictError) or attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+        
+        self.next_user_id += len(records)
+        return [record["user_id"] for record in records]
+
+    def borrow_books(self, requests: Iterable[Tuple[str, str]],
+                     when: Optional[datetime] = None) -> List[Dict]:
+        """
+        Lend books to users as one batch.
+        
+        Args:
+            requests: (user_id, book_id) pairs
+            when: Borrow time of every loan (default: now)
+        
+        Returns:
+            The new ledger loans, in request order
+        
+        Raises:
+            ValueError: If a request is invalid; nothing is borrowed then
+        """
+        self.refresh()
+        borrow_date = when or datetime.now()
+        due_date = borrow_date + timedelta(days=self.borrow_duration_days)
+        applied = []
+        changes = []
+        try:
+            for user_id, book_id in requests:
+                if user_id not in self.users:
+                    raise ValueError(f"User {user_id} not found!")
+                if book_id not in self.books:
+                    raise ValueError(f"Book {book_id} not found!")
+                if not self.books[book_id]["availability"]:
+                    raise ValueError(f"Book {book_id} is not available!")
+                if book_id in self.users[user_id]["borrowed_books"]:
+                    raise ValueError(f"User {user_id} has already borrowed book {book_id}!")
+                
+                applied.append((user_id, book_id, self.borrowed_books.get(book_id)))
+                self.books[book_id]["availability"] = False
+                self.users[user_id]["borrowed_books"].append(book_id)
+                self.borrowed_books[book_id] = {
+                    "user_id": user_id,
+                    "borrow_date": borrow_date.isoformat(),
+                    "due_date": due_date.isoformat(),
+                    "returned": False
+                }
+                ledger_loan = self.loans.new_loan(book_id, user_id, borrow_date.isoformat(),
+                                                  due_date.isoformat())
+                changes.append((self.books[book_id], self.borrowed_books[book_id], ledger_loan))
+            
+            self.storage.record_loans(changes)
+        except Exception:
+            # Nothing was committed, so undo the in-memory changes too
+            for user_id, book_id, previous_loan in reversed(applied):
+                self.books[book_id]["availability"] = True
+                self.users[user_id]["borrowed_books"].remove(book_id)
+                if previous_loan is None:
+                    del self.borrowed_books[book_id]
+                else:
+                    self.borrowed_books[book_id] = previous_loan
+            raise
+        
+        for _, _, ledger_loan in changes:
+            self.loans.add(ledger_loan)
+        return [ledger_loan for _, _, ledger_loan in changes]
+
+    def return_books(self, requests: Iterable[Tuple[str, str]],
+                     when: Optional[datetime] = None) -> List[int]:
+        """
+        Take back borrowed books as one batch.
+        
+        Args:
+            requests: (user_id, book_id) pairs
+            when: Return time of every book (default: now)
+        
+        Returns:
+            The late fee of each return, in request order
+        
+        Raises:
+            ValueError: If a request is invalid; nothing is returned then
+        """
+        self.refresh()
+        return_time = when or datetime.now()
+        return_date = return_time.isoformat()
+        applied = []
+        changes = []
+        late_fees = []
+        try:
+            for user_id, book_id in requests:
+                if user_id not in self.users:
+                    raise ValueError(f"User {user_id} not found!")
+                if book_id not in self.books:
+                    raise ValueError(f"Book {book_id} not found!")
+                if book_id not in self.users[user_id]["borrowed_books"]:
+                    raise ValueError(f"User {user_id} has not borrowed book {book_id}!")
+                
+                late_fees.append(self.calculate_late_fee(book_id, return_time))
+                previous_loan = self.borrowed_books.get(book_id)
+                applied.append((user_id, book_id, previous_loan))
+                self.books[book_id]["availability"] = True
+                self.users[user_id]["borrowed_books"].remove(book_id)
+                if previous_loan is not None:
+                    self.borrowed_books[book_id] = dict(previous_loan, returned=True,
+                                                        return_date=return_date)
+                open_loan = self.loans.open_loan(book_id)
+                closed_loan = dict(open_loan, return_date=return_date) if open_loan else None
+                changes.append((self.books[book_id], self.borrowed_books.get(book_id), closed_loan))
+            
+            self.storage.record_loans(changes)
+        except Exception:
+            # Nothing was committed, so undo the in-memory changes too
+            for user_id, book_id, previous_loan in reversed(applied):
+                self.books[book_id]["availability"] = False
+                self.users[user_id]["borrowed_books"].append(book_id)
+                if previous_loan is not None:
+                    self.borrowed_books[book_id] = previous_loan
+            raise
+        
+        for _, book_id, _ in applied:
+            self.loans.close(book_id, return_date)
+        return late_fees
+
+    def import_file(self, filename: str, kind: str = "books") -> List[str]:
+        """
+        Bulk-load books or users from a CSV file (with a header row) or a
+        JSON Lines file, saving the whole file in one storage write.
+        
+        Returns:
+            IDs of the added books or users
+        """
+        loader = self.register_users if kind == "users" else self.add_books
+        return loader(read_records(filename))
 
     def add_book(self) -> None:
         """Add a new book to the library."""
@@ -82,22 +458,8 @@ class LibraryManagementSystem:
                 print("❌ Genre cannot be empty!")
                 return
             
-            book_id = str(self.next_book_id)
-            book_data = {
-                "book_id": book_id,
-                "title": title,
-                "author": author,
-                "genre": genre,
-                "availability": True
-            }
-            
-            self.books[book_id] = book_data
-            self.next_book_id += 1
-            
-            if self.save_data(self.books_file, self.books):
-                print(f"✅ Book added successfully! Book ID: {book_id}")
-            else:
-                print("❌ Failed to save book data!")
+            book_id = self.add_books([{"title": title, "author": author, "genre": genre}])[0]
+            print(f"✅ Book added successfully! Book ID: {book_id}")
                 
         except KeyboardInterrupt:
             print("\n❌ Operation cancelled!")
@@ -135,30 +497,28 @@ class LibraryManagementSystem:
         print("1. Title")
         print("2. Author")
         print("3. Genre")
+        print("4. All fields (e.g. python author:doe genre:programming)")
         
         try:
-            choice = input("\nEnter your choice (1-3): ").strip()
+            choice = input("\nEnter your choice (1-4): ").strip()
             search_term = input("Enter search term: ").strip().lower()
             
             if not search_term:
                 print("❌ Search term cannot be empty!")
                 return
             
-            results = []
-            
-            if choice == "1":
-                results = [book for book in self.books.values() 
-                          if search_term in book["title"].lower()]
-            elif choice == "2":
-                results = [book for book in self.books.values() 
-                          if search_term in book["author"].lower()]
-            elif choice == "3":
-                results = [book for book in self.books.values() 
-                          if search_term in book["genre"].lower()]
+            fields = {"1": "title", "2": "author", "3": "genre"}
+            if choice in fields:
+                # Every word of the term must appear in the chosen field
+                query = " ".join(f"{fields[choice]}:{word}" for word in search_term.split())
+            elif choice == "4":
+                query = search_term
             else:
                 print("❌ Invalid choice!")
                 return
             
+            results = self.find_books(query)
+            
             if results:
                 print(f"\n🔍 Found {len(results)} book(s):")
                 print("-" * 80)
@@ -176,6 +536,15 @@ class LibraryManagementSystem:
         except Exception as e:
             print(f"❌ Error searching books: {e}")
 
+    def find_books(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Find books matching all words of a query, best matches first.
+        
+        Words match whole words or word starts in the title, author or genre;
+        prefix a word with 'title:', 'author:' or 'genre:' to restrict it.
+        """
+        return [self.books[book_id] for book_id in self.catalog.search(query, limit)]
+
     def register_user(self) -> None:
         """Register a new user."""
         print("\n" + "="*50)
@@ -188,20 +557,8 @@ class LibraryManagementSystem:
                 print("❌ Name cannot be empty!")
                 return
             
-            user_id = str(self.next_user_id)
-            user_data = {
-                "user_id": user_id,
-                "name": name,
-                "borrowed_books": []
-            }
-            
-            self.users[user_id] = user_data
-            self.next_user_id += 1
-            
-            if self.save_data(self.users_file, self.users):
-                print(f"✅ User registered successfully! User ID: {user_id}")
-            else:
-                print("❌ Failed to save user data!")
+            user_id = self.register_users([{"name": name}])[0]
+            print(f"✅ User registered successfully! User ID: {user_id}")
                 
         except KeyboardInterrupt:
             print("\n❌ Operation cancelled!")
@@ -234,31 +591,10 @@ class LibraryManagementSystem:
                 print("❌ User has already borrowed this book!")
                 return
             
-            # Update book availability
-            self.books[book_id]["availability"] = False
-            
-            # Add to user's borrowed books
-            self.users[user_id]["borrowed_books"].append(book_id)
-            
-            # Record borrowing details
-            borrow_date = datetime.now()
-            due_date = borrow_date + timedelta(days=self.borrow_duration_days)
-            
-            self.borrowed_books[book_id] = {
-                "user_id": user_id,
-                "borrow_date": borrow_date.isoformat(),
-                "due_date": due_date.isoformat(),
-                "returned": False
-            }
-            
-            if (self.save_data(self.books_file, self.books) and 
-                self.save_data(self.users_file, self.users) and 
-                self.save_data(self.borrowed_books_file, self.borrowed_books)):
-                
-                print(f"✅ Book borrowed successfully!")
-                print(f"📅 Due date: {due_date.strftime('%Y-%m-%d %H:%M:%S')}")
-            else:
-                print("❌ Failed to save borrowing data!")
+            loan = self.borrow_books([(user_id, book_id)])[0]
+            due_date = datetime.fromisoformat(loan["due_date"])
+            print(f"✅ Book borrowed successfully!")
+            print(f"📅 Due date: {due_date.strftime('%Y-%m-%d %H:%M:%S')}")
                 
         except KeyboardInterrupt:
             print("\n❌ Operation cancelled!")
@@ -286,45 +622,26 @@ class LibraryManagementSystem:
                 print("❌ User has not borrowed this book!")
                 return
             
-            # Calculate late fee
-            late_fee = self.calculate_late_fee(book_id)
-            
-            # Update book availability
-            self.books[book_id]["availability"] = True
-            
-            # Remove from user's borrowed books
-            self.users[user_id]["borrowed_books"].remove(book_id)
-            
-            # Mark as returned
-            if book_id in self.borrowed_books:
-                self.borrowed_books[book_id]["returned"] = True
-                self.borrowed_books[book_id]["return_date"] = datetime.now().isoformat()
-            
-            if (self.save_data(self.books_file, self.books) and 
-                self.save_data(self.users_file, self.users) and 
-                self.save_data(self.borrowed_books_file, self.borrowed_books)):
-                
-                print(f"✅ Book returned successfully!")
-                if late_fee > 0:
-                    print(f"💰 Late fee: ₹{late_fee}")
-                else:
-                    print("✅ No late fee - returned on time!")
+            late_fee = self.return_books([(user_id, book_id)])[0]
+            print(f"✅ Book returned successfully!")
+            if late_fee > 0:
+                print(f"💰 Late fee: ₹{late_fee}")
             else:
-                print("❌ Failed to save return data!")
+                print("✅ No late fee - returned on time!")
                 
         except KeyboardInterrupt:
             print("\n❌ Operation cancelled!")
         except Exception as e:
             print(f"❌ Error returning book: {e}")
 
-    def calculate_late_fee(self, book_id: str) -> int:
-        """Calculate late fee for a book."""
+    def calculate_late_fee(self, book_id: str, as_of: Optional[datetime] = None) -> int:
+        """Calculate late fee for a book, as of now unless another time is given."""
         if book_id not in self.borrowed_books:
             return 0
         
         borrow_record = self.borrowed_books[book_id]
         due_date = datetime.fromisoformat(borrow_record["due_date"])
-        current_date = datetime.now()
+        current_date = as_of or datetime.now()
         
         if current_date > due_date:
             days_late = (current_date - due_date).days
@@ -352,8 +669,9 @@ class LibraryManagementSystem:
             confirm = input(f"Are you sure you want to delete '{book_title}'? (yes/no): ").strip().lower()
             
             if confirm == "yes":
-                del self.books[book_id]
-                if self.save_data(self.books_file, self.books):
+                # Only forget the book once the deletion is saved
+                if self.persist(self.storage.delete_book, book_id):
+                    self.catalog.remove(self.books.pop(book_id))
                     print("✅ Book deleted successfully!")
                 else:
                     print("❌ Failed to save changes!")
@@ -385,8 +703,9 @@ class LibraryManagementSystem:
             confirm = input(f"Are you sure you want to delete user '{user_name}'? (yes/no): ").strip().lower()
             
             if confirm == "yes":
-                del self.users[user_id]
-                if self.save_data(self.users_file, self.users):
+                # Only forget the user once the deletion is saved
+                if self.persist(self.storage.delete_user, user_id):
+                    del self.users[user_id]
                     print("✅ User deleted successfully!")
                 else:
                     print("❌ Failed to save changes!")
@@ -404,22 +723,23 @@ class LibraryManagementSystem:
         print("BORROWED BOOKS")
         print("="*80)
         
-        if not self.borrowed_books:
+        if not self.loans.open_count():
             print("📚 No books are currently borrowed!")
             return
         
         print(f"{'Book ID':<8} {'Book Title':<30} {'User':<20} {'Due Date':<15} {'Status'}")
         print("-" * 80)
         
-        for book_id, borrow_info in self.borrowed_books.items():
-            if not borrow_info["returned"] and book_id in self.books:
+        # Earliest due first, so overdue books head the list
+        current_date = datetime.now()
+        for due_date, loan in self.loans.open_by_due():
+            book_id = loan["book_id"]
+            if book_id in self.books:
                 book = self.books[book_id]
-                user = self.users.get(borrow_info["user_id"], {"name": "Unknown"})
-                due_date = datetime.fromisoformat(borrow_info["due_date"])
+                user = self.users.get(loan["user_id"], {"name": "Unknown"})
                 due_date_str = due_date.strftime("%Y-%m-%d")
                 
                 # Check if overdue
-                current_date = datetime.now()
                 status = "⚠️ Overdue" if current_date > due_date else "📅 On time"
                 
                 print(f"{book_id:<8} {book['title']:<30} {user['name']:<20} {due_date_str:<15} {status}")
@@ -441,33 +761,17 @@ class LibraryManagementSystem:
         print(f"   Borrowed Books: {borrowed_books}")
         print(f"   Total Users: {total_users}")
         
-        # Top borrowed books
-        if self.borrowed_books:
+        # Top borrowed books, from the ledger's running counters
+        if len(self.loans):
             print(f"\n📈 Borrowing Activity:")
-            borrow_counts = {}
-            for book_id, borrow_info in self.borrowed_books.items():
-                if book_id in self.books:
-                    book_title = self.books[book_id]["title"]
-                    borrow_counts[book_title] = borrow_counts.get(book_title, 0) + 1
-            
-            if borrow_counts:
-                sorted_books = sorted(borrow_counts.items(), key=lambda x: x[1], reverse=True)
-                print("   Top Borrowed Books:")
-                for i, (title, count) in enumerate(sorted_books[:5], 1):
-                    print(f"   {i}. {title} ({count} times)")
+            print(f"   Total Loans: {len(self.loans)}")
+            print("   Top Borrowed Books:")
+            for i, (book_id, count) in enumerate(self.loans.top_books(5), 1):
+                book_title = self.books.get(book_id, {}).get("title", f"Deleted book #{book_id}")
+                print(f"   {i}. {book_title} ({count} times)")
         
         # Overdue books
-        overdue_count = 0
-        total_late_fees = 0
-        current_date = datetime.now()
-        
-        for book_id, borrow_info in self.borrowed_books.items():
-            if not borrow_info["returned"]:
-                due_date = datetime.fromisoformat(borrow_info["due_date"])
-                if current_date > due_date:
-                    overdue_count += 1
-                    late_fee = self.calculate_late_fee(book_id)
-                    total_late_fees += late_fee
+        overdue_count, total_late_fees = self.loans.late_fees(datetime.now(), self.late_fee_per_day)
         
         if overdue_count > 0:
             print(f"\n⚠️ Overdue Books: {overdue_count}")
@@ -475,6 +779,60 @@ class LibraryManagementSystem:
         else:
             print(f"\n✅ No overdue books!")
 
+    def fee_snapshot(self, as_of: datetime, show: int = 10) -> None:
+        """Print overdue loans and late fees as of a given moment."""
+        print("\n" + "="*80)
+        print(f"LATE FEES AS OF {as_of.strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*80)
+        
+        overdue_count, total_late_fees = self.loans.late_fees(as_of, self.late_fee_per_day)
+        print(f"📖 Open Loans: {self.loans.open_count()}")
+        print(f"⚠️ Overdue Loans: {overdue_count}")
+        print(f"💰 Total Late Fees: ₹{total_late_fees}")
+        
+        if overdue_count and show > 0:
+            print(f"\n{'Book ID':<8} {'User ID':<8} {'Due Date':<12} {'Days Late':<10} {'Late Fee'}")
+            print("-" * 80)
+            for due_date, loan in islice(self.loans.overdue(as_of), show):
+                days_late = (as_of - due_date).days
+                print(f"{loan['book_id']:<8} {loan['user_id']:<8} {due_date.strftime('%Y-%m-%d'):<12} "
+                      f"{days_late:<10} ₹{days_late * self.late_fee_per_day}")
+            if overdue_count > show:
+                print(f"... and {overdue_count - show} more")
+
+    def view_user_history(self) -> None:
+        """Display every loan a user has made, oldest first."""
+        print("\n" + "="*80)
+        print("USER LOAN HISTORY")
+        print("="*80)
+        
+        try:
+            user_id = input("Enter user ID: ").strip()
+            if user_id not in self.users:
+                print("❌ User not found!")
+                return
+            
+            history = self.loans.loans_for_user(user_id)
+            if not history:
+                print(f"📚 {self.users[user_id]['name']} has not borrowed any books yet!")
+                return
+            
+            print(f"📖 Loans of {self.users[user_id]['name']}: {len(history)}")
+            print(f"{'Book ID':<8} {'Book Title':<30} {'Borrowed':<12} {'Due Date':<12} {'Returned'}")
+            print("-" * 80)
+            
+            for loan in history:
+                book = self.books.get(loan["book_id"], {"title": "Deleted book"})
+                borrowed = loan["borrow_date"][:10]
+                due = loan["due_date"][:10]
+                returned = loan["return_date"][:10] if loan["return_date"] else "📖 Not yet"
+                print(f"{loan['book_id']:<8} {book['title']:<30} {borrowed:<12} {due:<12} {returned}")
+        
+        except KeyboardInterrupt:
+            print("\n❌ Operation cancelled!")
+        except Exception as e:
+            print(f"❌ Error showing loan history: {e}")
+
     def display_menu(self) -> None:
         """Display the main menu."""
         print("\n" + "="*60)
@@ -490,7 +848,8 @@ class LibraryManagementSystem:
         print("8.  Delete User")
         print("9.  View Borrowed Books")
         print("10. Generate Report")
-        print("11. Exit Program")
+        print("11. User Loan History")
+        print("12. Exit Program")
         print("="*60)
 
     def run(self) -> None:
@@ -501,7 +860,11 @@ class LibraryManagementSystem:
         while True:
             try:
                 self.display_menu()
-                choice = input("\nEnter your choice (1-11): ").strip()
+                choice = input("\nEnter your choice (1-12): ").strip()
+                
+                # Pick up changes made at other terminals since the last action
+                if self.refresh():
+                    print("🔄 Loaded changes made at another terminal.")
                 
                 if choice == "1":
                     self.add_book()
@@ -524,11 +887,13 @@ class LibraryManagementSystem:
                 elif choice == "10":
                     self.generate_report()
                 elif choice == "11":
+                    self.view_user_history()
+                elif choice == "12":
                     print("\n👋 Thank you for using Library Management System!")
                     print("📚 Goodbye!")
                     break
                 else:
-                    print("❌ Invalid choice! Please enter a number between 1-11.")
+                    print("❌ Invalid choice! Please enter a number between 1-12.")
                 
                 input("\nPress Enter to continue...")
                 
@@ -538,12 +903,42 @@ class LibraryManagementSystem:
             except Exception as e:
                 print(f"\n❌ An unexpected error occurred: {e}")
                 input("Press Enter to continue...")
+        
+        self.storage.close()
 
 
 def main():
     """Main function to start the program."""
+    parser = argparse.ArgumentParser(description="Library Management System")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json",
+                        help="Keep data in JSON files (default) or in library.db")
+    commands = parser.add_subparsers(dest="command")
+    fees = commands.add_parser("fees", help="Print overdue loans and late fees, then exit")
+    fees.add_argument("--as-of", type=datetime.fromisoformat, default=None, metavar="DATE",
+                      help="Compute fees as of this date, e.g. 2024-02-01 (default: now)")
+    fees.add_argument("--show", type=int, default=10, metavar="N",
+                      help="List the N most overdue loans (default: 10)")
+    bulk = commands.add_parser("import", help="Bulk-load books or users from a CSV or JSONL file")
+    bulk.add_argument("kind", choices=["books", "users"])
+    bulk.add_argument("file", help="CSV with a header row (title,author,genre or name), or JSONL")
+    args = parser.parse_args()
+    
     try:
-        library = LibraryManagementSystem()
+        library = LibraryManagementSystem(args.storage)
+        if args.command == "fees":
+            library.fee_snapshot(args.as_of or datetime.now(), args.show)
+            library.storage.close()
+            return
+        if args.command == "import":
+            try:
+                added = library.import_file(args.file, args.kind)
+                print(f"✅ Imported {len(added)} {args.kind} from {args.file}")
+            except (OSError, ValueError) as e:
+                print(f"❌ Import failed: {e}")
+                sys.exit(1)
+            finally:
+                library.storage.close()
+            return
         library.run()
     except Exception as e:
         print(f"❌ Failed to start Library Management System: {e}")
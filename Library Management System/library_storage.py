@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Storage backends for the Library Management System.
+Books, users and loans either live in three JSON files or in one SQLite database.
+"""
+
+import csv
+import json
+import os
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# A borrow or return to persist: (book, its borrowed_books record, ledger loan)
+LoanChange = Tuple[Dict, Optional[Dict], Optional[Dict]]
+
+
+class ConflictError(Exception):
+    """Another terminal changed the same record first; nothing was written."""
+
+
+def load_json(filename: str, default: dict) -> dict:
+    """Load a JSON file, returning default if it is missing or unreadable."""
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        return default
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not load {filename}: {e}")
+        return default
+
+
+def save_json(filename: str, data: dict) -> None:
+    """Write a JSON file atomically via a temporary file and rename."""
+    temp_file = f"{filename}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+    os.replace(temp_file, filename)
+
+
+def read_records(filename: str) -> Iterator[Dict]:
+    """Yield records from a CSV file with a header row, or from a JSON Lines file."""
+    with open(filename, 'r', encoding='utf-8', newline='') as file:
+        if filename.lower().endswith('.csv'):
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class JSONLibraryStorage:
+    """
+    The original books.json / users.json / borrowed_books.json layout.
+    
+    Every change rewrites the affected files in full from the dicts returned
+    by load(). Each file is replaced atomically, but a borrow or return
+    touches three files, so use SQLiteLibraryStorage when that matters.
+    """
+    
+    def __init__(self, books_file: str, users_file: str, borrowed_books_file: str,
+                 loans_file: str = "loans.jsonl"):
+        """Remember the data file names."""
+        self.books_file = books_file
+        self.users_file = users_file
+        self.borrowed_books_file = borrowed_books_file
+        self.loans_file = loans_file
+        self.books = {}
+        self.users = {}
+        self.borrowed_books = {}
+    
+    def load(self) -> Tuple[Dict, Dict, Dict]:
+        """Load and return (books, users, borrowed_books)."""
+        self.books = load_json(self.books_file, {})
+        self.users = load_json(self.users_file, {})
+        self.borrowed_books = load_json(self.borrowed_books_file, {})
+        return self.books, self.users, self.borrowed_books
+    
+    def load_loans(self) -> Iterator[Dict]:
+        """Replay the loan log into loan records, oldest first."""
+        if not os.path.exists(self.loans_file):
+            return iter(())
+        loans = {}
+        with open(self.loans_file, 'r', encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.pop("event") == "return":
+                    loans[event["loan_id"]]["return_date"] = event["return_date"]
+                else:
+                    loans[event["loan_id"]] = dict(event, return_date=None)
+        return iter(loans.values())
+    
+    @staticmethod
+    def _loan_events(loan: Dict) -> Iterator[Dict]:
+        """The log lines describing a loan: its borrow and, once back, its return."""
+        yield {"event": "borrow", "loan_id": loan["loan_id"], "book_id": loan["book_id"],
+               "user_id": loan["user_id"], "borrow_date": loan["borrow_date"],
+               "due_date": loan["due_date"]}
+        if loan["return_date"] is not None:
+            yield {"event": "return", "loan_id": loan["loan_id"], "return_date": loan["return_date"]}
+    
+    def save_loans(self, loans: Iterable[Dict]) -> None:
+        """Write a complete loan log, replacing any existing one."""
+        temp_file = f"{self.loans_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            for loan in loans:
+                for event in self._loan_events(loan):
+                    file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        os.replace(temp_file, self.loans_file)
+    
+    def update_loans(self, loans: Iterable[Dict]) -> None:
+        """Append the latest event of each new or returned loan to the loan log."""
+        lines = [json.dumps(list(self._loan_events(loan))[-1], ensure_ascii=False) + "\n"
+                 for loan in loans]
+        if lines:
+            with open(self.loans_file, 'a', encoding='utf-8') as file:
+                file.writelines(lines)
+    
+    def snapshot(self):
+        """JSON files are read one at a time; there is no snapshot to hold."""
+        return nullcontext()
+    
+    def changed(self) -> bool:
+        """JSON files are not shared between terminals, so never."""
+        return False
+    
+    def load_changes(self) -> Tuple[Dict, Dict, Dict, List[Dict]]:
+        """Nobody else writes the JSON files, so there is nothing to load."""
+        return {}, {}, {}, []
+    
+    def save_books(self, books: Iterable[Dict]) -> None:
+        """Persist added or changed books."""
+        save_json(self.books_file, self.books)
+    
+    def insert_books(self, books: Iterable[Dict]) -> None:
+        """Persist newly added books."""
+        save_json(self.books_file, self.books)
+    
+    def delete_book(self, book_id: str) -> None:
+        """Persist a book deletion; the caller drops the book once this succeeds."""
+        save_json(self.books_file, {key: book for key, book in self.books.items() if key != book_id})
+    
+    def save_users(self, users: Iterable[Dict]) -> None:
+        """Persist added or changed users."""
+        save_json(self.users_file, self.users)
+    
+    def insert_users(self, users: Iterable[Dict]) -> None:
+        """Persist newly added users."""
+        save_json(self.users_file, self.users)
+    
+    def delete_user(self, user_id: str) -> None:
+        """Persist a user deletion; the caller drops the user once this succeeds."""
+        save_json(self.users_file, {key: user for key, user in self.users.items() if key != user_id})
+    
+    def record_loan(self, book: Dict, loan: Optional[Dict], ledger_loan: Optional[Dict] = None) -> None:
+        """Persist a borrow or return: the book, its borrower and the loan."""
+        self.record_loans([(book, loan, ledger_loan)])
+    
+    def record_loans(self, changes: Iterable[LoanChange]) -> None:
+        """
+        Persist a batch of borrows and returns with one write per file.
+        
+        Each ledger loan is appended to the loan log as a single event: a
+        borrow while its return_date is None, a return afterwards.
+        """
+        self.update_loans(ledger_loan for _, _, ledger_loan in changes if ledger_loan is not None)
+        save_json(self.books_file, self.books)
+        save_json(self.users_file, self.users)
+        save_json(self.borrowed_books_file, self.borrowed_books)
+    
+    def close(self) -> None:
+        """Nothing to release for JSON files."""
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    book_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    availability INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS borrowed_books (
+    book_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    borrow_date TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    returned INTEGER NOT NULL,
+    return_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_borrowed_books_open ON borrowed_books (returned, user_id);
+CREATE TABLE IF NOT EXISTS loans (
+    loan_id INTEGER PRIMARY KEY,
+    book_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    borrow_date TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    return_date TEXT
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id TEXT NOT NULL,
+    UNIQUE (table_name, row_id)
+);
+"""
+
+# Tables whose rows other terminals follow through the changes table, with their key
+TRACKED_TABLES = {"books": "book_id", "users": "user_id", "borrowed_books": "book_id", "loans": "loan_id"}
+
+# Every write to a tracked row, by any terminal, moves that row to the end of
+# the changes table with a new seq, so the table holds one entry per row
+SCHEMA += "".join(
+    f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_seq AFTER {event} ON {table} BEGIN "
+    f"DELETE FROM changes WHERE table_name = '{table}' AND row_id = CAST({row}.{key} AS TEXT); "
+    f"INSERT INTO changes (table_name, row_id) VALUES ('{table}', CAST({row}.{key} AS TEXT)); END;\n"
+    for table, key in TRACKED_TABLES.items()
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")))
+
+BOOK_COLUMNS = "book_id, title, author, genre, availability"
+BORROWED_COLUMNS = "book_id, user_id, borrow_date, due_date, returned, return_date"
+LOAN_FIELDS = ("loan_id", "book_id", "user_id", "borrow_date", "due_date", "return_date")
+
+
+class SQLiteLibraryStorage:
+    """
+    Books, users and loans in one SQLite database.
+    
+    Each change is a single transaction that writes only the rows involved,
+    so a borrow or return is all-or-nothing even if the program crashes.
+    A user's borrowed_books list is not stored; it is rebuilt from open loans.
+    
+    Several terminals may share one database. Writes are checked against
+    the rows as they are now (a book is only lent if it is still available,
+    new IDs must still be free) and raise ConflictError otherwise, and
+    changed() tells a terminal when others have written something, and
+    load_changes() returns just the rows they wrote.
+    """
+    
+    # Seconds to wait for another terminal's write to finish
+    BUSY_TIMEOUT = 10
+    
+    def __init__(self, db_file: str):
+        """Open (or create) the library database."""
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, timeout=self.BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._data_version = None
+        # Highest changes.seq already loaded
+        self._seq = 0
+    
+    @contextmanager
+    def snapshot(self) -> Iterator[None]:
+        """Make every read inside the block see the database as of one moment."""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            yield
+    
+    def changed(self) -> bool:
+        """Return True if another connection has committed since the last load or check."""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+    
+    def is_empty(self) -> bool:
+        """Return True if the database holds no books or users yet."""
+        for table in ("books", "users"):
+            if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                return False
+        return True
+    
+    @staticmethod
+    def _book(book_id: str, title: str, author: str, genre: str, availability: int) -> Dict:
+        return {"book_id": book_id, "title": title, "author": author,
+                "genre": genre, "availability": bool(availability)}
+    
+    @staticmethod
+    def _user(user_id: str, name: str) -> Dict:
+        return {"user_id": user_id, "name": name, "borrowed_books": []}
+    
+    @staticmethod
+    def _borrowed(book_id: str, user_id: str, borrow_date: str, due_date: str, returned: int,
+                  return_date: Optional[str]) -> Dict:
+        loan = {"user_id": user_id, "borrow_date": borrow_date,
+                "due_date": due_date, "returned": bool(returned)}
+        if return_date is not None:
+            loan["return_date"] = return_date
+        return loan
+    
+    def load(self) -> Tuple[Dict, Dict, Dict]:
+        """Load and return (books, users, borrowed_books)."""
+        self.changed()
+        self._seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        books = {}
+        for row in self.conn.execute(f"SELECT {BOOK_COLUMNS} FROM books ORDER BY rowid"):
+            books[row[0]] = self._book(*row)
+        
+        users = {}
+        for row in self.conn.execute("SELECT user_id, name FROM users ORDER BY rowid"):
+            users[row[0]] = self._user(*row)
+        
+        borrowed_books = {}
+        for row in self.conn.execute(f"SELECT {BORROWED_COLUMNS} FROM borrowed_books ORDER BY rowid"):
+            loan = borrowed_books[row[0]] = self._borrowed(*row)
+            if not loan["returned"] and loan["user_id"] in users:
+                users[loan["user_id"]]["borrowed_books"].append(row[0])
+        return books, users, borrowed_books
+    
+    def load_changes(self) -> Tuple[Dict, Dict, Dict, List[Dict]]:
+        """
+        Return the rows written at any terminal since the last load or call.
+        
+        Only rows listed in the changes table after the last seen seq are
+        read, each by its key, so the cost follows the number of changes.
+        
+        Returns:
+            (books, users, borrowed_books, loans): changed books, users and
+            borrowing records by ID, with None for deleted ones, and the
+            changed loans, oldest first
+        """
+        with self.snapshot():
+            changed = {table: set() for table in TRACKED_TABLES}
+            for seq, table, row_id in self.conn.execute(
+                    "SELECT seq, table_name, row_id FROM changes WHERE seq > ? ORDER BY seq", (self._seq,)):
+                changed[table].add(row_id)
+                self._seq = seq
+            
+            books = {}
+            for book_id in changed["books"]:
+                row = self._row("books", BOOK_COLUMNS, book_id)
+                books[book_id] = self._book(*row) if row else None
+            users = {}
+            for user_id in changed["users"]:
+                row = self._row("users", "user_id, name", user_id)
+                users[user_id] = self._user(*row) if row else None
+            borrowed_books = {}
+            for book_id in changed["borrowed_books"]:
+                row = self._row("borrowed_books", BORROWED_COLUMNS, book_id)
+                borrowed_books[book_id] = self._borrowed(*row) if row else None
+            loans = []
+            for loan_id in sorted(int(loan_id) for loan_id in changed["loans"]):
+                row = self._row("loans", ", ".join(LOAN_FIELDS), loan_id)
+                if row:
+                    loans.append(dict(zip(LOAN_FIELDS, row)))
+        return books, users, borrowed_books, loans
+    
+    def _row(self, table: str, columns: str, key) -> Optional[tuple]:
+        """Fetch one row of a tracked table by its key, or None if it is gone."""
+        return self.conn.execute(f"SELECT {columns} FROM {table} WHERE {TRACKED_TABLES[table]} = ?",
+                                 (key,)).fetchone()
+    
+    def load_loans(self) -> Iterator[Dict]:
+        """Yield every recorded loan, oldest first."""
+        for row in self.conn.execute(f"SELECT {', '.join(LOAN_FIELDS)} FROM loans ORDER BY loan_id"):
+            yield dict(zip(LOAN_FIELDS, row))
+    
+    def save_loans(self, loans: Iterable[Dict]) -> None:
+        """Record a batch of loans in one transaction."""
+        with self.conn:
+            self._upsert_loans(loans)
+    
+    def update_loans(self, loans: Iterable[Dict]) -> None:
+        """Persist new or returned loans, leaving the rest of the history alone."""
+        self.save_loans(loans)
+    
+    def _upsert_loans(self, loans: Iterable[Dict]) -> None:
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO loans ({', '.join(LOAN_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            (tuple(loan[field] for field in LOAN_FIELDS) for loan in loans))
+    
+    def import_data(self, books: Dict, users: Dict, borrowed_books: Dict) -> None:
+        """Copy data loaded from the JSON files into the database."""
+        with self.conn:
+            self._upsert_books(books.values())
+            self._upsert_users(users.values())
+            for book_id, loan in borrowed_books.items():
+                self._upsert_loan(book_id, loan)
+    
+    def _upsert_books(self, books: Iterable[Dict]) -> None:
+        self.conn.executemany(
+            "INSERT INTO books (book_id, title, author, genre, availability) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (book_id) DO UPDATE SET title = excluded.title, author = excluded.author, "
+            "genre = excluded.genre, availability = excluded.availability",
+            ((book["book_id"], book["title"], book["author"], book["genre"], int(book["availability"]))
+             for book in books))
+    
+    def _upsert_users(self, users: Iterable[Dict]) -> None:
+        self.conn.executemany(
+            "INSERT INTO users (user_id, name) VALUES (?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET name = excluded.name",
+            ((user["user_id"], user["name"]) for user in users))
+    
+    def _upsert_loan(self, book_id: str, loan: Dict) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO borrowed_books "
+            "(book_id, user_id, borrow_date, due_date, returned, return_date) VALUES (?, ?, ?, ?, ?, ?)",
+            (book_id, loan["user_id"], loan["borrow_date"], loan["due_date"],
+             int(loan["returned"]), loan.get("return_date")))
+    
+    def save_books(self, books: Iterable[Dict]) -> None:
+        """Persist added or changed books."""
+        with self.conn:
+            self._upsert_books(books)
+    
+    def insert_books(self, books: Iterable[Dict]) -> None:
+        """Persist new books, failing with ConflictError if an ID is already taken."""
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO books (book_id, title, author, genre, availability) VALUES (?, ?, ?, ?, ?)",
+                    ((book["book_id"], book["title"], book["author"], book["genre"],
+                      int(book["availability"])) for book in books))
+        except sqlite3.IntegrityError as e:
+            raise ConflictError(f"Book IDs were taken at another terminal: {e}") from e
+    
+    def delete_book(self, book_id: str) -> None:
+        """Persist a book deletion, unless the book has been borrowed meanwhile."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM books WHERE book_id = ? AND availability = 1", (book_id,))
+            if cursor.rowcount == 0:
+                raise ConflictError(f"Book {book_id} was borrowed or deleted at another terminal!")
+    
+    def save_users(self, users: Iterable[Dict]) -> None:
+        """Persist added or changed users."""
+        with self.conn:
+            self._upsert_users(users)
+    
+    def insert_users(self, users: Iterable[Dict]) -> None:
+        """Persist new users, failing with ConflictError if an ID is already taken."""
+        try:
+            with self.conn:
+                self.conn.executemany("INSERT INTO users (user_id, name) VALUES (?, ?)",
+                                      ((user["user_id"], user["name"]) for user in users))
+        except sqlite3.IntegrityError as e:
+            raise ConflictError(f"User IDs were taken at another terminal: {e}") from e
+    
+    def delete_user(self, user_id: str) -> None:
+        """Persist a user deletion, unless the user has borrowed a book meanwhile."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM users WHERE user_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM borrowed_books WHERE user_id = ? AND returned = 0)", (user_id, user_id))
+            if cursor.rowcount == 0:
+                raise ConflictError(f"User {user_id} borrowed a book or was deleted at another terminal!")
+    
+    def record_loan(self, book: Dict, loan: Optional[Dict], ledger_loan: Optional[Dict] = None) -> None:
+        """Persist a borrow or return (availability, loan and ledger row) as one transaction."""
+        self.record_loans([(book, loan, ledger_loan)])
+    
+    def record_loans(self, changes: Iterable[LoanChange]) -> None:
+        """
+        Persist a batch of borrows and returns as one transaction.
+        
+        A book's availability only flips if the row still has the old value,
+        so when two terminals lend the same book at once the later one gets
+        ConflictError and its whole batch is rolled back. New ledger loans
+        are numbered by SQLite, and their loan_id updated to match.
+        """
+        with self.conn:
+            for book, loan, ledger_loan in changes:
+                availability = int(book["availability"])
+                cursor = self.conn.execute(
+                    "UPDATE books SET availability = ? WHERE book_id = ? AND availability = ?",
+                    (availability, book["book_id"], 1 - availability))
+                if cursor.rowcount == 0:
+                    action = "returned" if availability else "borrowed"
+                    raise ConflictError(f"Book {book['book_id']} was already {action} at another terminal!")
+                if loan is not None:
+                    self._upsert_loan(book["book_id"], loan)
+                if ledger_loan is None:
+                    continue
+                if ledger_loan["return_date"] is None:
+                    cursor = self.conn.execute(
+                        "INSERT INTO loans (book_id, user_id, borrow_date, due_date) VALUES (?, ?, ?, ?)",
+                        (ledger_loan["book_id"], ledger_loan["user_id"], ledger_loan["borrow_date"],
+                         ledger_loan["due_date"]))
+                    ledger_loan["loan_id"] = cursor.lastrowid
+                else:
+                    self.conn.execute("UPDATE loans SET return_date = ? WHERE loan_id = ?",
+                                      (ledger_loan["return_date"], ledger_loan["loan_id"]))
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
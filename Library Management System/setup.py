@@ -119,6 +119,10 @@ def create_sample_data():
             json.dump(borrowed_books_data, f, indent=2, ensure_ascii=False)
         print("✅ Created borrowed_books.json (empty)")
         
+        # Start a fresh loan history to match the empty borrowed books
+        open("loans.jsonl", "w", encoding="utf-8").close()
+        print("✅ Created loans.jsonl (empty)")
+        
         print("\n🎉 Setup completed successfully!")
         print("\n📚 Sample data includes:")
         print("   - 8 books across different genres")
@@ -142,7 +146,7 @@ def main():
     
     # Check if data files already exist
     existing_files = []
-    for file in ["books.json", "users.json", "borrowed_books.json"]:
+    for file in ["books.json", "users.json", "borrowed_books.json", "loans.jsonl"]:
         if os.path.exists(file):
             existing_files.append(file)
     
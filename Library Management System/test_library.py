@@ -6,6 +6,7 @@ This script demonstrates the functionality of the library management system.
 
 import os
 import json
+import tempfile
 from library_management import LibraryManagementSystem
 
 
@@ -14,16 +15,24 @@ def test_library_system():
     print("🧪 Testing Library Management System")
     print("=" * 50)
     
-    # Initialize the library system
-    library = LibraryManagementSystem()
-    
-    # Clean up any existing test data
-    test_files = ["books.json", "users.json", "borrowed_books.json"]
-    for file in test_files:
-        if os.path.exists(file):
-            os.remove(file)
+    # Work in a scratch directory so the library's own data files are untouched
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="library_test_") as workdir:
+        os.chdir(workdir)
+        try:
+            run_sample_session()
+        finally:
+            os.chdir(original_dir)
     
-    # Reinitialize with clean data
+    print("\n✅ All tests completed successfully!")
+    print("\n🎉 The Library Management System is working correctly!")
+    print("\nTo run the interactive system, execute:")
+    print("python library_management.py")
+
+
+def run_sample_session():
+    """Add sample books and users, borrow a book and print the reports."""
+    # Initialize the library system with empty data files
     library = LibraryManagementSystem()
     
     print("\n📚 Adding sample books...")
@@ -89,25 +98,8 @@ def test_library_system():
     print("\n🔄 Testing borrowing system...")
     # Test borrowing books
     print("Borrowing 'Python Programming' to Alice Johnson...")
-    library.books["1"]["availability"] = False
-    library.users["1"]["borrowed_books"].append("1")
-    
-    # Add borrowing record
-    from datetime import datetime, timedelta
-    borrow_date = datetime.now()
-    due_date = borrow_date + timedelta(days=14)
-    
-    library.borrowed_books["1"] = {
-        "user_id": "1",
-        "borrow_date": borrow_date.isoformat(),
-        "due_date": due_date.isoformat(),
-        "returned": False
-    }
-    
-    # Save all data
-    library.save_data("books.json", library.books)
-    library.save_data("users.json", library.users)
-    library.save_data("borrowed_books.json", library.borrowed_books)
+    # Saves the book, the borrowing record and the loan history together
+    library.borrow_books([("1", "1")])
     
     print("✅ Book borrowed successfully!")
     
@@ -118,10 +110,9 @@ def test_library_system():
     print("\n📋 Testing borrowed books view...")
     library.view_borrowed_books()
     
-    print("\n✅ All tests completed successfully!")
-    print("\n🎉 The Library Management System is working correctly!")
-    print("\nTo run the interactive system, execute:")
-    print("python library_management.py")
+    # Reports and the borrowed list come from the loan history
+    assert library.loans.open_count() == 1
+    assert library.loans.open_loan("1")["user_id"] == "1"
 
 
 if __name__ == "__main__":
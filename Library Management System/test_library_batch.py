@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch API and the bulk loader.
+A batch is saved in one storage write, or not at all.
+"""
+
+import csv
+import json
+
+import pytest
+
+from library_management import LibraryManagementSystem
+
+
+def write_books_csv(path, count: int):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["title", "author", "genre"])
+        writer.writeheader()
+        writer.writerows({"title": f"Volume {i}", "author": f"Author {i % 7}", "genre": "History"}
+                         for i in range(1, count + 1))
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_import_file_loads_in_one_write(tmp_path, monkeypatch, storage):
+    """CSV books and JSONL users arrive numbered, indexed and saved."""
+    monkeypatch.chdir(tmp_path)
+    write_books_csv(tmp_path / "books.csv", 250)
+    with open(tmp_path / "users.jsonl", "w", encoding="utf-8") as file:
+        file.writelines(json.dumps({"name": f"Reader {i}"}) + "\n" for i in range(1, 41))
+    
+    library = LibraryManagementSystem(storage)
+    writes = []
+    insert_books = library.storage.insert_books
+    monkeypatch.setattr(library.storage, "insert_books",
+                        lambda books: writes.append(1) or insert_books(books))
+    try:
+        assert library.import_file("books.csv") == [str(i) for i in range(1, 251)]
+        assert library.import_file("users.jsonl", "users") == [str(i) for i in range(1, 41)]
+        assert writes == [1]
+        assert [book["book_id"] for book in library.find_books("author:author volume 17", limit=1)] == ["17"]
+    finally:
+        library.storage.close()
+    
+    reloaded = LibraryManagementSystem(storage)
+    try:
+        assert reloaded.books == library.books
+        assert reloaded.users == library.users
+        assert reloaded.add_books([{"title": "Next", "author": "A", "genre": "G"}]) == ["251"]
+    finally:
+        reloaded.storage.close()
+
+
+def test_invalid_rows_leave_nothing_behind(tmp_path, monkeypatch):
+    """One bad book, user or borrow request rejects its whole batch."""
+    monkeypatch.chdir(tmp_path)
+    library = LibraryManagementSystem()
+    library.add_books([{"title": "Python Programming", "author": "John Doe", "genre": "Programming"}])
+    library.register_users([{"name": "Alice"}])
+    
+    with pytest.raises(ValueError, match="Book 2: Author"):
+        library.add_books([{"title": "Fine", "author": "A", "genre": "G"}, {"title": "No Author", "genre": "G"}])
+    with pytest.raises(ValueError, match="User 2: Name"):
+        library.register_users([{"name": "Bob"}, {"name": "  "}])
+    with pytest.raises(ValueError, match="Book 9 not found"):
+        library.borrow_books([("1", "1"), ("1", "9")])
+    
+    assert list(library.books) == ["1"] and list(library.users) == ["1"]
+    assert library.books["1"]["availability"] is True
+    assert library.users["1"]["borrowed_books"] == []
+    assert library.loans.open_count() == 0
+    
+    reloaded = LibraryManagementSystem()
+    assert reloaded.books == library.books
+    assert reloaded.users == library.users
+    assert reloaded.borrowed_books == {}
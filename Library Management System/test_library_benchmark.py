@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the library load-test harness.
+The generated library must be consistent and the results complete.
+"""
+
+import importlib.util
+import json
+import os
+from datetime import datetime
+
+# Loaded by path: the Student Record Manager has a benchmark module too
+spec = importlib.util.spec_from_file_location(
+    "library_benchmark", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark.py"))
+benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark)
+
+
+def test_generated_loans_match_the_catalog():
+    """Open loans mark exactly their books and users as borrowed."""
+    catalog, members = benchmark.generate_catalog(200, 30, seed=1)
+    borrowed_books = {}
+    loans = list(benchmark.iter_loans(catalog, members, borrowed_books, 101, 2, datetime(2024, 6, 1)))
+    
+    open_loans = [loan for loan in loans if loan["return_date"] is None]
+    assert len(open_loans) + 2 * (len(loans) - len(open_loans)) <= 101
+    assert [loan["loan_id"] for loan in loans] == list(range(1, len(loans) + 1))
+    assert sorted(borrowed_books) == sorted(loan["book_id"] for loan in open_loans)
+    assert {book_id for book_id, book in catalog.items() if not book["availability"]} == set(borrowed_books)
+    for loan in open_loans:
+        assert loan["book_id"] in members[loan["user_id"]]["borrowed_books"]
+
+
+def test_main_reports_every_backend(tmp_path, monkeypatch, capsys):
+    """A small run prints and saves one result per backend, and cleans up after itself."""
+    monkeypatch.chdir(tmp_path)
+    assert benchmark.main(["--books", "300", "--users", "20", "--loan-events", "200",
+                           "--ops", "10", "--reports", "2", "--output", "results.json"]) == 0
+    
+    printed = json.loads(capsys.readouterr().out)
+    with open("results.json", encoding="utf-8") as file:
+        assert json.load(file) == printed
+    assert os.listdir(tmp_path) == ["results.json"]
+    
+    assert [result["backend"] for result in printed] == benchmark.BACKENDS
+    for result in printed:
+        assert result["file_bytes"] > 0
+        assert [result[operation]["ops"] for operation in ("borrow", "return", "search", "report")] == \
+            [10, 10, 10, 2]
+        for operation in ("borrow", "return", "search", "report"):
+            assert result[operation]["p99_ms"] >= result[operation]["p50_ms"] > 0
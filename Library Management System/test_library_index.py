@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the catalog index.
+Every indexed search must rank books as a scan of the catalog would.
+"""
+
+import random
+
+from library_index import FIELD_WEIGHTS, SEARCH_FIELDS, CatalogIndex, parse_query, tokenize
+
+
+WORDS = ["python", "program", "programming", "data", "science", "history", "art",
+         "doe", "smith", "jones", "fiction", "poetry", "pro", "dat"]
+
+QUERIES = ["python", "pro", "program", "author:doe", "genre:fi", "data science",
+           "title:prog smith", "p d", "art history poetry", "nothing", "title:", ""]
+
+
+def make_books(count: int, seed: int = 3):
+    """Books whose fields share words and word prefixes."""
+    rng = random.Random(seed)
+    return [{
+        "book_id": str(i),
+        "title": " ".join(rng.sample(WORDS, 3)),
+        "author": " ".join(rng.sample(WORDS, 2)),
+        "genre": rng.choice(WORDS),
+    } for i in range(1, count + 1)]
+
+
+def scan(books, query: str):
+    """Score each book term by term, as the index is meant to."""
+    terms = parse_query(query)
+    if not terms:
+        return []
+    ranked = []
+    for book in books:
+        total = 0
+        for field, token in terms:
+            score = 0
+            for search_field in ((field,) if field else SEARCH_FIELDS):
+                words = tokenize(book[search_field])
+                if token in words:
+                    score += 2 * FIELD_WEIGHTS[search_field]
+                elif any(word.startswith(token) for word in words):
+                    score += FIELD_WEIGHTS[search_field]
+            if not score:
+                break
+            total += score
+        else:
+            ranked.append((-total, len(book["book_id"]), book["book_id"]))
+    return [book_id for _, _, book_id in sorted(ranked)]
+
+
+def test_search_matches_scan():
+    """Ranking and limits, before and after books are removed and added."""
+    books = make_books(400)
+    index = CatalogIndex(books)
+    for query in QUERIES:
+        assert index.search(query) == scan(books, query), query
+        assert index.search(query, limit=5) == scan(books, query)[:5], query
+    
+    for book in books[::3]:
+        index.remove(book)
+    kept = [book for i, book in enumerate(books) if i % 3]
+    extra = {"book_id": "1000", "title": "Pythonic Programs", "author": "New Author", "genre": "Data"}
+    index.add(extra)
+    for query in QUERIES + ["pythonic", "new"]:
+        assert index.search(query) == scan(kept + [extra], query), query
+
+
+def test_vocabulary_stays_sorted():
+    """Prefix lookups see exactly the words still indexed."""
+    books = make_books(50)
+    index = CatalogIndex(books)
+    for book in books[:40]:
+        index.remove(book)
+    index.add({"book_id": "99", "title": "Zebra Aardvark", "author": "Mid", "genre": "Data"})
+    for field in SEARCH_FIELDS:
+        assert index._vocabulary[field] == sorted(index._postings[field])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the loan ledger.
+Each indexed answer is checked against a scan of the full loan history.
+"""
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from library_loans import LoanLedger
+from library_management import LibraryManagementSystem, main
+
+
+START = datetime(2024, 1, 1)
+
+
+def make_history(count: int, seed: int = 11):
+    """Generate a loan history in which every book is out at most once at a time."""
+    rng = random.Random(seed)
+    loans = []
+    open_books = {}
+    for loan_id in range(1, count + 1):
+        book_id = str(rng.randint(1, 200))
+        borrow_date = START + timedelta(days=loan_id // 10)
+        if book_id in open_books:
+            open_books.pop(book_id)["return_date"] = borrow_date.isoformat()
+        loan = {
+            "loan_id": loan_id,
+            "book_id": book_id,
+            "user_id": str(rng.randint(1, 50)),
+            "borrow_date": borrow_date.isoformat(),
+            "due_date": (borrow_date + timedelta(days=14)).isoformat(),
+            "return_date": None
+        }
+        loans.append(loan)
+        open_books[book_id] = loan
+    return loans
+
+
+def scan_overdue(loans, as_of: datetime):
+    """Open loans due before as_of, most overdue first."""
+    due = sorted((datetime.fromisoformat(loan["due_date"]), loan["loan_id"])
+                 for loan in loans if loan["return_date"] is None)
+    return [loan_id for due_date, loan_id in due if due_date < as_of]
+
+
+def test_overdue_and_late_fees_match_scan():
+    """Late fees are summed over the overdue loans only."""
+    loans = make_history(3000)
+    ledger = LoanLedger(loans)
+    for days in (0, 100, 300, 320, 1000):
+        as_of = START + timedelta(days=days, hours=5)
+        overdue = scan_overdue(loans, as_of)
+        assert [loan["loan_id"] for _, loan in ledger.overdue(as_of)] == overdue
+        
+        overdue_ids = set(overdue)
+        days_late = sum((as_of - datetime.fromisoformat(loan["due_date"])).days
+                        for loan in loans if loan["loan_id"] in overdue_ids)
+        assert ledger.late_fees(as_of, 10) == (len(overdue), days_late * 10)
+
+
+def test_indexes_follow_new_loans_and_returns():
+    """Counters and the due-date index stay in step with add() and close()."""
+    loans = make_history(500)
+    ledger = LoanLedger()
+    for loan in loans:
+        ledger.add(dict(loan, return_date=None))
+        if loan["return_date"] is not None:
+            ledger.close(loan["book_id"], loan["return_date"])
+    
+    open_loans = sorted(loan["loan_id"] for loan in loans if loan["return_date"] is None)
+    assert sorted(loan["loan_id"] for loan in ledger.open_loans()) == open_loans
+    assert ledger.open_count() == len(open_loans)
+    as_of = START + timedelta(days=60)
+    assert [loan["loan_id"] for _, loan in ledger.overdue(as_of)] == scan_overdue(loans, as_of)
+    
+    counts = Counter(loan["book_id"] for loan in loans)
+    expected = sorted(counts.items(), key=lambda item: (-item[1], len(item[0]), item[0]))[:5]
+    assert ledger.top_books(5) == expected
+    assert [loan["loan_id"] for loan in ledger.loans_for_user("7")] == \
+        [loan["loan_id"] for loan in loans if loan["user_id"] == "7"]
+
+
+def test_merge_applies_loans_recorded_elsewhere():
+    """A loan seen again after its return is closed, not added twice."""
+    loans = make_history(50)
+    ledger = LoanLedger(dict(loan, return_date=None) for loan in loans[:1])
+    for loan in loans:
+        ledger.merge(loan)
+    assert len(ledger) == len(loans)
+    assert ledger.open_count() == sum(1 for loan in loans if loan["return_date"] is None)
+
+
+def test_every_borrow_of_a_book_is_kept(tmp_path, monkeypatch):
+    """Borrowing a book again adds a loan instead of replacing the last one."""
+    monkeypatch.chdir(tmp_path)
+    library = LibraryManagementSystem()
+    library.add_books([{"title": "Python Programming", "author": "John Doe", "genre": "Programming"}])
+    library.register_users([{"name": "Alice"}, {"name": "Bob"}])
+    for day, user_id in enumerate(["1", "2", "1"]):
+        library.borrow_books([(user_id, "1")], START + timedelta(days=3 * day))
+        library.return_books([(user_id, "1")], START + timedelta(days=3 * day + 1))
+    
+    reloaded = LibraryManagementSystem()
+    assert reloaded.loans.top_books() == [("1", 3)]
+    assert [loan["borrow_date"][:10] for loan in reloaded.loans.loans_for_user("1")] == \
+        ["2024-01-01", "2024-01-07"]
+    assert reloaded.loans.open_count() == 0
+
+
+def test_fees_command_reports_as_of_a_date(tmp_path, monkeypatch, capsys):
+    """'fees --as-of' prices the overdue loans at that date without prompting."""
+    monkeypatch.chdir(tmp_path)
+    library = LibraryManagementSystem()
+    library.add_books([{"title": "Python Programming", "author": "John Doe", "genre": "Programming"},
+                       {"title": "Data Structures", "author": "Jane Smith", "genre": "Science"}])
+    library.register_users([{"name": "Alice"}])
+    library.borrow_books([("1", "1")], START)
+    library.borrow_books([("1", "2")], START + timedelta(days=10))
+    
+    monkeypatch.setattr("sys.argv", ["library_management.py", "fees", "--as-of", "2024-01-20"])
+    main()
+    output = capsys.readouterr().out
+    assert "Open Loans: 2" in output
+    assert "Overdue Loans: 1" in output
+    assert "Total Late Fees: ₹50" in output
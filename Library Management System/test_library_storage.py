@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the library storage backends.
+A change must reach disk in full, or not at all. Two connections to one
+database stand in for two terminals.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from library_management import LibraryManagementSystem
+from library_storage import ConflictError, SQLiteLibraryStorage
+
+
+def open_terminals(tmp_path, monkeypatch):
+    """Two library systems on the same library.db, with one book and two users."""
+    monkeypatch.chdir(tmp_path)
+    first = LibraryManagementSystem("sqlite")
+    first.add_books([{"title": "Python Programming", "author": "John Doe", "genre": "Programming"}])
+    first.register_users([{"name": "Alice"}, {"name": "Bob"}])
+    return first, LibraryManagementSystem("sqlite")
+
+
+def test_sqlite_start_imports_json_and_keeps_borrows(tmp_path, monkeypatch):
+    """Existing JSON data moves into library.db, and later loans survive a restart."""
+    monkeypatch.chdir(tmp_path)
+    library = LibraryManagementSystem("json")
+    library.add_books([{"title": "Python Programming", "author": "John Doe", "genre": "Programming"},
+                       {"title": "Data Structures", "author": "Jane Smith", "genre": "Science"}])
+    library.register_users([{"name": "Alice"}])
+    library.borrow_books([("1", "1")], datetime(2024, 1, 1))
+    library.storage.close()
+    
+    database = LibraryManagementSystem("sqlite")
+    try:
+        assert database.books == library.books
+        assert database.users == library.users
+        assert database.borrowed_books == library.borrowed_books
+        database.return_books([("1", "1")], datetime(2024, 1, 20))
+        database.borrow_books([("1", "2")], datetime(2024, 1, 21))
+    finally:
+        database.storage.close()
+    
+    reopened = LibraryManagementSystem("sqlite")
+    try:
+        assert reopened.books == database.books
+        assert reopened.users["1"]["borrowed_books"] == ["2"]
+        assert reopened.borrowed_books == database.borrowed_books
+        assert [loan["book_id"] for _, loan in reopened.loans.open_by_due()] == ["2"]
+    finally:
+        reopened.storage.close()
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_failed_delete_keeps_the_book(tmp_path, monkeypatch, storage):
+    """A deletion that cannot be saved leaves the book in memory and on disk."""
+    monkeypatch.chdir(tmp_path)
+    library = LibraryManagementSystem(storage)
+    try:
+        library.add_books([{"title": "Python Programming", "author": "John Doe", "genre": "Programming"}])
+        
+        def fail(book_id):
+            raise OSError("disk full")
+        monkeypatch.setattr(library.storage, "delete_book", fail)
+        answers = iter(["1", "yes"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+        library.delete_book()
+        
+        assert "1" in library.books
+        assert [book["book_id"] for book in library.find_books("python")] == ["1"]
+        if storage == "json":
+            with open("books.json", encoding="utf-8") as file:
+                assert list(json.load(file)) == ["1"]
+    finally:
+        library.storage.close()
+
+
+def test_record_loans_conflict_rolls_back_the_whole_batch(tmp_path):
+    """A book lent at another terminal fails the batch, and nothing is written."""
+    storage = SQLiteLibraryStorage(str(tmp_path / "library.db"))
+    other = SQLiteLibraryStorage(str(tmp_path / "library.db"))
+    try:
+        storage.insert_books([{"book_id": str(i), "title": "T", "author": "A", "genre": "G",
+                               "availability": True} for i in (1, 2)])
+        storage.insert_users([{"user_id": "1", "name": "Alice"}])
+        
+        def borrow(book_id: str):
+            record = {"user_id": "1", "borrow_date": "2024-01-01T00:00:00",
+                      "due_date": "2024-01-15T00:00:00", "returned": False}
+            loan = {"loan_id": None, "book_id": book_id, "user_id": "1", "return_date": None,
+                    "borrow_date": record["borrow_date"], "due_date": record["due_date"]}
+            book = {"book_id": book_id, "title": "T", "author": "A", "genre": "G", "availability": False}
+            return book, record, loan
+        
+        other.record_loans([borrow("2")])
+        with pytest.raises(ConflictError):
+            storage.record_loans([borrow("1"), borrow("2")])
+        
+        books, _, borrowed_books = storage.load()
+        assert books["1"]["availability"] is True
+        assert list(borrowed_books) == ["2"]
+        assert len(list(storage.load_loans())) == 1
+    finally:
+        storage.close()
+        other.close()
+
+
+def test_second_borrow_of_the_same_book_is_refused(tmp_path, monkeypatch):
+    """The terminal that lends second gets a ConflictError and keeps no trace of it."""
+    first, second = open_terminals(tmp_path, monkeypatch)
+    try:
+        first.borrow_books([("1", "1")])
+        # The borrow lands after the second terminal's last refresh
+        second.refresh = lambda: False
+        with pytest.raises(ConflictError):
+            second.borrow_books([("2", "1")])
+        assert second.books["1"]["availability"] is True
+        assert second.users["2"]["borrowed_books"] == []
+        assert "1" not in second.borrowed_books
+        
+        del second.refresh
+        with pytest.raises(ValueError):
+            second.borrow_books([("2", "1")])
+    finally:
+        first.storage.close()
+        second.storage.close()
+
+
+def test_refresh_matches_a_full_reload(tmp_path, monkeypatch):
+    """Changes picked up one row at a time leave the same state as loading from scratch."""
+    first, second = open_terminals(tmp_path, monkeypatch)
+    try:
+        first.add_books([{"title": "Data Structures", "author": "Jane Smith", "genre": "Science"}])
+        first.borrow_books([("1", "1"), ("2", "2")], datetime(2024, 1, 1))
+        first.return_books([("1", "1")], datetime(2024, 2, 1))
+        first.storage.delete_user("1")
+        del first.users["1"]
+        
+        assert second.refresh()
+        fresh = LibraryManagementSystem("sqlite")
+        try:
+            assert second.books == fresh.books
+            assert second.users == fresh.users
+            assert second.borrowed_books == fresh.borrowed_books
+            assert [loan for _, loan in second.loans.open_by_due()] == \
+                [loan for _, loan in fresh.loans.open_by_due()]
+            assert second.loans.top_books() == fresh.loans.top_books()
+            assert [book["book_id"] for book in second.find_books("data")] == ["2"]
+        finally:
+            fresh.storage.close()
+    finally:
+        first.storage.close()
+        second.storage.close()
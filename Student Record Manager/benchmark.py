@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Student Record Manager
+Times load, add, search, sort, import and export across storage formats
+and measures the memory held per record
+
+Usage:
+    python benchmark.py                              # 1k/100k/1M rows, all formats
+    python benchmark.py --sizes 1000 100000 --formats json sqlite --output results.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from demo_data import iter_student_records, write_demo_data
+from student_manager import StudentRecordManager
+from student_store import StudentRecord
+
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_FORMATS = ['json', 'csv', 'sqlite']
+EXTENSIONS = {'json': 'json', 'csv': 'csv', 'sqlite': 'db'}
+SEARCH_TERMS = ['smith', 'S00012', 'jen', 'rodriguez', 'xyz']
+# Per-record memory settles well below this, so larger sizes are sampled
+MEMORY_SAMPLE = 100000
+
+
+def timed(action: Callable[[], object]) -> float:
+    """Run action with its console output silenced and return elapsed seconds"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        action()
+        return time.perf_counter() - start
+
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    """Return the bytes still allocated by build() while its result is alive"""
+    tracemalloc.start()
+    try:
+        kept = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return current
+
+
+def record_memory(size: int, seed: int) -> Dict:
+    """Measure bytes per student held as parsed dicts and as StudentRecords"""
+    sample = min(size, MEMORY_SAMPLE)
+    text = json.dumps(list(iter_student_records(sample, seed)))
+    # Both figures include the field strings, as a loaded store holds them
+    dict_bytes = traced_bytes(lambda: json.loads(text))
+    record_bytes = traced_bytes(lambda: [StudentRecord.from_dict(s) for s in json.loads(text)])
+    return {'dict_bytes': round(dict_bytes / sample), 'record_bytes': round(record_bytes / sample)}
+
+
+def benchmark_format(workdir: str, file_format: str, size: int, adds: int,
+                     searches: int, seed: int) -> Dict:
+    """Time every operation for one storage format and dataset size"""
+    extension = EXTENSIONS[file_format]
+    data_file = os.path.join(workdir, f"students_{size}.{extension}")
+    import_file = os.path.join(workdir, f"import_{size}.jsonl")
+    results = {'format': file_format, 'size': size}
+    
+    # Fixture files are generated outside the timed sections
+    write_demo_data(data_file, size, file_format, seed)
+    import_count = max(1, size // 10)
+    write_demo_data(import_file, import_count, 'jsonl', seed + 1, start=size + adds + 1)
+    
+    managers = []
+    results['load_s'] = timed(lambda: managers.append(StudentRecordManager(data_file, file_format)))
+    manager = managers[0]
+    
+    new_students = list(iter_student_records(adds, seed + 2, start=size + 1))
+    results['add_ms_per_op'] = timed(lambda: [
+        manager.add_student(s['student_id'], s['name'], s['age'], s['grade'], s['email'])
+        for s in new_students
+    ]) * 1000 / max(adds, 1)
+    
+    queries = [SEARCH_TERMS[i % len(SEARCH_TERMS)] for i in range(searches)]
+    results['search_ms_per_op'] = timed(lambda: [
+        manager.search_student(term) for term in queries
+    ]) * 1000 / max(searches, 1)
+    
+    # First and a middle page of a sorted view, as the CLI would request them
+    results['sort_s'] = timed(lambda: [
+        manager.get_page(1, sort_by=sort_by) + manager.get_page(size // 40 or 1, sort_by=sort_by)
+        for sort_by in ('name', 'age', 'grade')
+    ])
+    
+    results['import_s'] = timed(lambda: manager.import_from_file(import_file, progress=lambda *_: None))
+    results['import_rows'] = import_count
+    
+    for target in ('json', 'csv', 'jsonl'):
+        export_file = os.path.join(workdir, f"export_{size}_{file_format}.{target}")
+        results[f'export_{target}_s'] = timed(lambda: manager.export_to_format(target, export_file))
+    
+    manager.close()
+    results['file_bytes'] = os.path.getsize(data_file)
+    return results
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print benchmark results as a table"""
+    columns = ['format', 'size', 'load_s', 'add_ms_per_op', 'search_ms_per_op', 'sort_s',
+               'import_s', 'export_json_s', 'export_csv_s', 'export_jsonl_s', 'file_bytes',
+               'record_bytes', 'dict_bytes']
+    print(" ".join(f"{column:>16}" for column in columns))
+    for row in results:
+        cells = []
+        for column in columns:
+            value = row[column]
+            cells.append(f"{value:>16.4f}" if isinstance(value, float) else f"{value:>16}")
+        print(" ".join(cells))
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark Student Record Manager storage formats")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Dataset sizes to test (default: 1000 100000 1000000)")
+    parser.add_argument("--formats", nargs="+", choices=DEFAULT_FORMATS, default=DEFAULT_FORMATS,
+                        help="Storage formats to test")
+    parser.add_argument("--adds", type=int, default=10, help="Students added per run (default: 10)")
+    parser.add_argument("--searches", type=int, default=50, help="Searches per run (default: 50)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated data")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    results = []
+    with tempfile.TemporaryDirectory(prefix="student_bench_") as workdir:
+        for size in args.sizes:
+            memory = record_memory(size, args.seed)
+            for file_format in args.formats:
+                print(f"⏱  {file_format} x {size} rows...", file=sys.stderr)
+                results.append(benchmark_format(workdir, file_format, size,
+                                                args.adds, args.searches, args.seed))
+                results[-1].update(memory)
+    
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"✓ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,7 @@ class Config:
     # File settings
     DEFAULT_JSON_FILE = "students.json"
     DEFAULT_CSV_FILE = "students.csv"
+    DEFAULT_SQLITE_FILE = "students.db"
     DEMO_JSON_FILE = "demo_students.json"
     DEMO_CSV_FILE = "demo_students.csv"
     
@@ -24,13 +25,27 @@ class Config:
     MIN_AGE = 1
     MAX_AGE = 150
     REQUIRED_FIELDS = ['student_id', 'name', 'age', 'grade', 'email']
+    EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+    # Rejected import rows listed in the console; the rest are only counted
+    IMPORT_ERROR_PREVIEW = 10
     
     # Display settings
     TABLE_WIDTH = 80
     MENU_WIDTH = 60
+    PAGE_SIZE = 20
+    
+    # Fuzzy name search: suggestions shown and the lowest trigram similarity kept
+    FUZZY_LIMIT = 5
+    FUZZY_MIN_SCORE = 0.3
     
     # File formats
-    SUPPORTED_FORMATS = ['json', 'csv']
+    SUPPORTED_FORMATS = ['json', 'csv', 'sqlite']
+    
+    # Journal settings: append mutations to '<data file>.journal' and rewrite
+    # the data file only once JOURNAL_COMPACT_THRESHOLD entries have built up
+    JOURNAL_MODE = False
+    JOURNAL_COMPACT_THRESHOLD = 1000
+    JOURNAL_FSYNC = True
     
     # Error messages
     ERROR_MESSAGES = {
@@ -76,8 +91,13 @@ class Config:
     # Export/Import formats
     FORMAT_OPTIONS = {
         '1': 'json',
-        '2': 'csv'
+        '2': 'csv',
+        '3': 'sqlite'
     }
+    EXPORT_FORMAT_OPTIONS = {**FORMAT_OPTIONS, '4': 'jsonl'}
+    
+    # Rows per chunk when streaming imports into the store
+    IMPORT_CHUNK_SIZE = 10000
     
     @classmethod
     def get_data_file_path(cls, format_type: str = 'json') -> str:
@@ -86,6 +106,8 @@ class Config:
             return cls.DEFAULT_JSON_FILE
         elif format_type.lower() == 'csv':
             return cls.DEFAULT_CSV_FILE
+        elif format_type.lower() == 'sqlite':
+            return cls.DEFAULT_SQLITE_FILE
         else:
             return cls.DEFAULT_JSON_FILE
     
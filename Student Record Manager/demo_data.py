@@ -4,10 +4,12 @@ Demo Data Generator for Student Record Manager
 Creates sample student data for testing the application
 """
 
-import json
-import csv
+import argparse
 import random
-from typing import List, Dict
+import sys
+from typing import Iterator, List, Dict, Optional
+
+from student_io import detect_format, write_records
 
 # Sample data for generating realistic student records
 FIRST_NAMES = [
@@ -36,32 +38,32 @@ def generate_student_id(index: int) -> str:
     return f"S{index:03d}"
 
 
-def generate_name() -> str:
+def generate_name(rng: random.Random = random) -> str:
     """Generate a random full name"""
-    first_name = random.choice(FIRST_NAMES)
-    last_name = random.choice(LAST_NAMES)
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
     return f"{first_name} {last_name}"
 
 
-def generate_age() -> int:
+def generate_age(rng: random.Random = random) -> int:
     """Generate a random age between 16 and 25"""
-    return random.randint(16, 25)
+    return rng.randint(16, 25)
 
 
-def generate_grade() -> str:
+def generate_grade(rng: random.Random = random) -> str:
     """Generate a random grade"""
-    return random.choice(GRADES)
+    return rng.choice(GRADES)
 
 
-def generate_class() -> str:
+def generate_class(rng: random.Random = random) -> str:
     """Generate a random class/grade level"""
-    return random.choice(CLASSES)
+    return rng.choice(CLASSES)
 
 
-def generate_email(name: str) -> str:
+def generate_email(name: str, rng: random.Random = random) -> str:
     """Generate an email based on the student's name"""
     first_name, last_name = name.lower().split()
-    domain = random.choice(EMAIL_DOMAINS)
+    domain = rng.choice(EMAIL_DOMAINS)
     # Create variations of email formats
     formats = [
         f"{first_name}.{last_name}@{domain}",
@@ -69,51 +71,81 @@ def generate_email(name: str) -> str:
         f"{first_name[0]}.{last_name}@{domain}",
         f"{first_name}{last_name[0]}@{domain}"
     ]
-    return random.choice(formats)
+    return rng.choice(formats)
 
 
-def generate_student_records(count: int = 10) -> List[Dict]:
-    """Generate a list of student records"""
-    students = []
+def iter_student_records(count: int = 10, seed: Optional[int] = None,
+                         start: int = 1) -> Iterator[Dict]:
+    """
+    Lazily generate student records
     
-    for i in range(1, count + 1):
-        name = generate_name()
-        student = {
+    Args:
+        count: Number of records to generate
+        seed: Seed for a private random generator (same seed, same records)
+        start: Index of the first student ID
+    """
+    rng = random.Random(seed)
+    for i in range(start, start + count):
+        name = generate_name(rng)
+        yield {
             "student_id": generate_student_id(i),
             "name": name,
-            "age": generate_age(),
-            "grade": generate_grade(),
-            "email": generate_email(name)
+            "age": generate_age(rng),
+            "grade": generate_grade(rng),
+            "email": generate_email(name, rng)
         }
-        students.append(student)
+
+
+def generate_student_records(count: int = 10, seed: Optional[int] = None) -> List[Dict]:
+    """Generate a list of student records"""
+    return list(iter_student_records(count, seed))
+
+
+def write_demo_data(filename: str, count: int, file_format: Optional[str] = None,
+                    seed: Optional[int] = None, start: int = 1) -> int:
+    """
+    Stream generated students into a JSON, JSONL, CSV or SQLite file
     
-    return students
+    Records are written as they are generated, so millions of students can be
+    produced without holding them in memory.
+    
+    Returns:
+        int: Number of records written
+    """
+    file_format = file_format or detect_format(filename) or "json"
+    return write_records(filename, iter_student_records(count, seed, start), file_format)
 
 
 def save_demo_data_json(filename: str = "demo_students.json", count: int = 10) -> None:
     """Save demo data as JSON file"""
-    students = generate_student_records(count)
-    
-    with open(filename, 'w', encoding='utf-8') as file:
-        json.dump(students, file, indent=2, ensure_ascii=False)
+    write_demo_data(filename, count, "json")
     
     print(f"✓ Generated {count} demo student records in {filename}")
 
 
 def save_demo_data_csv(filename: str = "demo_students.csv", count: int = 10) -> None:
     """Save demo data as CSV file"""
-    students = generate_student_records(count)
-    
-    with open(filename, 'w', newline='', encoding='utf-8') as file:
-        if students:
-            fieldnames = ['student_id', 'name', 'age', 'grade', 'email']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(students)
+    write_demo_data(filename, count, "csv")
     
     print(f"✓ Generated {count} demo student records in {filename}")
 
 
+def run_command(argv: List[str]) -> int:
+    """Generate a (possibly very large) demo file from command-line options"""
+    parser = argparse.ArgumentParser(prog="demo_data.py", description="Generate demo student records")
+    parser.add_argument("--count", type=int, default=10, help="Number of students (default: 10)")
+    parser.add_argument("--output", default="demo_students.json",
+                        help="Output file; the format follows the extension")
+    parser.add_argument("--format", choices=["json", "jsonl", "csv", "sqlite"],
+                        help="Override the output format")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible data")
+    args = parser.parse_args(argv)
+    
+    written = write_demo_data(args.output, args.count, args.format, args.seed)
+    print(f"✓ Generated {written} demo student records in {args.output}")
+    return 0
+
+
 def main():
     """Main function to generate demo data"""
     print("🎓 Student Record Manager - Demo Data Generator")
@@ -144,4 +176,6 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
     main()
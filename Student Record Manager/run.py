@@ -1,12 +1,68 @@
 #!/usr/bin/env python3
 """
 Main entry point for Student Record Manager
-Run this file to start the application
+Run this file to start the application, or pass a subcommand for scripted
+queries, e.g. `python run.py list --sort age --page 3`
 """
 
+import argparse
+import contextlib
+import math
 import sys
 import os
 
+def run_command(argv):
+    """Run a non-interactive query and print one page of results"""
+    from config import Config
+    from student_manager import StudentRecordManager
+    from student_store import SORT_KEYS
+    
+    parser = argparse.ArgumentParser(prog="run.py", description="Scripted student record queries")
+    parser.add_argument("--file", help="Data file (defaults to students.<format>)")
+    parser.add_argument("--format", choices=Config.SUPPORTED_FORMATS, default="json",
+                        help="Data file format (default: json)")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    
+    list_parser = subcommands.add_parser("list", help="List students one page at a time")
+    list_parser.add_argument("--sort", choices=sorted(SORT_KEYS), help="Field to sort by")
+    
+    search_parser = subcommands.add_parser("search", help="Search students by ID or name")
+    search_parser.add_argument("term", help="Text to look for in student IDs and names")
+    search_parser.add_argument("--fuzzy", action="store_true",
+                               help="Rank names by similarity instead of exact substring match")
+    
+    for sub_parser in (list_parser, search_parser):
+        sub_parser.add_argument("--page", type=int, default=1, help="1-based page number")
+        sub_parser.add_argument("--page-size", type=int, default=Config.PAGE_SIZE,
+                                help=f"Records per page (default: {Config.PAGE_SIZE})")
+    
+    args = parser.parse_args(argv)
+    data_file = args.file or Config.get_data_file_path(args.format)
+    
+    # Keep stdout for the results; load messages go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        manager = StudentRecordManager(data_file, args.format)
+    
+    if args.command == "list":
+        total = len(manager.store)
+        students = manager.get_page(args.page, args.page_size, args.sort)
+    else:
+        if args.fuzzy:
+            # Rank every match, not just enough for this page, so the total
+            # and page count cover all of them
+            matches = [student for student, _ in manager.fuzzy_search(args.term, limit=len(manager.store))]
+        else:
+            matches = manager.search_student(args.term)
+        total = len(matches)
+        offset = (max(args.page, 1) - 1) * args.page_size
+        students = matches[offset:offset + args.page_size]
+    
+    manager.print_table(students)
+    total_pages = max(1, math.ceil(total / args.page_size))
+    print(f"📄 Page {args.page} of {total_pages} ({total} records)")
+    manager.close()
+    return 0
+
 def main():
     """Main entry point"""
     print("🎓 Student Record Manager - Main Entry Point")
@@ -51,4 +107,6 @@ def main():
             print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
     main()
@@ -9,6 +9,8 @@ import csv
 import os
 from typing import List, Dict
 
+from student_validation import validate_field
+
 
 class SimpleStudentManager:
     """Simple student record manager with direct input/output"""
@@ -47,8 +49,9 @@ class SimpleStudentManager:
         
         # Get input from user
         student_id = input("Enter Student ID: ").strip()
-        if not student_id:
-            print("❌ Student ID cannot be empty!")
+        error = validate_field('student_id', student_id)
+        if error:
+            print(f"❌ {error}")
             return
         
         # Check for duplicate
@@ -57,27 +60,31 @@ class SimpleStudentManager:
             return
         
         name = input("Enter Full Name: ").strip()
-        if not name:
-            print("❌ Name cannot be empty!")
+        error = validate_field('name', name)
+        if error:
+            print(f"❌ {error}")
             return
         
         try:
             age = int(input("Enter Age: ").strip())
-            if age < 1 or age > 150:
-                print("❌ Age must be between 1 and 150!")
-                return
         except ValueError:
             print("❌ Please enter a valid number for age!")
             return
+        error = validate_field('age', age)
+        if error:
+            print(f"❌ {error}")
+            return
         
         grade = input("Enter Grade/Class: ").strip()
-        if not grade:
-            print("❌ Grade cannot be empty!")
+        error = validate_field('grade', grade)
+        if error:
+            print(f"❌ {error}")
             return
         
         email = input("Enter Email: ").strip()
-        if not email or '@' not in email:
-            print("❌ Invalid email format!")
+        error = validate_field('email', email)
+        if error:
+            print(f"❌ {error}")
             return
         
         # Add student
@@ -195,12 +202,14 @@ class SimpleStudentManager:
         if age_input:
             try:
                 new_age = int(age_input)
-                if 1 <= new_age <= 150:
-                    student['age'] = new_age
-                else:
-                    print("❌ Age must be between 1 and 150!")
             except ValueError:
                 print("❌ Invalid age format!")
+            else:
+                error = validate_field('age', new_age)
+                if error:
+                    print(f"❌ {error}")
+                else:
+                    student['age'] = new_age
         
         # Update grade
         new_grade = input(f"Grade [{student['grade']}]: ").strip()
@@ -210,10 +219,11 @@ class SimpleStudentManager:
         # Update email
         new_email = input(f"Email [{student['email']}]: ").strip()
         if new_email:
-            if '@' in new_email:
-                student['email'] = new_email
+            error = validate_field('email', new_email)
+            if error:
+                print(f"❌ {error}")
             else:
-                print("❌ Invalid email format!")
+                student['email'] = new_email
         
         self.save_data()
         
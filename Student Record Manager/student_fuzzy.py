@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Fuzzy name search for Student Record Manager
+Ranks students by trigram similarity so typos still find the right record
+"""
+
+import heapq
+from collections import Counter
+from typing import Iterable, List, Set, Tuple
+
+
+def name_trigrams(name: str) -> Set[str]:
+    """
+    Return the padded trigrams of every word in a name
+    
+    Each word is padded with two leading spaces and one trailing space, so
+    'Ann' yields '  a', ' an', 'ann' and 'nn ' and word starts carry weight.
+    """
+    grams = set()
+    for word in name.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[start:start + 3] for start in range(len(padded) - 2))
+    return grams
+
+
+def similarity(shared: int, query_size: int, name_size: int) -> float:
+    """Jaccard similarity of two trigram sets given their overlap"""
+    union = query_size + name_size - shared
+    return shared / union if union else 0.0
+
+
+def top_matches(scores: Iterable[Tuple[str, float]], limit: int,
+                min_score: float) -> List[Tuple[str, float]]:
+    """Best `limit` (student_id, score) pairs, ties broken by student ID"""
+    candidates = ((student_id, score) for student_id, score in scores if score >= min_score)
+    return heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+
+
+class FuzzyNameIndex:
+    """
+    Inverted trigram index over student names, updated incrementally
+    
+    Postings hold distinct names rather than student IDs, so a name shared
+    by many students is split into trigrams and scored only once.
+    """
+    
+    def __init__(self):
+        self._postings = {}
+        self._sizes = {}
+        self._students = {}
+    
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._students.values())
+    
+    def add(self, student_id: str, name: str) -> None:
+        """Index a student's name"""
+        ids = self._students.get(name)
+        if ids is not None:
+            ids.add(student_id)
+            return
+        
+        self._students[name] = {student_id}
+        grams = name_trigrams(name)
+        self._sizes[name] = len(grams)
+        for gram in grams:
+            names = self._postings.get(gram)
+            if names is None:
+                self._postings[gram] = {name}
+            else:
+                names.add(name)
+    
+    def remove(self, student_id: str, name: str) -> None:
+        """Drop a student's name from the index"""
+        ids = self._students.get(name)
+        if ids is None:
+            return
+        ids.discard(student_id)
+        if ids:
+            return
+        
+        del self._students[name]
+        del self._sizes[name]
+        for gram in name_trigrams(name):
+            names = self._postings.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._postings[gram]
+    
+    def search(self, query: str, limit: int = 10,
+               min_score: float = 0.2) -> List[Tuple[str, float]]:
+        """
+        Rank indexed names by similarity to query
+        
+        Only students sharing at least one trigram with the query are scored,
+        so the cost depends on the postings touched rather than roster size.
+        
+        Returns:
+            Up to `limit` (student_id, score) pairs, best first
+        """
+        query_grams = name_trigrams(query)
+        if not query_grams:
+            return []
+        
+        shared = Counter()
+        for gram in query_grams:
+            names = self._postings.get(gram)
+            if names:
+                shared.update(names)
+        
+        scores = []
+        for name, count in shared.items():
+            score = similarity(count, len(query_grams), self._sizes[name])
+            if score >= min_score:
+                scores.extend((student_id, score) for student_id in self._students[name])
+        return top_matches(scores, limit, min_score)
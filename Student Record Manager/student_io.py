@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Streaming import/export helpers for Student Record Manager
+Reads and writes student files one record at a time so memory stays flat
+"""
+
+import csv
+import json
+import os
+import re
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+from student_sqlite import SQLiteStudentStore
+
+
+FIELDS = ['student_id', 'name', 'age', 'grade', 'email']
+
+# File extension -> format name understood by iter_records/write_records
+EXTENSION_FORMATS = {
+    'json': 'json',
+    'jsonl': 'jsonl',
+    'csv': 'csv',
+    'db': 'sqlite',
+    'sqlite': 'sqlite',
+}
+
+_SEPARATOR = re.compile(r'[\s,]*')
+
+
+def detect_format(filename: str) -> str:
+    """Return the format for a filename based on its extension, or ''"""
+    return EXTENSION_FORMATS.get(filename.lower().rsplit('.', 1)[-1], '')
+
+
+def chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Group records into lists of at most size items"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_json_array(file, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Decode the items of a top-level JSON array without loading it whole"""
+    decoder = json.JSONDecoder()
+    # Skip leading whitespace, however many chunks it takes
+    buffer = ''
+    while not buffer:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith('['):
+        raise ValueError("Expected a JSON array of student records")
+    position = 1
+    eof = False
+    while True:
+        position = _SEPARATOR.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            return
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            # Record spans the chunk boundary; keep the tail and read more
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield record
+
+
+def iter_records(filename: str, file_format: str = None) -> Iterator[Dict]:
+    """
+    Yield student records from a JSON, JSONL, CSV or SQLite file
+    
+    Args:
+        filename: File to read
+        file_format: Format of the file; detected from the extension if omitted
+    """
+    file_format = file_format or detect_format(filename)
+    if file_format == 'json':
+        with open(filename, 'r', encoding='utf-8') as file:
+            yield from _iter_json_array(file)
+    elif file_format == 'jsonl':
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif file_format == 'csv':
+        with open(filename, 'r', newline='', encoding='utf-8') as file:
+            for student in csv.DictReader(file):
+                # Convert age to int for CSV data; bad values are left for
+                # the validator to report
+                try:
+                    student['age'] = int(student['age'])
+                except (TypeError, ValueError):
+                    pass
+                yield student
+    elif file_format == 'sqlite':
+        store = SQLiteStudentStore(filename)
+        try:
+            yield from store
+        finally:
+            store.close()
+    else:
+        raise ValueError(f"Unsupported file format: {filename}")
+
+
+def sync_file(file) -> None:
+    """Force everything written to an open file onto the disk"""
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def sync_directory(path: str) -> None:
+    """Force the directory entry of path (e.g. after a rename) onto the disk"""
+    if os.name != 'posix':
+        # Windows cannot open directories; NTFS journals renames itself
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_records(filename: str, records: Iterable[Dict], file_format: str,
+                  durable: bool = False) -> int:
+    """
+    Write student records to a file one at a time
+    
+    Args:
+        filename: Destination file (overwritten)
+        records: Student records to write
+        file_format: 'json', 'jsonl', 'csv' or 'sqlite'
+        durable: Make sure the file is on disk, not just in the OS cache,
+            before returning
+    
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    if file_format == 'json':
+        # Same layout as json.dump(students, indent=2), encoded a batch at a
+        # time: each batch is dumped as a list and its brackets are dropped
+        with open(filename, 'w', encoding='utf-8') as file:
+            for batch in chunked(records, 1000):
+                encoded = json.dumps(batch, indent=2, ensure_ascii=False)
+                file.write(('[\n' if count == 0 else ',\n') + encoded[2:-2])
+                count += len(batch)
+            file.write('\n]' if count else '[]')
+            if durable:
+                sync_file(file)
+    elif file_format == 'jsonl':
+        with open(filename, 'w', encoding='utf-8') as file:
+            for student in records:
+                file.write(json.dumps(student, ensure_ascii=False) + '\n')
+                count += 1
+            if durable:
+                sync_file(file)
+    elif file_format == 'csv':
+        with open(filename, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            for student in records:
+                if count == 0:
+                    writer.writeheader()
+                writer.writerow(student)
+                count += 1
+            if durable:
+                sync_file(file)
+    elif file_format == 'sqlite':
+        # Build a fresh database beside the target and swap it in, so an
+        # existing database is never emptied before the new rows are ready
+        temp_file = f"{filename}.tmp"
+        for path in (temp_file, f"{temp_file}-wal", f"{temp_file}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        store = SQLiteStudentStore(temp_file)
+        try:
+            store.add_many(records)
+            count = len(store)
+        except Exception:
+            store.close()
+            os.remove(temp_file)
+            raise
+        store.close()
+        # A leftover write-ahead log would be replayed into the new file
+        for path in (f"{filename}-wal", f"{filename}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        # SQLite syncs its own commits; only the rename is left
+        os.replace(temp_file, filename)
+        if durable:
+            sync_directory(filename)
+    else:
+        raise ValueError(f"Unsupported file format: {file_format}")
+    return count
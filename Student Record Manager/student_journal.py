@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Append-only journal for Student Record Manager
+Records each mutation as one JSON line so saves don't rewrite the whole file
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List
+
+
+class StudentJournal:
+    """Write-ahead log of student mutations, replayed on top of a snapshot"""
+    
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Open (or create) a journal file
+        
+        Args:
+            path: Path of the journal file
+            fsync: Force every entry to disk before returning
+        """
+        self.path = path
+        self.fsync = fsync
+        self.entries = self._read_entries()
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def _read_entries(self) -> List[Dict]:
+        """Read complete entries, dropping a torn last line left by a crash"""
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        
+        valid_bytes = 0
+        with open(self.path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        
+        if valid_bytes < os.path.getsize(self.path):
+            print(f"⚠️  Discarding incomplete entry at the end of {self.path}")
+            with open(self.path, 'r+b') as file:
+                file.truncate(valid_bytes)
+        return entries
+    
+    def replay(self) -> Iterator[Dict]:
+        """Yield journal entries in the order they were written"""
+        return iter(self.entries)
+    
+    def append(self, op: str, **payload) -> None:
+        """Durably append one mutation to the journal"""
+        entry = {'op': op, **payload}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.entries.append(entry)
+    
+    def truncate(self) -> None:
+        """Drop all entries once they are folded into a snapshot"""
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.entries = []
+    
+    def close(self) -> None:
+        """Close the journal file"""
+        self._file.close()
@@ -1,71 +1,168 @@
 #!/usr/bin/env python3
 """
 Student Record Manager - A simple CRUD system for managing student records
-Supports both CSV and JSON file formats with full CRUD operations
+Supports CSV, JSON and SQLite storage with full CRUD operations
 """
 
-import csv
-import json
+import math
 import os
 import sys
-from typing import List, Dict, Optional, Union
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from datetime import datetime
 
+from config import Config
+from student_io import chunked, detect_format, iter_records, sync_directory, write_records
+from student_journal import StudentJournal
+from student_sqlite import SQLiteStudentStore
+from student_store import SORT_KEYS, StudentStore
+from student_validation import RowError, validate_batch, validate_field, validate_student
+
 
 class StudentRecordManager:
     """Main class for managing student records with CSV and JSON support"""
     
-    def __init__(self, data_file: str = "students.json", file_format: str = "json"):
+    def __init__(self, data_file: str = "students.json", file_format: str = "json",
+                 journal: bool = False):
         """
         Initialize the Student Record Manager
         
         Args:
             data_file: Name of the data file
-            file_format: Format of the data file ('json' or 'csv')
+            file_format: Format of the data file ('json', 'csv' or 'sqlite')
+            journal: Append mutations to '<data_file>.journal' and only
+                rewrite the data file when the journal is compacted
+                (ignored for 'sqlite', which commits each change itself)
         """
         self.data_file = data_file
         self.file_format = file_format.lower()
-        self.students = []
+        if self.file_format == "sqlite":
+            self.store = SQLiteStudentStore(data_file)
+        else:
+            self.store = StudentStore()
+        self.journal = None
+        # Rows rejected by the most recent import_from_file()
+        self.import_errors: List[RowError] = []
+        # Rows of the data file left out by load_data() for a bad age
+        self.load_errors: List[RowError] = []
         self.load_data()
+        if journal and self.file_format != "sqlite":
+            self.journal = StudentJournal(f"{data_file}.journal", fsync=Config.JOURNAL_FSYNC)
+            self.replay_journal()
+    
+    @property
+    def students(self) -> List[Dict]:
+        """All student records, in store order"""
+        return list(self.store)
+    
+    @students.setter
+    def students(self, students: List[Dict]) -> None:
+        self.store.load(students)
     
     def load_data(self) -> None:
         """Load student data from file"""
+        if self.file_format == "sqlite":
+            # Records stay on disk; queries go straight to the database
+            print(f"✓ Opened {len(self.store)} student records in {self.data_file}")
+            return
         try:
             if os.path.exists(self.data_file):
-                if self.file_format == "json":
-                    with open(self.data_file, 'r', encoding='utf-8') as file:
-                        self.students = json.load(file)
-                elif self.file_format == "csv":
-                    with open(self.data_file, 'r', newline='', encoding='utf-8') as file:
-                        reader = csv.DictReader(file)
-                        self.students = list(reader)
-                        # Convert age to int for CSV data
-                        for student in self.students:
-                            student['age'] = int(student['age'])
-                print(f"✓ Loaded {len(self.students)} student records from {self.data_file}")
+                self.load_errors = []
+                self.store.load(self._with_valid_age(iter_records(self.data_file, self.file_format)))
+                print(f"✓ Loaded {len(self.store)} student records from {self.data_file}")
+                if self.load_errors:
+                    print(f"⚠️  Left out {len(self.load_errors)} rows with an invalid age; "
+                          f"they will be dropped from {self.data_file} on the next save:")
+                    for report in self.load_errors[:Config.IMPORT_ERROR_PREVIEW]:
+                        print(f"   Row {report.row} ({report.student_id or 'no ID'}): {'; '.join(report.errors)}")
             else:
                 print(f"ℹ No existing data file found. Starting with empty database.")
                 self.students = []
         except Exception as e:
-            print(f"❌ Error loading data: {e}")
-            self.students = []
+            # Carrying on with an empty store would overwrite the file on
+            # the next save, so refuse to start instead
+            print(f"❌ Error loading data from {self.data_file}: {e}")
+            raise
+    
+    def _with_valid_age(self, students: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yield the records whose age is a whole number
+        
+        CSV ages that do not parse stay strings so imports can report them;
+        a data file is not validated like an import, but such an age would
+        break sorting by age, so those rows are set aside in self.load_errors.
+        """
+        for row, student in enumerate(students, 1):
+            age = student.get('age')
+            if isinstance(age, int) and not isinstance(age, bool):
+                yield student
+            else:
+                self.load_errors.append(RowError(row, str(student.get('student_id', '')),
+                                                 ["Age must be a whole number!"]))
+    
+    def replay_journal(self) -> None:
+        """Apply journaled mutations on top of the loaded snapshot"""
+        count = 0
+        for entry in self.journal.replay():
+            self._apply(entry)
+            count += 1
+        if count:
+            print(f"✓ Replayed {count} journal entries from {self.journal.path}")
     
-    def save_data(self) -> None:
+    def _apply(self, entry: Dict) -> None:
+        """Apply one journal entry to the store (entries are idempotent)"""
+        op = entry['op']
+        if op == 'add':
+            self.store.add(entry['student'])
+        elif op == 'update':
+            self.store.update(entry['student_id'], entry['changes'])
+        elif op == 'delete':
+            self.store.remove(entry['student_id'])
+        elif op == 'sort':
+            self.store.reorder(entry['sort_by'])
+    
+    def commit(self, op: str, **payload) -> None:
+        """Persist a mutation: journal it if enabled, otherwise rewrite the file"""
+        if self.journal is None:
+            self.save_data()
+            return
+        self.journal.append(op, **payload)
+        if len(self.journal) >= Config.JOURNAL_COMPACT_THRESHOLD:
+            self.compact()
+    
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot of the data file"""
+        if self.save_data() and self.journal is not None:
+            self.journal.truncate()
+    
+    def close(self) -> None:
+        """Compact any pending journal entries and close open files"""
+        if self.journal is not None:
+            if len(self.journal):
+                self.compact()
+            self.journal.close()
+            self.journal = None
+        if self.file_format == "sqlite":
+            self.store.close()
+    
+    def save_data(self) -> bool:
         """Save student data to file"""
+        if self.file_format == "sqlite":
+            # Every change is already committed in its own transaction
+            return True
+        # Write to a temporary file and rename it over the data file, so a
+        # crash mid-write never leaves a truncated snapshot behind. Both the
+        # file and the rename reach the disk before this returns, since
+        # compact() truncates the journal right after
+        temp_file = f"{self.data_file}.tmp"
         try:
-            if self.file_format == "json":
-                with open(self.data_file, 'w', encoding='utf-8') as file:
-                    json.dump(self.students, file, indent=2, ensure_ascii=False)
-            elif self.file_format == "csv":
-                with open(self.data_file, 'w', newline='', encoding='utf-8') as file:
-                    if self.students:
-                        fieldnames = ['student_id', 'name', 'age', 'grade', 'email']
-                        writer = csv.DictWriter(file, fieldnames=fieldnames)
-                        writer.writeheader()
-                        writer.writerows(self.students)
+            write_records(temp_file, self.store, self.file_format, durable=True)
+            os.replace(temp_file, self.data_file)
+            sync_directory(self.data_file)
             print(f"✓ Data saved to {self.data_file}")
+            return True
         except Exception as e:
             print(f"❌ Error saving data: {e}")
+            return False
     
     def add_student(self, student_id: str, name: str, age: int, grade: str, email: str) -> bool:
         """
@@ -82,20 +179,10 @@ class StudentRecordManager:
             bool: True if successful, False if student ID already exists
         """
         # Check for duplicate student ID
-        if any(student['student_id'] == student_id for student in self.students):
+        if student_id in self.store:
             print(f"❌ Error: Student ID '{student_id}' already exists!")
             return False
         
-        # Validate email format
-        if '@' not in email or '.' not in email.split('@')[1]:
-            print("❌ Error: Invalid email format!")
-            return False
-        
-        # Validate age
-        if not isinstance(age, int) or age < 1 or age > 150:
-            print("❌ Error: Age must be a positive integer between 1 and 150!")
-            return False
-        
         new_student = {
             'student_id': student_id,
             'name': name,
@@ -104,26 +191,75 @@ class StudentRecordManager:
             'email': email
         }
         
-        self.students.append(new_student)
-        self.save_data()
+        errors = validate_student(new_student)
+        if errors:
+            for error in errors:
+                print(f"❌ Error: {error}")
+            return False
+        
+        self.store.add(new_student)
+        self.commit('add', student=new_student)
         print(f"✓ Student '{name}' added successfully!")
         return True
     
-    def view_all_students(self) -> None:
-        """Display all student records"""
-        if not self.students:
-            print("📝 No student records found.")
-            return
+    def get_page(self, page: int = 1, page_size: Optional[int] = None,
+                 sort_by: Optional[str] = None) -> List[Dict]:
+        """
+        Return one page of students without changing the stored order
+        
+        Args:
+            page: 1-based page number
+            page_size: Records per page (defaults to Config.PAGE_SIZE)
+            sort_by: Optional field to order by ('name', 'age', or 'grade')
         
-        print(f"\n📚 Student Records ({len(self.students)} total):")
+        Returns:
+            List of student records on that page (empty past the last page)
+        """
+        page_size = page_size or Config.PAGE_SIZE
+        offset = (max(page, 1) - 1) * page_size
+        return list(self.store.iter_sorted(sort_by, offset, page_size))
+    
+    def iter_pages(self, sort_by: Optional[str] = None,
+                   page_size: Optional[int] = None) -> Iterator[List[Dict]]:
+        """Lazily yield successive pages of students from one sorted cursor"""
+        return chunked(self.store.iter_sorted(sort_by), page_size or Config.PAGE_SIZE)
+    
+    @staticmethod
+    def print_table(students: List[Dict]) -> None:
+        """Print student records as a formatted table"""
         print("=" * 80)
         print(f"{'ID':<10} {'Name':<20} {'Age':<5} {'Grade':<10} {'Email':<25}")
         print("-" * 80)
         
-        for student in self.students:
+        for student in students:
             print(f"{student['student_id']:<10} {student['name']:<20} {student['age']:<5} {student['grade']:<10} {student['email']:<25}")
         print("=" * 80)
     
+    def display_pages(self, pages: Iterator[List[Dict]], total: int,
+                      page_size: Optional[int] = None) -> None:
+        """Print pages one at a time, asking before rendering the next one"""
+        page_size = page_size or Config.PAGE_SIZE
+        total_pages = max(1, math.ceil(total / page_size))
+        
+        for number, students in enumerate(pages, 1):
+            self.print_table(students)
+            if total_pages > 1:
+                print(f"📄 Page {number} of {total_pages}")
+            if number < total_pages:
+                answer = input("Press Enter for the next page, or 'q' to stop: ").strip().lower()
+                if answer == 'q':
+                    break
+    
+    def view_all_students(self, sort_by: Optional[str] = None) -> None:
+        """Display all student records a page at a time"""
+        if not self.store:
+            print("📝 No student records found.")
+            return
+        
+        total = len(self.store)
+        print(f"\n📚 Student Records ({total} total):")
+        self.display_pages(self.iter_pages(sort_by), total)
+    
     def search_student(self, search_term: str) -> List[Dict]:
         """
         Search for students by ID or name
@@ -134,30 +270,34 @@ class StudentRecordManager:
         Returns:
             List of matching student records
         """
-        matches = []
-        search_term_lower = search_term.lower()
+        return self.store.search(search_term)
+    
+    def fuzzy_search(self, name: str, limit: Optional[int] = None) -> List[Tuple[Dict, float]]:
+        """
+        Find students whose names are similar to name, tolerating typos
         
-        for student in self.students:
-            if (search_term_lower in student['student_id'].lower() or 
-                search_term_lower in student['name'].lower()):
-                matches.append(student)
+        Args:
+            name: Approximate student name
+            limit: Maximum number of matches (defaults to Config.FUZZY_LIMIT)
         
-        return matches
+        Returns:
+            List of (student record, similarity score) pairs, best first
+        """
+        return self.store.fuzzy_search(name, limit or Config.FUZZY_LIMIT, Config.FUZZY_MIN_SCORE)
     
     def display_search_results(self, matches: List[Dict], search_term: str) -> None:
         """Display search results in a formatted table"""
         if not matches:
             print(f"🔍 No students found matching '{search_term}'")
+            suggestions = self.fuzzy_search(search_term)
+            if suggestions:
+                print("💡 Did you mean:")
+                for student, score in suggestions:
+                    print(f"   {student['student_id']:<10} {student['name']:<20} ({score:.0%} similar)")
             return
         
         print(f"\n🔍 Search Results for '{search_term}' ({len(matches)} found):")
-        print("=" * 80)
-        print(f"{'ID':<10} {'Name':<20} {'Age':<5} {'Grade':<10} {'Email':<25}")
-        print("-" * 80)
-        
-        for student in matches:
-            print(f"{student['student_id']:<10} {student['name']:<20} {student['age']:<5} {student['grade']:<10} {student['email']:<25}")
-        print("=" * 80)
+        self.display_pages(chunked(matches, Config.PAGE_SIZE), len(matches))
     
     def update_student(self, student_id: str) -> bool:
         """
@@ -169,19 +309,20 @@ class StudentRecordManager:
         Returns:
             bool: True if successful, False if student not found
         """
-        student = next((s for s in self.students if s['student_id'] == student_id), None)
+        student = self.store.get(student_id)
         
         if not student:
             print(f"❌ Student with ID '{student_id}' not found!")
             return False
         
+        changes = {}
         print(f"\n📝 Updating student: {student['name']} (ID: {student_id})")
         print("Press Enter to keep current value, or type new value:")
         
         # Update name
         new_name = input(f"Name [{student['name']}]: ").strip()
         if new_name:
-            student['name'] = new_name
+            changes['name'] = new_name
         
         # Update age
         while True:
@@ -190,31 +331,35 @@ class StudentRecordManager:
                 break
             try:
                 new_age = int(age_input)
-                if 1 <= new_age <= 150:
-                    student['age'] = new_age
-                    break
-                else:
-                    print("❌ Age must be between 1 and 150!")
             except ValueError:
                 print("❌ Please enter a valid number for age!")
+                continue
+            error = validate_field('age', new_age)
+            if error:
+                print(f"❌ {error}")
+            else:
+                changes['age'] = new_age
+                break
         
         # Update grade
         new_grade = input(f"Grade [{student['grade']}]: ").strip()
         if new_grade:
-            student['grade'] = new_grade
+            changes['grade'] = new_grade
         
         # Update email
         while True:
             email_input = input(f"Email [{student['email']}]: ").strip()
             if not email_input:
                 break
-            if '@' in email_input and '.' in email_input.split('@')[1]:
-                student['email'] = email_input
-                break
+            error = validate_field('email', email_input)
+            if error:
+                print(f"❌ {error}")
             else:
-                print("❌ Invalid email format!")
+                changes['email'] = email_input
+                break
         
-        self.save_data()
+        student = self.store.update(student_id, changes)
+        self.commit('update', student_id=student_id, changes=changes)
         print(f"✓ Student '{student['name']}' updated successfully!")
         return True
     
@@ -228,7 +373,7 @@ class StudentRecordManager:
         Returns:
             bool: True if successful, False if student not found
         """
-        student = next((s for s in self.students if s['student_id'] == student_id), None)
+        student = self.store.get(student_id)
         
         if not student:
             print(f"❌ Student with ID '{student_id}' not found!")
@@ -238,8 +383,8 @@ class StudentRecordManager:
         confirm = input("Type 'yes' to confirm deletion: ").strip().lower()
         
         if confirm == 'yes':
-            self.students = [s for s in self.students if s['student_id'] != student_id]
-            self.save_data()
+            self.store.remove(student_id)
+            self.commit('delete', student_id=student_id)
             print(f"✓ Student '{student['name']}' deleted successfully!")
             return True
         else:
@@ -248,37 +393,31 @@ class StudentRecordManager:
     
     def sort_students(self, sort_by: str) -> None:
         """
-        Sort students by specified field
+        Display students sorted by specified field
+        
+        The view is built from a sorted index; the stored order and the
+        data file are left untouched.
         
         Args:
             sort_by: Field to sort by ('name', 'age', or 'grade')
         """
-        if not self.students:
+        if not self.store:
             print("📝 No student records to sort.")
             return
         
-        if sort_by == 'name':
-            self.students.sort(key=lambda x: x['name'].lower())
-            print("✓ Students sorted by name")
-        elif sort_by == 'age':
-            self.students.sort(key=lambda x: x['age'])
-            print("✓ Students sorted by age")
-        elif sort_by == 'grade':
-            self.students.sort(key=lambda x: x['grade'])
-            print("✓ Students sorted by grade")
-        else:
+        if sort_by not in SORT_KEYS:
             print("❌ Invalid sort field. Use 'name', 'age', or 'grade'")
             return
         
-        self.save_data()
-        self.view_all_students()
+        print(f"✓ Students sorted by {sort_by}")
+        self.view_all_students(sort_by)
     
     def export_to_format(self, target_format: str, filename: str = None) -> bool:
         """
         Export data to different format
         
         Args:
-            target_format: Target format ('csv' or 'json')
+            target_format: Target format ('csv', 'json', 'jsonl' or 'sqlite')
             filename: Optional custom filename
             
         Returns:
@@ -286,36 +425,42 @@ class StudentRecordManager:
         """
         if not filename:
             base_name = self.data_file.rsplit('.', 1)[0]
-            filename = f"{base_name}_export.{target_format}"
+            extension = "db" if target_format == "sqlite" else target_format
+            filename = f"{base_name}_export.{extension}"
+        
+        if target_format not in ("json", "jsonl", "csv", "sqlite"):
+            print("❌ Invalid format. Use 'csv', 'json', 'jsonl' or 'sqlite'")
+            return False
+        
+        # Writing over the file in use would read and replace it at once
+        if os.path.abspath(filename) == os.path.abspath(self.data_file):
+            print(f"ℹ {filename} is the current data file; nothing to export")
+            return True
         
         try:
-            if target_format == "json":
-                with open(filename, 'w', encoding='utf-8') as file:
-                    json.dump(self.students, file, indent=2, ensure_ascii=False)
-            elif target_format == "csv":
-                with open(filename, 'w', newline='', encoding='utf-8') as file:
-                    if self.students:
-                        fieldnames = ['student_id', 'name', 'age', 'grade', 'email']
-                        writer = csv.DictWriter(file, fieldnames=fieldnames)
-                        writer.writeheader()
-                        writer.writerows(self.students)
-            else:
-                print("❌ Invalid format. Use 'csv' or 'json'")
-                return False
-            
-            print(f"✓ Data exported to {filename}")
+            # Records are streamed from the store straight into the file
+            count = write_records(filename, self.store, target_format)
+            print(f"✓ Exported {count} records to {filename}")
             return True
         except Exception as e:
             print(f"❌ Error exporting data: {e}")
             return False
     
-    def import_from_file(self, filename: str) -> bool:
+    def import_from_file(self, filename: str,
+                         progress: Optional[Callable[[int, int], None]] = None) -> bool:
         """
         Import data from file
         
+        Records are streamed from the file in chunks of
+        Config.IMPORT_CHUNK_SIZE, so memory use does not grow with file size.
+        Each chunk is validated as a batch; rejected rows are skipped and
+        reported in self.import_errors.
+        
         Args:
-            filename: Path to the file to import
-            
+            filename: Path to the file to import (.json, .jsonl, .csv or .db)
+            progress: Optional callback receiving (rows read, rows imported)
+                after each chunk; defaults to printing a progress line
+        
         Returns:
             bool: True if successful, False otherwise
         """
@@ -323,40 +468,48 @@ class StudentRecordManager:
             print(f"❌ File '{filename}' not found!")
             return False
         
+        if not detect_format(filename):
+            print("❌ Unsupported file format. Use .json, .jsonl, .csv or .db files")
+            return False
+        
+        if progress is None:
+            progress = lambda read, added: print(f"   ⏳ {read} rows read, {added} imported...")
+        
+        processed = 0
+        added = 0
+        invalid = 0
+        self.import_errors = []
         try:
-            imported_students = []
-            file_ext = filename.lower().split('.')[-1]
-            
-            if file_ext == 'json':
-                with open(filename, 'r', encoding='utf-8') as file:
-                    imported_students = json.load(file)
-            elif file_ext == 'csv':
-                with open(filename, 'r', newline='', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    imported_students = list(reader)
-                    # Convert age to int for CSV data
-                    for student in imported_students:
-                        student['age'] = int(student['age'])
-            else:
-                print("❌ Unsupported file format. Use .json or .csv files")
-                return False
-            
-            # Check for duplicate IDs
-            existing_ids = {s['student_id'] for s in self.students}
-            duplicates = [s for s in imported_students if s['student_id'] in existing_ids]
-            
-            if duplicates:
-                print(f"⚠️  Found {len(duplicates)} duplicate student IDs. Skipping duplicates.")
-                imported_students = [s for s in imported_students if s['student_id'] not in existing_ids]
-            
-            self.students.extend(imported_students)
-            self.save_data()
-            print(f"✓ Imported {len(imported_students)} student records from {filename}")
-            return True
-            
+            for chunk in chunked(iter_records(filename), Config.IMPORT_CHUNK_SIZE):
+                valid, errors = validate_batch(chunk, start=processed + 1)
+                self.import_errors.extend(errors)
+                invalid += len(errors)
+                # The store checks each ID against its index and skips duplicates
+                added += self.store.add_many(valid)
+                processed += len(chunk)
+                progress(processed, added)
         except Exception as e:
             print(f"❌ Error importing data: {e}")
+            if added:
+                # Keep the rows that made it in before the error
+                self.compact()
             return False
+        
+        if invalid:
+            print(f"⚠️  Skipped {invalid} invalid rows:")
+            for report in self.import_errors[:Config.IMPORT_ERROR_PREVIEW]:
+                print(f"   Row {report.row} ({report.student_id or 'no ID'}): {'; '.join(report.errors)}")
+            if invalid > Config.IMPORT_ERROR_PREVIEW:
+                print(f"   ... and {invalid - Config.IMPORT_ERROR_PREVIEW} more")
+        
+        duplicates = processed - invalid - added
+        if duplicates:
+            print(f"⚠️  Found {duplicates} duplicate student IDs. Skipping duplicates.")
+        
+        # A bulk import goes straight into a new snapshot
+        self.compact()
+        print(f"✓ Imported {added} student records from {filename}")
+        return True
 
 
 def display_menu() -> None:
@@ -388,33 +541,38 @@ def get_student_input() -> tuple:
     print("-" * 30)
     
     student_id = input("Student ID: ").strip()
-    if not student_id:
-        print("❌ Student ID cannot be empty!")
+    error = validate_field('student_id', student_id)
+    if error:
+        print(f"❌ {error}")
         return None
     
     name = input("Full Name: ").strip()
-    if not name:
-        print("❌ Name cannot be empty!")
+    error = validate_field('name', name)
+    if error:
+        print(f"❌ {error}")
         return None
     
     while True:
         try:
             age = int(input("Age: ").strip())
-            if 1 <= age <= 150:
-                break
-            else:
-                print("❌ Age must be between 1 and 150!")
         except ValueError:
             print("❌ Please enter a valid number for age!")
+            continue
+        error = validate_field('age', age)
+        if not error:
+            break
+        print(f"❌ {error}")
     
     grade = input("Grade/Class: ").strip()
-    if not grade:
-        print("❌ Grade cannot be empty!")
+    error = validate_field('grade', grade)
+    if error:
+        print(f"❌ {error}")
         return None
     
     email = input("Email: ").strip()
-    if not email:
-        print("❌ Email cannot be empty!")
+    error = validate_field('email', email)
+    if error:
+        print(f"❌ {error}")
         return None
     
     return student_id, name, age, grade, email
@@ -426,18 +584,20 @@ def main():
     print("Choose your preferred file format:")
     print("1. JSON (recommended)")
     print("2. CSV")
+    print("3. SQLite (large rosters)")
     
-    format_choice = input("Enter choice (1-2): ").strip()
-    file_format = "json" if format_choice == "1" else "csv"
-    data_file = f"students.{file_format}"
+    format_choice = input("Enter choice (1-3): ").strip()
+    file_format = Config.FORMAT_OPTIONS.get(format_choice, "csv")
+    data_file = Config.get_data_file_path(file_format)
     
-    manager = StudentRecordManager(data_file, file_format)
+    manager = StudentRecordManager(data_file, file_format, journal=Config.JOURNAL_MODE)
     
     while True:
         display_menu()
         choice = get_user_choice()
         
         if choice == "0":
+            manager.close()
             print("\n👋 Thank you for using Student Record Manager!")
             break
         
@@ -488,12 +648,12 @@ def main():
             print("\n📤 Export Data to:")
             print("1. JSON")
             print("2. CSV")
-            export_choice = input("Enter choice (1-2): ").strip()
+            print("3. SQLite")
+            print("4. JSON Lines")
+            export_choice = input("Enter choice (1-4): ").strip()
             
-            if export_choice == "1":
-                manager.export_to_format("json")
-            elif export_choice == "2":
-                manager.export_to_format("csv")
+            if export_choice in Config.EXPORT_FORMAT_OPTIONS:
+                manager.export_to_format(Config.EXPORT_FORMAT_OPTIONS[export_choice])
             else:
                 print("❌ Invalid choice!")
         
@@ -508,15 +668,17 @@ def main():
             print("\n🔄 Change File Format:")
             print("1. JSON")
             print("2. CSV")
-            format_choice = input("Enter choice (1-2): ").strip()
+            print("3. SQLite")
+            format_choice = input("Enter choice (1-3): ").strip()
             
-            new_format = "json" if format_choice == "1" else "csv"
-            new_file = f"students.{new_format}"
+            new_format = Config.FORMAT_OPTIONS.get(format_choice, "csv")
+            new_file = Config.get_data_file_path(new_format)
             
             # Export current data to new format
             if manager.export_to_format(new_format, new_file):
                 print(f"✓ Switched to {new_format.upper()} format. New file: {new_file}")
-                manager = StudentRecordManager(new_file, new_format)
+                manager.close()
+                manager = StudentRecordManager(new_file, new_format, journal=Config.JOURNAL_MODE)
             else:
                 print("❌ Failed to change file format!")
         
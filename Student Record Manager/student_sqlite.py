@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+SQLite storage backend for Student Record Manager
+Keeps student records on disk so large rosters never have to fit in memory
+"""
+
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from student_fuzzy import name_trigrams
+
+
+FIELDS = ['student_id', 'name', 'age', 'grade', 'email']
+
+# SQL ordering for each sort field; position keeps ties in store order
+SQL_SORT_KEYS = {
+    'name': 'lower(name), position',
+    'age': 'age, position',
+    'grade': 'grade, position',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    grade TEXT NOT NULL,
+    email TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_students_name ON students (lower(name));
+CREATE INDEX IF NOT EXISTS idx_students_grade ON students (grade);
+CREATE INDEX IF NOT EXISTS idx_students_age ON students (age);
+CREATE INDEX IF NOT EXISTS idx_students_position ON students (position);
+CREATE INDEX IF NOT EXISTS idx_students_exact_name ON students (name);
+CREATE TABLE IF NOT EXISTS fuzzy_names (
+    name TEXT PRIMARY KEY,
+    gram_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fuzzy_trigrams (
+    gram TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (gram, name)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteStudentStore:
+    """Student records in a SQLite database, with the same API as StudentStore"""
+    
+    # Rows per executemany() call during bulk inserts
+    BATCH_SIZE = 10000
+    
+    def __init__(self, db_file: str):
+        """
+        Open (or create) a student database
+        
+        Args:
+            db_file: Path of the SQLite database file
+        """
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        row = self.conn.execute("SELECT COALESCE(MAX(position), -1) FROM students").fetchone()
+        self._next_position = row[0] + 1
+        if not self.conn.execute("SELECT 1 FROM fuzzy_names LIMIT 1").fetchone():
+            # Database predates fuzzy search; index the names it already holds
+            with self.conn:
+                self._index_names(row[0] for row in self.conn.execute("SELECT name FROM students"))
+    
+    def _index_names(self, names: Iterable[str]) -> None:
+        """
+        Add names to the fuzzy index
+        
+        Trigrams are kept per distinct name rather than per student, so a
+        roster full of repeated names stays small on disk and fast to load.
+        Names left behind by deletes simply match no students.
+        """
+        grams = {name: name_trigrams(name) for name in names}
+        self.conn.executemany("INSERT OR IGNORE INTO fuzzy_names (name, gram_count) VALUES (?, ?)",
+                              [(name, len(name_grams)) for name, name_grams in grams.items()])
+        self.conn.executemany("INSERT OR IGNORE INTO fuzzy_trigrams (gram, name) VALUES (?, ?)",
+                              [(gram, name) for name, name_grams in grams.items()
+                               for gram in name_grams])
+    
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        return {field: row[field] for field in FIELDS}
+    
+    def _select(self, where: str = "", params: tuple = (), order: str = "position",
+                limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict]:
+        sql = f"SELECT {', '.join(FIELDS)} FROM students {where} ORDER BY {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + (-1 if limit is None else limit, offset)
+        for row in self.conn.execute(sql, params):
+            yield self._to_dict(row)
+    
+    def load(self, students: Iterable[Dict]) -> None:
+        """Replace the database contents with the given student records"""
+        with self.conn:
+            self.conn.execute("DELETE FROM students")
+            self.conn.execute("DELETE FROM fuzzy_names")
+            self.conn.execute("DELETE FROM fuzzy_trigrams")
+        self._next_position = 0
+        self.add_many(students)
+    
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+    
+    def __bool__(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM students LIMIT 1").fetchone() is not None
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return self._select()
+    
+    def __contains__(self, student_id: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM students WHERE student_id = ?", (student_id,)).fetchone()
+        return row is not None
+    
+    def get(self, student_id: str) -> Optional[Dict]:
+        """Return the student with the given ID, or None"""
+        return next(self._select("WHERE student_id = ?", (student_id,)), None)
+    
+    def add(self, student: Dict) -> bool:
+        """
+        Add a student record
+        
+        Returns:
+            bool: True if added, False if the student ID already exists
+        """
+        return self.add_many([student]) == 1
+    
+    def add_many(self, students: Iterable[Dict]) -> int:
+        """
+        Insert students in batched transactions, skipping existing IDs
+        
+        Returns:
+            int: Number of students actually inserted
+        """
+        sql = ("INSERT OR IGNORE INTO students "
+               "(student_id, name, age, grade, email, position) VALUES (?, ?, ?, ?, ?, ?)")
+        before = self.conn.total_changes
+        batch = []
+        with self.conn:
+            for student in students:
+                batch.append((student['student_id'], student['name'], int(student['age']),
+                              student['grade'], student['email'], self._next_position))
+                self._next_position += 1
+                if len(batch) >= self.BATCH_SIZE:
+                    self.conn.executemany(sql, batch)
+                    self._index_names(row[1] for row in batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(sql, batch)
+                self._index_names(row[1] for row in batch)
+        return self.conn.total_changes - before
+    
+    def update(self, student_id: str, changes: Dict) -> Optional[Dict]:
+        """
+        Apply field changes to a student
+        
+        Returns:
+            The updated record, or None if the student was not found
+        """
+        changes = {field: value for field, value in changes.items()
+                   if field in FIELDS and field != 'student_id'}
+        if changes:
+            assignments = ', '.join(f"{field} = ?" for field in changes)
+            with self.conn:
+                self.conn.execute(f"UPDATE students SET {assignments} WHERE student_id = ?",
+                                  tuple(changes.values()) + (student_id,))
+                if 'name' in changes:
+                    self._index_names([changes['name']])
+        return self.get(student_id)
+    
+    def remove(self, student_id: str) -> Optional[Dict]:
+        """Remove and return the student with the given ID, or None"""
+        student = self.get(student_id)
+        if student is not None:
+            with self.conn:
+                self.conn.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
+        return student
+    
+    def reorder(self, sort_by: str) -> None:
+        """Renumber store order by a sort field ('name', 'age' or 'grade')"""
+        with self.conn:
+            self.conn.execute(f"""
+                UPDATE students SET position = (
+                    SELECT ranked.rn FROM (
+                        SELECT student_id, ROW_NUMBER() OVER (ORDER BY {SQL_SORT_KEYS[sort_by]}) - 1 AS rn
+                        FROM students
+                    ) AS ranked
+                    WHERE ranked.student_id = students.student_id
+                )
+            """)
+    
+    def iter_sorted(self, sort_by: Optional[str] = None, offset: int = 0,
+                    limit: Optional[int] = None) -> Iterator[Dict]:
+        """Yield students ordered by a sort field (store order if None)"""
+        order = SQL_SORT_KEYS[sort_by] if sort_by else "position"
+        return self._select(order=order, limit=limit, offset=offset)
+    
+    def search(self, search_term: str) -> List[Dict]:
+        """Find students whose ID or name contains search_term (case-insensitive)"""
+        term = search_term.lower()
+        return list(self._select(
+            "WHERE instr(lower(student_id), ?) > 0 OR instr(lower(name), ?) > 0", (term, term)))
+    
+    def fuzzy_search(self, query: str, limit: int = 10,
+                     min_score: float = 0.2) -> List[Tuple[Dict, float]]:
+        """Return up to `limit` (student, score) pairs whose names resemble query"""
+        grams = name_trigrams(query)
+        if not grams:
+            return []
+        # Jaccard similarity of trigram sets, scored once per distinct name
+        sql = f"""
+            WITH scored AS (
+                SELECT n.name, CAST(t.shared AS REAL) / (? + n.gram_count - t.shared) AS score
+                FROM (
+                    SELECT name, COUNT(*) AS shared FROM fuzzy_trigrams
+                    WHERE gram IN ({', '.join('?' * len(grams))}) GROUP BY name
+                ) AS t
+                JOIN fuzzy_names AS n ON n.name = t.name
+            )
+            SELECT {', '.join('s.' + field for field in FIELDS)}, scored.score
+            FROM scored JOIN students AS s ON s.name = scored.name
+            WHERE scored.score >= ?
+            ORDER BY scored.score DESC, s.student_id
+            LIMIT ?
+        """
+        params = (len(grams), *grams, min_score, limit)
+        return [(self._to_dict(row), row['score']) for row in self.conn.execute(sql, params)]
+    
+    def find_by_grade(self, grade: str) -> List[Dict]:
+        """Return all students with the given grade"""
+        return list(self._select("WHERE grade = ?", (grade,)))
+    
+    def find_by_age(self, min_age: int, max_age: Optional[int] = None) -> List[Dict]:
+        """Return all students whose age is within [min_age, max_age]"""
+        if max_age is None:
+            max_age = min_age
+        return list(self._select("WHERE age BETWEEN ? AND ?", (min_age, max_age)))
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.conn.close()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Indexed in-memory store for Student Record Manager
+Keeps student records keyed by ID with secondary indexes for fast lookups
+"""
+
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from student_fuzzy import FuzzyNameIndex
+
+
+# Length of the n-grams kept in the name/ID index. Longer search terms
+# intersect their n-gram postings and only verify the surviving candidates;
+# shorter terms match most of the roster anyway and are answered by a scan.
+GRAM_SIZE = 3
+
+# Sort key for each sortable field
+SORT_KEYS = {
+    'name': lambda x: x['name'].lower(),
+    'age': lambda x: x['age'],
+    'grade': lambda x: x['grade'],
+}
+
+
+def _grade(grade) -> str:
+    """Return grade as an interned string; data files may hold numbers"""
+    return sys.intern(str(grade))
+
+
+class StudentRecord:
+    """
+    Compact in-memory student record
+    
+    Slots replace the per-record dict and its repeated keys, and grades are
+    kept as interned strings so a million records share a handful of them
+    (a numeric grade such as 10 becomes "10"). Supports
+    item access (record['name']) so indexes and sort keys treat it like the
+    dicts it is built from; to_dict() gives back the serialized form.
+    """
+    
+    __slots__ = ('student_id', 'name', 'age', 'grade', 'email')
+    
+    def __init__(self, student_id: str, name: str, age: int, grade: str, email: str):
+        self.student_id = student_id
+        self.name = name
+        self.age = age
+        self.grade = _grade(grade)
+        self.email = email
+    
+    @classmethod
+    def from_dict(cls, student: Dict) -> 'StudentRecord':
+        """Build a record from a student dict"""
+        return cls(student['student_id'], student['name'], student['age'],
+                   student['grade'], student['email'])
+    
+    def __getitem__(self, field: str):
+        return getattr(self, field)
+    
+    def update(self, changes: Dict) -> None:
+        """Apply field changes"""
+        for field, value in changes.items():
+            setattr(self, field, _grade(value) if field == 'grade' else value)
+    
+    def to_dict(self) -> Dict:
+        """Return the record as a dict with fields in file order"""
+        return {'student_id': self.student_id, 'name': self.name, 'age': self.age,
+                'grade': self.grade, 'email': self.email}
+
+
+def _grams(text: str) -> Set[str]:
+    """Return every GRAM_SIZE character substring of text"""
+    return {text[start:start + GRAM_SIZE] for start in range(len(text) - GRAM_SIZE + 1)}
+
+
+class StudentStore:
+    """
+    Student records keyed by ID with grade, age and n-gram indexes
+    
+    Records are held as StudentRecord objects; every method that returns
+    students hands out plain dicts, so callers and file writers are unchanged.
+    """
+    
+    def __init__(self, students: Iterable[Dict] = ()):
+        """
+        Initialize the store
+        
+        Args:
+            students: Optional initial student records
+        """
+        self.load(students)
+    
+    def load(self, students: Iterable[Dict]) -> None:
+        """Replace the store contents with the given student records"""
+        self._records = {}
+        self._position = {}
+        self._next_position = 0
+        self._by_grade = {}
+        self._by_age = {}
+        self._by_gram = {}
+        self._fuzzy = FuzzyNameIndex()
+        # Cached ID order per sort field, dropped on every change
+        self._sorted_ids = {}
+        for student in students:
+            self.add(student)
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return (record.to_dict() for record in self._records.values())
+    
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._records
+    
+    def get(self, student_id: str) -> Optional[Dict]:
+        """Return the student with the given ID, or None (O(1))"""
+        record = self._records.get(student_id)
+        return None if record is None else record.to_dict()
+    
+    def add(self, student: Dict) -> bool:
+        """
+        Add a student record
+        
+        Returns:
+            bool: True if added, False if the student ID already exists
+        """
+        student_id = student['student_id']
+        if student_id in self._records:
+            return False
+        record = StudentRecord.from_dict(student)
+        self._records[student_id] = record
+        self._sorted_ids.clear()
+        self._position[student_id] = self._next_position
+        self._next_position += 1
+        self._index(record)
+        return True
+    
+    def add_many(self, students: Iterable[Dict]) -> int:
+        """
+        Add several students, skipping existing IDs
+        
+        Returns:
+            int: Number of students actually added
+        """
+        return sum(1 for student in students if self.add(student))
+    
+    def update(self, student_id: str, changes: Dict) -> Optional[Dict]:
+        """
+        Apply field changes to a student and refresh its index entries
+        
+        Returns:
+            The updated record, or None if the student was not found
+        """
+        record = self._records.get(student_id)
+        if record is None:
+            return None
+        self._unindex(record)
+        self._sorted_ids.clear()
+        record.update(changes)
+        self._index(record)
+        return record.to_dict()
+    
+    def remove(self, student_id: str) -> Optional[Dict]:
+        """Remove and return the student with the given ID, or None"""
+        record = self._records.pop(student_id, None)
+        if record is None:
+            return None
+        del self._position[student_id]
+        self._sorted_ids.clear()
+        self._unindex(record)
+        return record.to_dict()
+    
+    def reorder(self, sort_by: str) -> None:
+        """Reorder records in place by a sort field ('name', 'age' or 'grade')"""
+        ordered = sorted(self._records.values(), key=SORT_KEYS[sort_by])
+        self._records = {s['student_id']: s for s in ordered}
+        self._position = {s['student_id']: i for i, s in enumerate(ordered)}
+        self._next_position = len(ordered)
+        self._sorted_ids.clear()
+    
+    def iter_sorted(self, sort_by: Optional[str] = None, offset: int = 0,
+                    limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield students ordered by a sort field (store order if None)
+        
+        The sorted ID list is built once per field and reused until the next
+        change, so paging through a large roster does not re-sort it.
+        """
+        end = None if limit is None else offset + limit
+        if sort_by is None:
+            return (record.to_dict() for record in islice(self._records.values(), offset, end))
+        ordered_ids = self._sorted_ids.get(sort_by)
+        if ordered_ids is None:
+            key = SORT_KEYS[sort_by]
+            ordered_ids = sorted(self._records, key=lambda student_id: key(self._records[student_id]))
+            self._sorted_ids[sort_by] = ordered_ids
+        return (self._records[student_id].to_dict() for student_id in ordered_ids[offset:end])
+    
+    def search(self, search_term: str) -> List[Dict]:
+        """
+        Find students whose ID or name contains search_term (case-insensitive)
+        
+        Matches are returned in store order, like a full scan would.
+        """
+        term = search_term.lower()
+        if not term:
+            return list(self)
+        
+        if len(term) < GRAM_SIZE:
+            return [record.to_dict() for record in self._records.values()
+                    if term in self._search_key(record)]
+        
+        postings = []
+        for gram in _grams(term):
+            posting = self._by_gram.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        candidates = {
+            student_id for student_id in candidates
+            if term in self._search_key(self._records[student_id])
+        }
+        
+        return self._in_order(candidates)
+    
+    def fuzzy_search(self, query: str, limit: int = 10,
+                     min_score: float = 0.2) -> List[Tuple[Dict, float]]:
+        """Return up to `limit` (student, score) pairs whose names resemble query"""
+        matches = self._fuzzy.search(query, limit, min_score)
+        return [(self._records[student_id].to_dict(), score) for student_id, score in matches]
+    
+    def find_by_grade(self, grade: str) -> List[Dict]:
+        """Return all students with the given grade"""
+        return self._in_order(self._by_grade.get(grade, set()))
+    
+    def find_by_age(self, min_age: int, max_age: Optional[int] = None) -> List[Dict]:
+        """Return all students whose age is within [min_age, max_age]"""
+        if max_age is None:
+            max_age = min_age
+        matches = set()
+        for age, ids in self._by_age.items():
+            if min_age <= age <= max_age:
+                matches.update(ids)
+        return self._in_order(matches)
+    
+    def _in_order(self, student_ids: Iterable[str]) -> List[Dict]:
+        ordered = sorted(student_ids, key=self._position.__getitem__)
+        return [self._records[student_id].to_dict() for student_id in ordered]
+    
+    @staticmethod
+    def _search_key(student: Dict) -> str:
+        # The newline keeps n-grams from spanning the ID/name boundary
+        return f"{str(student['student_id']).lower()}\n{student['name'].lower()}"
+    
+    def _index_grams(self, student: Dict) -> Set[str]:
+        return {gram for gram in _grams(self._search_key(student)) if '\n' not in gram}
+    
+    def _index(self, student: Dict) -> None:
+        student_id = student['student_id']
+        self._by_grade.setdefault(student['grade'], set()).add(student_id)
+        self._by_age.setdefault(student['age'], set()).add(student_id)
+        self._fuzzy.add(student_id, student['name'])
+        by_gram = self._by_gram
+        for gram in self._index_grams(student):
+            ids = by_gram.get(gram)
+            if ids is None:
+                by_gram[gram] = {student_id}
+            else:
+                ids.add(student_id)
+    
+    def _unindex(self, student: Dict) -> None:
+        student_id = student['student_id']
+        self._discard(self._by_grade, student['grade'], student_id)
+        self._discard(self._by_age, student['age'], student_id)
+        self._fuzzy.remove(student_id, student['name'])
+        for gram in self._index_grams(student):
+            self._discard(self._by_gram, gram, student_id)
+    
+    @staticmethod
+    def _discard(index: Dict, key, student_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(student_id)
+            if not ids:
+                del index[key]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Validation rules for Student Record Manager
+One set of Config-driven checks shared by interactive input and bulk imports
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import Config
+
+
+EMAIL_PATTERN = re.compile(Config.EMAIL_PATTERN)
+
+FIELD_LABELS = {
+    'student_id': 'Student ID',
+    'name': 'Name',
+    'age': 'Age',
+    'grade': 'Grade',
+    'email': 'Email',
+}
+
+
+class RowError(NamedTuple):
+    """Validation problems found in one imported row"""
+    row: int
+    student_id: str
+    errors: List[str]
+
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def validate_field(field: str, value) -> Optional[str]:
+    """
+    Check a single student field
+    
+    Args:
+        field: Field name, e.g. 'age' or 'email'
+        value: Value to check (age must already be an int)
+    
+    Returns:
+        An error message, or None if the value is valid
+    """
+    if _is_blank(value):
+        return f"{FIELD_LABELS.get(field, field)} cannot be empty!"
+    if field == 'age':
+        if not isinstance(value, int) or isinstance(value, bool):
+            return "Age must be a whole number!"
+        if not Config.MIN_AGE <= value <= Config.MAX_AGE:
+            return f"Age must be between {Config.MIN_AGE} and {Config.MAX_AGE}!"
+    elif field == 'email' and not (isinstance(value, str) and EMAIL_PATTERN.match(value)):
+        return "Invalid email format!"
+    return None
+
+
+def validate_student(student: Dict) -> List[str]:
+    """Return every validation error for a student record (empty if valid)"""
+    errors = []
+    for field in Config.REQUIRED_FIELDS:
+        error = validate_field(field, student.get(field))
+        if error:
+            errors.append(error)
+    return errors
+
+
+def validate_batch(students: Iterable[Dict], start: int = 0) -> Tuple[List[Dict], List[RowError]]:
+    """
+    Split a batch of imported records into valid rows and per-row errors
+    
+    Each rule is applied as one pass over the whole batch, with the email
+    pattern compiled once and the age range checked against a prebuilt set,
+    so validating a large import costs little next to parsing it.
+    
+    Args:
+        students: Records to check
+        start: Row number of the first record, for error reports
+    
+    Returns:
+        Tuple of (valid records, RowError for each rejected record)
+    """
+    students = list(students)
+    problems = [[] for _ in students]
+    
+    for field in Config.REQUIRED_FIELDS:
+        message = f"{FIELD_LABELS.get(field, field)} cannot be empty!"
+        for errors, student in zip(problems, students):
+            if _is_blank(student.get(field)):
+                errors.append(message)
+    
+    valid_ages = frozenset(range(Config.MIN_AGE, Config.MAX_AGE + 1))
+    age_message = f"Age must be between {Config.MIN_AGE} and {Config.MAX_AGE}!"
+    for errors, student in zip(problems, students):
+        age = student.get('age')
+        if _is_blank(age):
+            continue
+        if type(age) is not int:
+            errors.append("Age must be a whole number!")
+        elif age not in valid_ages:
+            errors.append(age_message)
+    
+    match_email = EMAIL_PATTERN.match
+    for errors, student in zip(problems, students):
+        email = student.get('email')
+        if _is_blank(email):
+            continue
+        if not isinstance(email, str) or not match_email(email):
+            errors.append("Invalid email format!")
+    
+    valid = []
+    rejected = []
+    for row, (errors, student) in enumerate(zip(problems, students), start):
+        if errors:
+            rejected.append(RowError(row, str(student.get('student_id', '')), errors))
+        else:
+            valid.append(student)
+    return valid, rejected
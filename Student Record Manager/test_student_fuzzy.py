@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for fuzzy name search
+The trigram index must rank exactly like scoring every student would
+"""
+
+import random
+
+import pytest
+
+import run
+from student_fuzzy import name_trigrams, similarity
+from student_manager import StudentRecordManager
+from student_sqlite import SQLiteStudentStore
+from student_store import StudentStore
+
+
+FIRST = ["Alice", "Alicia", "Alison", "Bob", "Robert", "Roberta", "Carol", "Caroline", "David", "Dave"]
+LAST = ["Johnson", "Jonson", "Smith", "Smyth", "Davis", "Davies", "Wilson", "Willson"]
+
+
+def make_students(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [{
+        "student_id": f"S{i:04d}",
+        "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+        "age": 18,
+        "grade": "A",
+        "email": f"s{i}@example.com"
+    } for i in range(count)]
+
+
+def scan(students, query: str, limit: int, min_score: float):
+    """Score every student and keep the best, ties broken by ID"""
+    query_grams = name_trigrams(query)
+    scored = []
+    for student in students:
+        grams = name_trigrams(student["name"])
+        score = similarity(len(query_grams & grams), len(query_grams), len(grams))
+        if score >= min_score:
+            scored.append((student["student_id"], score))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:limit]
+
+
+QUERIES = ["Alice Jonson", "robrt smith", "Carolin Davis", "dave", "Xavier Quinn", ""]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    students = make_students(600)
+    if request.param == "memory":
+        yield StudentStore(students)
+        return
+    database = SQLiteStudentStore(str(tmp_path / "students.db"))
+    database.load(students)
+    yield database
+    database.close()
+
+
+def test_ranking_matches_full_scan(store):
+    for limit in (1, 10, 1000):
+        for query in QUERIES:
+            found = [(student["student_id"], score) for student, score in store.fuzzy_search(query, limit, 0.2)]
+            expected = scan(list(store), query, limit, 0.2)
+            assert [student_id for student_id, _ in found] == [student_id for student_id, _ in expected], query
+            assert [score for _, score in found] == pytest.approx([score for _, score in expected])
+
+
+def test_index_follows_renames_and_removals(store):
+    store.update("S0001", {"name": "Zebedee Quartermaine"})
+    store.remove("S0002")
+    assert store.fuzzy_search("Zebede Quartermain", 1)[0][0]["student_id"] == "S0001"
+    for query in QUERIES:
+        assert ([student["student_id"] for student, _ in store.fuzzy_search(query, 50, 0.2)] ==
+                [student_id for student_id, _ in scan(list(store), query, 50, 0.2)])
+
+
+def test_run_fuzzy_search_reports_every_match(tmp_path, capsys):
+    """Totals and page counts cover all matches, not just the page shown"""
+    data_file = str(tmp_path / "students.json")
+    manager = StudentRecordManager(data_file, "json")
+    manager.store.load(make_students(600))
+    manager.save_data()
+    total = len(manager.fuzzy_search("Alice Jonson", limit=len(manager.store)))
+    manager.close()
+    assert total > 20
+    
+    for page in (1, 2, total // 10 + 2):
+        argv = ["--file", data_file, "search", "Alice Jonson", "--fuzzy", "--page", str(page), "--page-size", "10"]
+        assert run.run_command(argv) == 0
+        output = capsys.readouterr().out
+        assert f"Page {page} of {-(-total // 10)} ({total} records)" in output
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming student import/export
+Files are read and written a record at a time and must round-trip exactly
+"""
+
+import io
+import json
+
+import pytest
+
+from student_io import _iter_json_array, iter_records, write_records
+
+
+STUDENTS = [{
+    "student_id": f"S{i}",
+    "name": name,
+    "age": 18 + i,
+    "grade": "A",
+    "email": f"s{i}@example.com"
+} for i, name in enumerate(["Alice Johnson", "Bob [the] Builder", "Zoë, \"Z\" Ångström", "}{ Tricky ]"])]
+
+
+class CountingReader(io.StringIO):
+    """A file that remembers how many characters have been read from it"""
+    
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.consumed = 0
+    
+    def read(self, size: int = -1) -> str:
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_json_array_decodes_across_chunk_boundaries(chunk_size):
+    """Any chunk size gives the same records as json.loads"""
+    for text in (json.dumps(STUDENTS, indent=2, ensure_ascii=False), json.dumps(STUDENTS), "[]", "  [ ]"):
+        assert list(_iter_json_array(io.StringIO(text), chunk_size)) == json.loads(text)
+
+
+def test_json_array_is_read_lazily():
+    """The first record is available before the rest of the file is read"""
+    students = STUDENTS * 500
+    reader = CountingReader(json.dumps(students, indent=2))
+    records = _iter_json_array(reader, chunk_size=1024)
+    assert next(records) == students[0]
+    assert reader.consumed <= 2048
+    assert list(records) == students[1:]
+
+
+def test_json_array_rejects_other_documents():
+    with pytest.raises(ValueError):
+        list(_iter_json_array(io.StringIO('{"student_id": "S1"}')))
+    with pytest.raises(ValueError):
+        # Truncated mid-record
+        list(_iter_json_array(io.StringIO(json.dumps(STUDENTS)[:-20]), chunk_size=8))
+
+
+@pytest.mark.parametrize("file_format", ["json", "jsonl", "csv", "sqlite"])
+def test_round_trip(tmp_path, file_format):
+    """Whatever write_records writes, iter_records reads back unchanged"""
+    filename = str(tmp_path / f"students.{file_format}")
+    assert write_records(filename, iter(STUDENTS), file_format) == len(STUDENTS)
+    assert list(iter_records(filename, file_format)) == STUDENTS
+    
+    assert write_records(filename, iter(()), file_format) == 0
+    assert list(iter_records(filename, file_format)) == []
+
+
+def test_json_layout_matches_json_dump(tmp_path):
+    """Batched writing produces the same file as json.dump(indent=2)"""
+    filename = tmp_path / "students.json"
+    students = STUDENTS * 700
+    write_records(str(filename), students, "json")
+    assert filename.read_text(encoding="utf-8") == json.dumps(students, indent=2, ensure_ascii=False)
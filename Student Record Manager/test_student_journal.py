@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the student journal
+A crash mid-write must cost at most the entry being written
+"""
+
+import json
+import os
+
+from student_journal import StudentJournal
+from student_manager import StudentRecordManager
+
+
+def test_replay_returns_entries_in_order(tmp_path):
+    """Entries survive closing and reopening the journal"""
+    path = str(tmp_path / "students.journal")
+    journal = StudentJournal(path, fsync=False)
+    journal.append("add", student={"student_id": "1", "name": "Alice"})
+    journal.append("delete", student_id="1")
+    journal.close()
+    
+    journal = StudentJournal(path, fsync=False)
+    try:
+        assert [entry["op"] for entry in journal.replay()] == ["add", "delete"]
+    finally:
+        journal.close()
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    """A torn final line is cut off, and later appends start on a clean line"""
+    path = tmp_path / "students.journal"
+    complete = json.dumps({"op": "delete", "student_id": "1"}) + "\n"
+    path.write_bytes(complete.encode() + b'{"op": "add", "stud')
+    
+    journal = StudentJournal(str(path), fsync=False)
+    try:
+        assert list(journal.replay()) == [{"op": "delete", "student_id": "1"}]
+        assert path.read_bytes() == complete.encode()
+        journal.append("delete", student_id="2")
+    finally:
+        journal.close()
+    
+    journal = StudentJournal(str(path), fsync=False)
+    try:
+        assert [entry["student_id"] for entry in journal.replay()] == ["1", "2"]
+    finally:
+        journal.close()
+
+
+def test_compact_syncs_the_snapshot_before_truncating(tmp_path, monkeypatch):
+    """The journal is emptied only once the snapshot and its rename are on disk"""
+    data_file = str(tmp_path / "students.json")
+    manager = StudentRecordManager(data_file, "json", journal=True)
+    assert manager.add_student("S1", "Alice Johnson", 20, "A", "alice@example.com")
+    
+    events = []
+    fsync, replace, truncate = os.fsync, os.replace, manager.journal.truncate
+    monkeypatch.setattr(os, "fsync", lambda fd: (events.append("fsync"), fsync(fd))[1])
+    monkeypatch.setattr(os, "replace", lambda src, dst: (events.append("replace"), replace(src, dst))[1])
+    monkeypatch.setattr(manager.journal, "truncate", lambda: (events.append("truncate"), truncate())[1])
+    manager.compact()
+    # Snapshot file, rename (directory), then the journal itself
+    assert events == ["fsync", "replace", "fsync", "truncate", "fsync"]
+    manager.close()
+    
+    reopened = StudentRecordManager(data_file, "json", journal=True)
+    try:
+        assert len(reopened.journal) == 0
+        assert reopened.store.get("S1")["name"] == "Alice Johnson"
+    finally:
+        reopened.close()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for paginated student views
+Pages must cut the same sorted sequence a full sort would give
+"""
+
+import pytest
+
+import run
+from student_manager import StudentRecordManager
+from student_store import SORT_KEYS
+
+
+def make_students(count: int):
+    """Students with many equal ages and grades, so ties are exercised"""
+    return [{
+        "student_id": f"S{i:03d}",
+        "name": f"Student {(i * 37) % count:03d}",
+        "age": 16 + i % 5,
+        "grade": "ABCDF"[i % 5 - 1],
+        "email": f"s{i}@example.com"
+    } for i in range(count)]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, tmp_path):
+    extension = "db" if request.param == "sqlite" else request.param
+    manager = StudentRecordManager(str(tmp_path / f"students.{extension}"), request.param)
+    manager.store.load(make_students(53))
+    manager.save_data()
+    yield manager
+    manager.close()
+
+
+@pytest.mark.parametrize("sort_by", [None, "name", "age", "grade"])
+def test_pages_cut_the_sorted_roster(manager, sort_by):
+    """get_page and iter_pages agree with a stable sort of every record"""
+    students = make_students(53)
+    expected = sorted(students, key=SORT_KEYS[sort_by]) if sort_by else students
+    
+    pages = [manager.get_page(page, 10, sort_by) for page in range(1, 8)]
+    assert [len(page) for page in pages] == [10, 10, 10, 10, 10, 3, 0]
+    assert [student for page in pages for student in page] == expected
+    assert list(manager.iter_pages(sort_by, 10)) == pages[:6]
+    assert manager.get_page(0, 10, sort_by) == pages[0]
+
+
+def test_run_list_prints_one_page(manager, capsys):
+    """The scripted list command prints just the requested page and the totals"""
+    argv = ["--file", manager.data_file, "--format", manager.file_format,
+            "list", "--sort", "age", "--page", "2", "--page-size", "20"]
+    assert run.run_command(argv) == 0
+    output = capsys.readouterr().out
+    page = manager.get_page(2, 20, "age")
+    assert all(student["student_id"] in output for student in page)
+    assert sum(line.startswith("S0") for line in output.splitlines()) == 20
+    assert "Page 2 of 3 (53 records)" in output
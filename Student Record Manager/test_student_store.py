@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed student stores
+Every indexed lookup must return what a plain scan of the records would
+"""
+
+import json
+import random
+import tracemalloc
+
+from student_manager import StudentRecordManager
+from student_sqlite import SQLiteStudentStore
+from student_store import StudentRecord, StudentStore
+
+
+NAMES = ["Alice Johnson", "Bob Smith", "Carol Davis", "David Wilson", "Eve Anderson",
+         "Frank Miller", "Grace Lee", "Heidi Ali", "Ivan Petrov", "Judy Moore"]
+
+
+def make_students(count: int, seed: int = 7):
+    """Generate students with repeated names, grades and ages"""
+    rng = random.Random(seed)
+    return [{
+        "student_id": f"S{i:05d}",
+        "name": f"{rng.choice(NAMES)} {i % 37}",
+        "age": rng.randint(15, 25),
+        "grade": rng.choice(["A", "B", "C", "D", "F"]),
+        "email": f"student{i}@example.com"
+    } for i in range(count)]
+
+
+def scan(students, term: str):
+    """The search the indexes replace: a substring test on every ID and name"""
+    term = term.lower()
+    return [s for s in students if term in s["student_id"].lower() or term in s["name"].lower()]
+
+
+TERMS = ["", "a", "Al", "ali", "son", "SMITH", "s0001", "n 1", "e a", "zzz", "david wilson 3"]
+
+
+def test_search_matches_linear_scan():
+    """Short and long terms, before and after updates and removals"""
+    students = make_students(2000)
+    store = StudentStore(students)
+    for term in TERMS:
+        assert store.search(term) == scan(students, term), term
+    
+    store.update("S00010", {"name": "Alison Brook"})
+    store.remove("S00011")
+    store.add({"student_id": "X1", "name": "Ali Baba", "age": 20, "grade": "B", "email": "x@example.com"})
+    expected = list(store)
+    for term in TERMS + ["alison", "baba", "x1"]:
+        assert store.search(term) == scan(expected, term), term
+
+
+def test_secondary_indexes_match_linear_scan():
+    """Grade and age lookups keep store order"""
+    students = make_students(1000)
+    store = StudentStore(students)
+    assert store.find_by_grade("B") == [s for s in students if s["grade"] == "B"]
+    assert store.find_by_age(18, 20) == [s for s in students if 18 <= s["age"] <= 20]
+    assert store.get("S00042") == students[42]
+
+
+def test_slotted_records_hold_less_memory_than_dicts():
+    """The same students parsed from JSON, kept as dicts and as records"""
+    text = json.dumps(make_students(2000))
+    
+    def held(build):
+        tracemalloc.start()
+        try:
+            kept = build()
+            return tracemalloc.get_traced_memory()[0], kept
+        finally:
+            tracemalloc.stop()
+    
+    dict_bytes, dicts = held(lambda: json.loads(text))
+    record_bytes, records = held(lambda: [StudentRecord.from_dict(s) for s in json.loads(text)])
+    assert [record.to_dict() for record in records] == dicts
+    assert record_bytes < dict_bytes * 0.8
+
+
+def test_sqlite_store_matches_memory_store(tmp_path):
+    """Both backends answer every query the same way"""
+    students = make_students(1000)
+    memory = StudentStore(students)
+    database = SQLiteStudentStore(str(tmp_path / "students.db"))
+    try:
+        database.load(students)
+        for term in TERMS:
+            assert database.search(term) == memory.search(term), term
+        assert database.find_by_grade("C") == memory.find_by_grade("C")
+        assert database.find_by_age(16, 17) == memory.find_by_age(16, 17)
+        assert list(database.iter_sorted("name", 10, 20)) == list(memory.iter_sorted("name", 10, 20))
+        
+        for store in (memory, database):
+            store.update("S00003", {"grade": "A", "age": 30})
+            store.remove("S00004")
+        assert list(database) == list(memory)
+    finally:
+        database.close()
+    
+    # Everything was committed as it happened
+    reopened = SQLiteStudentStore(str(tmp_path / "students.db"))
+    try:
+        assert list(reopened) == list(memory)
+    finally:
+        reopened.close()
+
+
+def test_sqlite_manager_exports_without_touching_the_live_database(tmp_path):
+    """Exporting to the database in use is a no-op; other targets get a full copy"""
+    data_file = str(tmp_path / "students.db")
+    manager = StudentRecordManager(data_file, "sqlite")
+    try:
+        manager.store.load(make_students(50))
+        assert manager.export_to_format("sqlite", data_file)
+        assert len(manager.store) == 50
+        
+        copy = str(tmp_path / "copy.db")
+        assert manager.export_to_format("sqlite", copy)
+        exported = SQLiteStudentStore(copy)
+        try:
+            assert list(exported) == list(manager.store)
+        finally:
+            exported.close()
+    finally:
+        manager.close()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared student validator
+Batch checks must reject exactly what the per-record checks reject
+"""
+
+import csv
+
+from config import Config
+from student_manager import StudentRecordManager
+from student_validation import RowError, validate_batch, validate_field, validate_student
+
+
+FIELDS = ['student_id', 'name', 'age', 'grade', 'email']
+
+
+def student(i: int, **changes):
+    record = {"student_id": f"S{i:03d}", "name": f"Student {i}", "age": 18,
+              "grade": "B", "email": f"s{i}@example.com"}
+    record.update(changes)
+    return record
+
+
+STUDENTS = [
+    student(1),
+    student(2, age=0),
+    student(3, age=151),
+    student(4, age="twenty"),
+    student(5, age=True),
+    student(6, email="not-an-email"),
+    student(7, name="   "),
+    student(8, grade=None, email="a b@example.com"),
+    student(9, age=Config.MAX_AGE),
+    {"student_id": "S010", "name": "No Email", "age": 20, "grade": "A"},
+]
+
+
+def test_batch_matches_per_record_checks():
+    """Same rows rejected with the same messages, numbered from start"""
+    valid, rejected = validate_batch(STUDENTS, start=5)
+    assert valid == [s for s in STUDENTS if not validate_student(s)]
+    assert rejected == [RowError(row, s["student_id"], validate_student(s))
+                        for row, s in enumerate(STUDENTS, 5) if validate_student(s)]
+    assert [s["student_id"] for s in valid] == ["S001", "S009"]
+
+
+def test_rules_follow_config(monkeypatch):
+    """Changing the configured range changes both validators"""
+    monkeypatch.setattr(Config, "MAX_AGE", 30)
+    assert validate_field("age", 31) == "Age must be between 1 and 30!"
+    assert validate_field("age", 30) is None
+    valid, rejected = validate_batch([student(1, age=31), student(2, age=30)])
+    assert [s["student_id"] for s in valid] == ["S002"]
+    assert rejected == [RowError(0, "S001", ["Age must be between 1 and 30!"])]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_import_skips_and_reports_invalid_rows(tmp_path, monkeypatch):
+    """Rows are numbered across chunks; the valid ones are imported"""
+    monkeypatch.setattr(Config, "IMPORT_CHUNK_SIZE", 3)
+    rows = [student(i, age=18 if i % 4 else "x") for i in range(1, 11)]
+    write_csv(tmp_path / "import.csv", rows)
+    
+    manager = StudentRecordManager(str(tmp_path / "students.json"))
+    assert manager.import_from_file(str(tmp_path / "import.csv"), progress=lambda *_: None)
+    assert [s["student_id"] for s in manager.store] == [r["student_id"] for r in rows if r["age"] == 18]
+    assert [(e.row, e.student_id) for e in manager.import_errors] == [(4, "S004"), (8, "S008")]
+
+
+def test_load_sets_aside_rows_with_a_bad_age(tmp_path):
+    """A hand-edited CSV with a text age still loads and sorts"""
+    write_csv(tmp_path / "students.csv", [student(1, age=20), student(2, age="?"), student(3, age=19)])
+    
+    manager = StudentRecordManager(str(tmp_path / "students.csv"), "csv")
+    assert [s["student_id"] for s in manager.store] == ["S001", "S003"]
+    assert manager.load_errors == [RowError(2, "S002", ["Age must be a whole number!"])]
+    assert [s["student_id"] for s in manager.get_page(1, sort_by="age")] == ["S003", "S001"]
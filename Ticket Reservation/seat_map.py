@@ -0,0 +1,78 @@
+"""
+Seat map for the Ticket Reservation System.
+"""
+import base64
+import heapq
+
+
+class SeatMap:
+    """Free seats of one transport as a bit per seat, plus a heap of free seats.
+
+    Seat n is bit (n - 1) of the bytearray, set while the seat is free, so
+    checking, taking and releasing a seat is one byte operation. The heap
+    hands out the lowest free seat; entries for seats taken directly are
+    skipped when they reach the top instead of being searched for.
+    """
+
+    def __init__(self, total_seats, free_seats=None):
+        self.total_seats = total_seats
+        self.bits = bytearray((total_seats + 7) // 8)
+        if free_seats is None:
+            free_seats = range(1, total_seats + 1)
+        self.available = 0
+        for seat in free_seats:
+            if self._in_range(seat) and not self.is_free(seat):
+                self.bits[(seat - 1) >> 3] |= 1 << ((seat - 1) & 7)
+                self.available += 1
+        self._rebuild_heap()
+
+    @classmethod
+    def from_string(cls, total_seats, packed):
+        seat_map = cls(total_seats, ())
+        bits = base64.b64decode(packed)
+        seat_map.bits[:len(bits)] = bits[:len(seat_map.bits)]
+        seat_map.available = sum(bin(byte).count("1") for byte in seat_map.bits)
+        seat_map._rebuild_heap()
+        return seat_map
+
+    def to_string(self):
+        # 4 characters per 24 seats instead of a JSON list of seat numbers
+        return base64.b64encode(bytes(self.bits)).decode('ascii')
+
+    def _in_range(self, seat):
+        return isinstance(seat, int) and 1 <= seat <= self.total_seats
+
+    def _rebuild_heap(self):
+        # Ascending order is already a valid heap
+        self.heap = list(self.free_seats())
+
+    def is_free(self, seat):
+        return self._in_range(seat) and bool(self.bits[(seat - 1) >> 3] >> ((seat - 1) & 7) & 1)
+
+    def take(self, seat):
+        if not self.is_free(seat):
+            return False
+        self.bits[(seat - 1) >> 3] &= ~(1 << ((seat - 1) & 7))
+        self.available -= 1
+        return True
+
+    def release(self, seat):
+        if not self._in_range(seat) or self.is_free(seat):
+            return False
+        self.bits[(seat - 1) >> 3] |= 1 << ((seat - 1) & 7)
+        self.available += 1
+        # Stale entries pile up when seats are taken directly; start over
+        # once they outnumber the seats
+        if len(self.heap) >= 2 * self.total_seats:
+            self._rebuild_heap()
+        else:
+            heapq.heappush(self.heap, seat)
+        return True
+
+    def next_free(self):
+        while self.heap and not self.is_free(self.heap[0]):
+            heapq.heappop(self.heap)
+        return self.heap[0] if self.heap else None
+
+    def free_seats(self):
+        return (seat for seat in range(1, self.total_seats + 1) if self.is_free(seat))
@@ -0,0 +1,60 @@
+"""
+Tests for the seat map of the Ticket Reservation System.
+"""
+import json
+import random
+
+from seat_map import SeatMap
+from ticket_reservation import TicketReservationSystem
+
+
+def test_round_trip_keeps_taken_and_released_seats():
+    rng = random.Random(5)
+    for total_seats in (1, 7, 8, 9, 50, 301):
+        seats = SeatMap(total_seats)
+        free = set(range(1, total_seats + 1))
+        for _ in range(3 * total_seats):
+            seat = rng.randint(0, total_seats + 1)
+            if rng.random() < 0.6:
+                assert seats.take(seat) == (seat in free)
+                free.discard(seat)
+            else:
+                assert seats.release(seat) == (1 <= seat <= total_seats and seat not in free)
+                if 1 <= seat <= total_seats:
+                    free.add(seat)
+            assert seats.next_free() == (min(free) if free else None)
+
+            restored = SeatMap.from_string(total_seats, seats.to_string())
+            assert list(restored.free_seats()) == sorted(free)
+            assert restored.available == seats.available == len(free)
+            assert restored.next_free() == seats.next_free()
+
+
+def test_taking_every_seat_in_order():
+    seats = SeatMap(20, free_seats=[3, 1, 20, 99, 1])
+    assert seats.available == 3
+    taken = []
+    while seats.next_free() is not None:
+        taken.append(seats.next_free())
+        assert seats.take(taken[-1])
+    assert taken == [1, 3, 20]
+    assert not seats.is_free(0) and not seats.is_free(21)
+
+
+def test_free_seat_lists_saved_before_seat_maps_still_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transport = {'transport_type': 'bus', 'number': '12', 'source': 'A', 'destination': 'B',
+                 'departure_time': '2030-01-01 08:00', 'arrival_time': '2030-01-01 10:00',
+                 'total_seats': 5, 'fare': 10.0, 'available_seats': [1, 2, 4, 5],
+                 'booked_seats': {'3': {'booking_id': 'BUS12-OLD', 'seat_number': 3}}}
+    with open('transport_data.json', 'w') as f:
+        json.dump({'B12': transport}, f)
+
+    system = TicketReservationSystem()
+    assert list(system.transports['B12'].seats.free_seats()) == [1, 2, 4, 5]
+    system.save_data()
+    with open('transport_data.json') as f:
+        saved = json.load(f)['B12']
+    assert 'available_seats' not in saved
+    assert list(TicketReservationSystem().transports['B12'].seats.free_seats()) == [1, 2, 4, 5]
+    assert list(SeatMap.from_string(5, saved['seat_map']).free_seats()) == [1, 2, 4, 5]
@@ -0,0 +1,58 @@
+"""
+Tests for booking IDs and the booking index of the Ticket Reservation System.
+"""
+import json
+
+from ticket_reservation import TicketReservationSystem
+
+PASSENGER = {'name': "Alice", 'age': 30, 'gender': "F", 'contact': "555-0100"}
+
+
+def open_system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system = TicketReservationSystem()
+    system.add_transport('bus', '12', 'A', 'B', '2030-01-01 08:00', '2030-01-01 10:00', 3, 10.0)
+    system.add_transport('train', '7', 'A', 'B', '2030-01-01 09:00', '2030-01-01 11:00', 40, 25.0)
+    return system
+
+
+def test_booking_ids_are_unique_and_indexed(tmp_path, monkeypatch):
+    system = open_system(tmp_path, monkeypatch)
+    ids = []
+    for transport_id, seat in [('B12', None), ('B12', 3), ('T7', 1), ('B12', None), ('T7', None)]:
+        success, booking = system.book_ticket(transport_id, seat, PASSENGER)
+        assert success
+        ids.append(booking['booking_id'])
+    assert ids == ["BUS12-1", "BUS12-2", "TRAIN7-1", "BUS12-3", "TRAIN7-2"]
+    assert not system.book_ticket('B12', None, PASSENGER)[0]
+    assert system.get_booking_status("BUS12-2")['seat_number'] == 3
+
+    assert system.cancel_ticket("BUS12-2") == (True, "Booking cancelled successfully")
+    assert system.cancel_ticket("BUS12-2") == (False, "Booking not found")
+    assert system.get_booking_status("BUS12-2") is None
+    # A freed seat gets a new ID, never the cancelled one
+    assert system.book_ticket('B12', None, PASSENGER)[1]['booking_id'] == "BUS12-4"
+
+    reloaded = TicketReservationSystem()
+    assert reloaded.bookings == system.bookings
+    assert sorted(reloaded.bookings) == ["BUS12-1", "BUS12-3", "BUS12-4", "TRAIN7-1", "TRAIN7-2"]
+    assert reloaded.book_ticket('T7', None, PASSENGER)[1]['booking_id'] == "TRAIN7-3"
+
+
+def test_repeated_old_ids_resolve_to_the_first_booking(tmp_path, monkeypatch):
+    system = open_system(tmp_path, monkeypatch)
+    system.book_ticket('B12', 1, PASSENGER)
+    system.book_ticket('T7', 5, PASSENGER)
+    with open('transport_data.json') as f:
+        data = json.load(f)
+    # Random IDs from before the index could repeat across transports
+    data['B12']['booked_seats']['1']['booking_id'] = "BUS12001123"
+    data['T7']['booked_seats']['5']['booking_id'] = "BUS12001123"
+    with open('transport_data.json', 'w') as f:
+        json.dump(data, f)
+
+    system = TicketReservationSystem()
+    assert system.bookings == {"BUS12001123": ('B12', 1)}
+    assert system.cancel_ticket("BUS12001123")[0]
+    assert system.transports['B12'].is_seat_available(1)
+    assert not system.transports['T7'].is_seat_available(5)
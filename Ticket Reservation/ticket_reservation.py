@@ -1,7 +1,8 @@
 import json
 import os
 from datetime import datetime, timedelta
-import random
+
+from seat_map import SeatMap
 
 class Transport:
     def __init__(self, transport_type, number, source, destination, departure_time, arrival_time, total_seats, fare):
@@ -12,18 +13,26 @@ class Transport:
         self.departure_time = departure_time
         self.arrival_time = arrival_time
         self.total_seats = total_seats
-        self.available_seats = list(range(1, total_seats + 1))
+        self.seats = SeatMap(total_seats)
         self.booked_seats = {}  # seat_number: booking_details
         self.fare = fare
+        # Sequence number of the next booking ID, which is "<TYPE><number>-<n>"
+        self.next_booking = 1
     
     def is_seat_available(self, seat_number):
-        return seat_number in self.available_seats
+        return self.seats.is_free(seat_number)
     
     def book_seat(self, seat_number, passenger_name, passenger_age, passenger_gender, contact_number):
-        if not self.is_seat_available(seat_number):
+        # No seat number means the lowest free seat
+        if seat_number is None:
+            seat_number = self.seats.next_free()
+            if seat_number is None:
+                return False, "No seats available"
+        if not self.seats.take(seat_number):
             return False, "Seat not available"
         
-        booking_id = f"{self.transport_type.upper()}{self.number}{seat_number:03d}{random.randint(100, 999)}"
+        booking_id = f"{self.transport_type.upper()}{self.number}-{self.next_booking}"
+        self.next_booking += 1
         booking_details = {
             'booking_id': booking_id,
             'passenger_name': passenger_name,
@@ -37,16 +46,19 @@ class Transport:
         }
         
         self.booked_seats[seat_number] = booking_details
-        self.available_seats.remove(seat_number)
         return True, booking_details
     
+    def cancel_seat(self, seat_number):
+        if seat_number not in self.booked_seats:
+            return False, "Booking not found"
+        self.seats.release(seat_number)
+        del self.booked_seats[seat_number]
+        return True, "Booking cancelled successfully"
+    
     def cancel_booking(self, booking_id):
         for seat_number, booking in self.booked_seats.items():
             if booking['booking_id'] == booking_id:
-                self.available_seats.append(seat_number)
-                self.available_seats.sort()
-                del self.booked_seats[seat_number]
-                return True, "Booking cancelled successfully"
+                return self.cancel_seat(seat_number)
         return False, "Booking not found"
     
     def get_booking_details(self, booking_id):
@@ -64,14 +76,17 @@ class Transport:
             'departure_time': self.departure_time,
             'arrival_time': self.arrival_time,
             'total_seats': self.total_seats,
-            'available_seats': self.available_seats,
+            'seat_map': self.seats.to_string(),
             'booked_seats': self.booked_seats,
-            'fare': self.fare
+            'fare': self.fare,
+            'next_booking': self.next_booking
         }
 
 class TicketReservationSystem:
     def __init__(self):
         self.transports = {}
+        # booking_id -> (transport_id, seat_number) of every current booking
+        self.bookings = {}
         self.load_data()
     
     def load_data(self):
@@ -90,11 +105,21 @@ class TicketReservationSystem:
                             transport_data['total_seats'],
                             transport_data['fare']
                         )
-                        transport.available_seats = transport_data['available_seats']
-                        transport.booked_seats = transport_data['booked_seats']
+                        if 'seat_map' in transport_data:
+                            transport.seats = SeatMap.from_string(transport.total_seats, transport_data['seat_map'])
+                        else:  # saved as a list of free seat numbers
+                            transport.seats = SeatMap(transport.total_seats, transport_data['available_seats'])
+                        # JSON object keys are strings; seats are ints everywhere else
+                        transport.booked_seats = {int(seat): booking for seat, booking
+                                                  in transport_data['booked_seats'].items()}
+                        transport.next_booking = transport_data.get('next_booking', 1)
                         self.transports[transport_id] = transport
+                        for seat_number, booking in transport.booked_seats.items():
+                            # Older random IDs may repeat; the first one wins, as it did when scanning
+                            self.bookings.setdefault(booking['booking_id'], (transport_id, seat_number))
             except (json.JSONDecodeError, FileNotFoundError):
                 self.transports = {}
+                self.bookings = {}
     
     def save_data(self):
         data = {transport_id: transport.to_dict() for transport_id, transport in self.transports.items()}
@@ -141,24 +166,25 @@ class TicketReservationSystem:
         )
         
         if success:
+            self.bookings[result['booking_id']] = (transport_id, result['seat_number'])
             self.save_data()
         
         return success, result
     
     def cancel_ticket(self, booking_id):
-        for transport in self.transports.values():
-            success, message = transport.cancel_booking(booking_id)
-            if success:
-                self.save_data()
-                return True, message
-        return False, "Booking not found"
+        if booking_id not in self.bookings:
+            return False, "Booking not found"
+        transport_id, seat_number = self.bookings.pop(booking_id)
+        success, message = self.transports[transport_id].cancel_seat(seat_number)
+        if success:
+            self.save_data()
+        return success, message
     
     def get_booking_status(self, booking_id):
-        for transport in self.transports.values():
-            booking = transport.get_booking_details(booking_id)
-            if booking:
-                return booking
-        return None
+        if booking_id not in self.bookings:
+            return None
+        transport_id, seat_number = self.bookings[booking_id]
+        return self.transports[transport_id].booked_seats.get(seat_number)
 
 def display_menu():
     print("\n=== Ticket Reservation System ===")
@@ -179,7 +205,7 @@ def display_transport(transport, show_seats=False):
     print(f"Dep:     {transport.departure_time}")
     print(f"Arr:     {transport.arrival_time}")
     print(f"Fare:    ${transport.fare}")
-    print(f"Seats:   {len(transport.available_seats)}/{transport.total_seats} available")
+    print(f"Seats:   {transport.seats.available}/{transport.total_seats} available")
     
     if show_seats:
         print("\nSeat Layout:")
@@ -187,12 +213,11 @@ def display_transport(transport, show_seats=False):
         seat_width = 5
         
         for i in range(0, transport.total_seats, seats_per_row):
-            row = transport.available_seats[i:i + seats_per_row]
             for seat in range(1, seats_per_row + 1):
                 seat_num = i + seat
                 if seat_num > transport.total_seats:
                     break
-                status = "[ ]" if seat_num in transport.available_seats else "[X]"
+                status = "[ ]" if transport.is_seat_available(seat_num) else "[X]"
                 print(f"{seat_num:02d}{status}", end="\t")
             print()
     
@@ -270,7 +295,7 @@ def main():
                     print(f"\n{i}. {transport.transport_type.upper()} {transport.number}")
                     print(f"   {transport.source} to {transport.destination}")
                     print(f"   Dep: {transport.departure_time} - Arr: {transport.arrival_time}")
-                    print(f"   Fare: ${transport.fare} | Seats: {len(transport.available_seats)}/{transport.total_seats} available")
+                    print(f"   Fare: ${transport.fare} | Seats: {transport.seats.available}/{transport.total_seats} available")
             
             input("\nPress Enter to continue...")
         
@@ -285,7 +310,11 @@ def main():
             display_transport(transport, show_seats=True)
             
             try:
-                seat_number = int(input("\nEnter seat number: "))
+                seat_input = input("\nEnter seat number (press Enter for next available): ").strip()
+                seat_number = int(seat_input) if seat_input else transport.seats.next_free()
+                if seat_number is None:
+                    print("No seats available")
+                    continue
                 if seat_number < 1 or seat_number > transport.total_seats:
                     print("Invalid seat number")
                     continue